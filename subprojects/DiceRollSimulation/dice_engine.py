@@ -0,0 +1,173 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Batched Dice Engine for the Dice Roll Simulation Program.
+
+Input:
+- Numbers of rolls, dice and sides, or dice notation such as '3d6'.
+
+Output:
+- Rolled values and totals as NumPy arrays, face counts, and exact probability mass functions.
+
+Features:
+- Rolls millions of dice at once with a seeded `numpy.random.Generator`.
+- Tallies rolls in a single pass with `numpy.bincount`.
+- Computes the exact distribution of the total of NdS by repeated convolution.
+- Compares empirical and exact distributions side by side.
+
+"""
+
+from typing import Dict, Tuple, Union
+import numpy as np
+
+# Number of trials rolled per batch when summing many dice, bounding memory use
+BATCH_SIZE = 1_000_000
+
+Seed = Union[None, int, np.random.Generator]
+
+def make_rng(seed: Seed = None) -> np.random.Generator:
+    """
+    Return a random generator, creating one from a seed if needed.
+
+    Args:
+    - seed (Seed): A seed, an existing generator, or None for fresh entropy.
+
+    Returns:
+    - np.random.Generator: The random generator.
+    """
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+def parse_dice(dice_notation: str) -> Tuple[int, int]:
+    """
+    Parse simple dice notation such as '3d6' or 'd20'.
+
+    Args:
+    - dice_notation (str): Dice notation of the form NdS.
+
+    Returns:
+    - Tuple[int, int]: Number of dice and number of sides.
+    """
+    count, _, sides = dice_notation.strip().lower().partition("d")
+    if not sides.isdigit() or (count and not count.isdigit()):
+        raise ValueError(f"Invalid dice notation '{dice_notation}'. Use the form NdS, e.g. 3d6.")
+    num_dice, num_sides = int(count or 1), int(sides)
+    if num_dice <= 0 or num_sides <= 0:
+        raise ValueError(f"Invalid dice notation '{dice_notation}'. Dice and sides must be positive.")
+    return num_dice, num_sides
+
+def roll_array(num_rolls: int, num_sides: int, seed: Seed = None) -> np.ndarray:
+    """
+    Roll a dice with a specific number of sides many times.
+
+    Args:
+    - num_rolls (int): Number of times to roll the dice.
+    - num_sides (int): Number of sides on the dice.
+    - seed (Seed): A seed, an existing generator, or None for fresh entropy.
+
+    Returns:
+    - np.ndarray: Array of rolled values from 1 to num_sides.
+    """
+    return make_rng(seed).integers(1, num_sides + 1, num_rolls)
+
+def roll_totals(trials: int, num_dice: int, num_sides: int, seed: Seed = None, batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """
+    Roll NdS many times and return the total of each roll.
+
+    Args:
+    - trials (int): Number of times to roll the dice.
+    - num_dice (int): Number of dice rolled each time.
+    - num_sides (int): Number of sides on each dice.
+    - seed (Seed): A seed, an existing generator, or None for fresh entropy.
+    - batch_size (int): Number of trials rolled per batch.
+
+    Returns:
+    - np.ndarray: Array of totals, one per trial.
+    """
+    rng = make_rng(seed)
+    totals = np.empty(trials, dtype=np.int64)
+    # Roll in batches so only batch_size x num_dice values are held at once
+    per_batch = max(1, batch_size // num_dice)
+    for start in range(0, trials, per_batch):
+        stop = min(trials, start + per_batch)
+        totals[start:stop] = rng.integers(1, num_sides + 1, (stop - start, num_dice)).sum(axis=1)
+    return totals
+
+def tally(values: np.ndarray, minimum: int, maximum: int) -> np.ndarray:
+    """
+    Count how often each value from minimum to maximum occurs.
+
+    Args:
+    - values (np.ndarray): Rolled values or totals.
+    - minimum (int): Smallest value counted.
+    - maximum (int): Largest value counted; values outside the range are ignored.
+
+    Returns:
+    - np.ndarray: Counts, where index i is the count of value minimum + i.
+    """
+    values = np.asarray(values)
+    values = values[(values >= minimum) & (values <= maximum)]
+    return np.bincount(values - minimum, minlength=maximum - minimum + 1)
+
+def convolve_power(pmf: np.ndarray, times: int) -> np.ndarray:
+    """
+    Convolve a probability mass function with itself a number of times.
+
+    Uses repeated squaring, so only O(log times) convolutions are needed.
+
+    Args:
+    - pmf (np.ndarray): Probabilities of consecutive values.
+    - times (int): Number of independent copies being added.
+
+    Returns:
+    - np.ndarray: Probabilities of the consecutive values of the sum.
+    """
+    result = np.ones(1)
+    power = np.asarray(pmf, dtype=float)
+    while times:
+        if times & 1:
+            result = np.convolve(result, power)
+        times >>= 1
+        if times:
+            power = np.convolve(power, power)
+    return result
+
+def exact_pmf(num_dice: int, num_sides: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the exact distribution of the total of NdS.
+
+    Args:
+    - num_dice (int): Number of dice.
+    - num_sides (int): Number of sides on each dice.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray]: The possible totals and their probabilities.
+    """
+    probabilities = convolve_power(np.full(num_sides, 1 / num_sides), num_dice)
+    return np.arange(num_dice, num_dice * num_sides + 1), probabilities
+
+def compare_distributions(dice_notation: str, trials: int, seed: Seed = None) -> Dict[str, Union[np.ndarray, float]]:
+    """
+    Roll NdS many times and compare the empirical distribution of the totals with the exact one.
+
+    Args:
+    - dice_notation (str): Dice notation of the form NdS.
+    - trials (int): Number of times to roll the dice.
+    - seed (Seed): A seed, an existing generator, or None for fresh entropy.
+
+    Returns:
+    - Dict[str, Union[np.ndarray, float]]: The totals, their empirical and exact probabilities,
+      and the largest absolute difference between the two.
+    """
+    num_dice, num_sides = parse_dice(dice_notation)
+    values, exact = exact_pmf(num_dice, num_sides)
+    counts = tally(roll_totals(trials, num_dice, num_sides, seed), values[0], values[-1])
+    empirical = counts / trials
+    return {
+        "values": values,
+        "empirical": empirical,
+        "exact": exact,
+        "max_abs_error": float(np.abs(empirical - exact).max()),
+    }
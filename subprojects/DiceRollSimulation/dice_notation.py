@@ -0,0 +1,373 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Dice Notation Compiler for the Dice Roll Simulation Program.
+
+Input:
+- Dice expressions such as '4d6kh3+2d8-1', '1d20r1+5', '3d6!' or 'd%'.
+
+Output:
+- A compiled evaluation plan that rolls the expression for many trials at once,
+  and the exact distribution of its total whenever it can be computed.
+
+Features:
+- Parses sums and differences of dice terms and integer constants.
+- Supports keep/drop highest/lowest (kh, kl, dh, dl, k), exploding dice (! with an optional
+  comparison) and rerolls (r to reroll until no match, ro to reroll once).
+- Compiles each notation once into a plan cached by an LRU cache keyed by the notation string.
+- Reduces every die's rerolls and explosions to a single distribution, so all trials are
+  sampled with one vectorized inverse-CDF lookup.
+- Computes the exact outcome distribution by convolution, with a dynamic program for keep/drop.
+
+Notation:
+- NdS rolls N dice with S sides (N defaults to 1, 'd%' is 'd100').
+- Comparisons '<v' and '>v' mean 'at most v' and 'at least v'; '=v' or a bare 'v' means exactly v.
+- '!' explodes on the highest face unless a comparison is given; explosions stop after `EXPLODE_LIMIT` extra rolls.
+
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+from dice_engine import BATCH_SIZE, Seed, convolve_power, make_rng
+
+# Most extra rolls a single exploding die can chain
+EXPLODE_LIMIT = 20
+
+# Largest number of possible totals for which the exact distribution is computed
+MAX_SUPPORT = 1_000_000
+
+# Largest (faces x dice x dice) for which keep/drop distributions are computed exactly
+KEEP_DP_LIMIT = 2_000_000
+
+# Distribution of a value: the smallest value and the probabilities of consecutive values from it
+Distribution = Tuple[int, np.ndarray]
+
+DICE_TERM = re.compile(r"(\d*)d(\d+|%)")
+CONSTANT_TERM = re.compile(r"\d+")
+MODIFIER = re.compile(r"(kh|kl|dh|dl|k|ro|r|!)([<>=]?)(\d*)")
+
+def _faces_matching(sides: int, operator: str, value: int) -> np.ndarray:
+    """
+    Return a mask of the faces 1 to sides that match a comparison.
+    """
+    faces = np.arange(1, sides + 1)
+    if operator == "<":
+        return faces <= value
+    if operator == ">":
+        return faces >= value
+    return faces == value
+
+class ConstantTerm:
+    """
+    An integer constant of a dice expression.
+    """
+
+    def __init__(self, value: int):
+        self.value = value
+
+    def sample(self, trials: int, rng: np.random.Generator) -> np.ndarray:
+        return np.full(trials, self.value, dtype=np.int64)
+
+    def distribution(self) -> Optional[Distribution]:
+        return self.value, np.ones(1)
+
+class DiceTerm:
+    """
+    A group of identical dice, possibly with rerolls, explosions and keep/drop, added or subtracted.
+    """
+
+    def __init__(self, sign: int, count: int, sides: int, keep: Optional[Tuple[str, int]] = None,
+                 explode: Optional[np.ndarray] = None, reroll: Optional[np.ndarray] = None, reroll_once: bool = False):
+        """
+        Initialize the term and compile the distribution of a single die.
+
+        Args:
+        - sign (int): 1 to add the term, -1 to subtract it.
+        - count (int): Number of dice.
+        - sides (int): Number of sides on each dice.
+        - keep (Optional[Tuple[str, int]]): ('h', k) or ('l', k) to keep the k highest or lowest dice.
+        - explode (Optional[np.ndarray]): Mask of the faces that explode.
+        - reroll (Optional[np.ndarray]): Mask of the faces that are rerolled.
+        - reroll_once (bool): If True, rerolled faces are rerolled only once.
+        """
+        self.sign, self.count, self.sides = sign, count, sides
+        self.keep = keep
+        self.plain = explode is None and reroll is None
+        self.die = self._compile_die(explode, reroll, reroll_once)
+        self.cdf = np.cumsum(self.die[1])
+
+    def _compile_die(self, explode: Optional[np.ndarray], reroll: Optional[np.ndarray], reroll_once: bool) -> Distribution:
+        """
+        Reduce rerolls and explosions to the distribution of a single die.
+        """
+        # Probabilities indexed by face value, with index 0 unused
+        base = np.full(self.sides, 1 / self.sides)
+        if reroll is not None:
+            rerolled = base[reroll].sum()
+            if reroll_once:
+                base = base * ~reroll + rerolled * base
+            elif reroll.all():
+                raise ValueError("Every face would be rerolled forever!")
+            else:
+                base = base * ~reroll / (1 - rerolled)
+        die = np.concatenate(([0.0], base))
+
+        if explode is not None:
+            if explode.all():
+                raise ValueError("Every face would explode forever!")
+            mask = np.concatenate(([False], explode))
+            stops, explodes = die * ~mask, die * mask
+            # Each level adds one more possible extra roll to the chain
+            chain = die
+            for _ in range(EXPLODE_LIMIT):
+                chain = np.convolve(explodes, chain)
+                chain[:len(stops)] += stops
+            die = chain
+
+        first = int(np.flatnonzero(die)[0])
+        last = int(np.flatnonzero(die)[-1])
+        return first, die[first:last + 1]
+
+    def _roll_dice(self, trials: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Roll every die of the term for a batch of trials.
+        """
+        if self.plain:
+            return rng.integers(1, self.sides + 1, (trials, self.count))
+        # Inverse-CDF lookup in the compiled distribution of a single die
+        index = np.searchsorted(self.cdf, rng.random((trials, self.count)), side="right")
+        return self.die[0] + np.minimum(index, len(self.cdf) - 1)
+
+    def sample(self, trials: int, rng: np.random.Generator) -> np.ndarray:
+        totals = np.empty(trials, dtype=np.int64)
+        per_batch = max(1, BATCH_SIZE // self.count)
+        for start in range(0, trials, per_batch):
+            stop = min(trials, start + per_batch)
+            dice = self._roll_dice(stop - start, rng)
+            if self.keep:
+                side, kept = self.keep
+                dice = np.sort(dice, axis=1)
+                dice = dice[:, self.count - kept:] if side == "h" else dice[:, :kept]
+            totals[start:stop] = dice.sum(axis=1)
+        return self.sign * totals
+
+    def _keep_distribution(self) -> Optional[Distribution]:
+        """
+        Compute the exact distribution of the sum of the kept dice.
+
+        Faces are placed from the best to the worst for the kept side; dp[j] holds the
+        distribution of the kept sum once j dice are placed, weighted by the multinomial terms.
+        """
+        side, kept = self.keep
+        offset, probabilities = self.die
+        faces = [(offset + index, p) for index, p in enumerate(probabilities) if p > 0]
+        if len(faces) * (self.count + 1) ** 2 > KEEP_DP_LIMIT:
+            return None
+        if side == "h":
+            faces.reverse()
+
+        n = self.count
+        size = kept * max(face for face, _ in faces) + 1
+        dp = [np.zeros(size) for _ in range(n + 1)]
+        dp[0][0] = 1.0
+        for face, p in faces:
+            new = [np.zeros(size) for _ in range(n + 1)]
+            for placed in range(n + 1):
+                if not dp[placed].any():
+                    continue
+                for c in range(n - placed + 1):
+                    shift = face * min(c, max(0, kept - placed))
+                    weight = p ** c / math.factorial(c)
+                    new[placed + c][shift:] += dp[placed][:size - shift] * weight
+            dp = new
+
+        totals = dp[n] * math.factorial(n)
+        first = int(np.flatnonzero(totals)[0])
+        last = int(np.flatnonzero(totals)[-1])
+        return first, totals[first:last + 1]
+
+    def distribution(self) -> Optional[Distribution]:
+        offset, probabilities = self.die
+        if self.keep:
+            result = self._keep_distribution()
+            if result is None:
+                return None
+            offset, probabilities = result
+        else:
+            if self.count * len(probabilities) > MAX_SUPPORT:
+                return None
+            probabilities = convolve_power(probabilities, self.count)
+            offset *= self.count
+
+        if self.sign < 0:
+            return -(offset + len(probabilities) - 1), probabilities[::-1]
+        return offset, probabilities
+
+class DicePlan:
+    """
+    A compiled dice expression, evaluated for many trials at once.
+    """
+
+    def __init__(self, notation: str, terms: List):
+        """
+        Initialize the plan.
+
+        Args:
+        - notation (str): The dice expression the plan was compiled from.
+        - terms (List): The dice and constant terms of the expression.
+        """
+        self.notation = notation
+        self.terms = terms
+        self._distribution: Optional[Distribution] = None
+        self._distribution_done = False
+
+    def __repr__(self) -> str:
+        return f"DicePlan('{self.notation}')"
+
+    def evaluate(self, trials: int = 1, seed: Seed = None) -> np.ndarray:
+        """
+        Roll the expression for a number of trials.
+
+        Args:
+        - trials (int): Number of times to roll the expression.
+        - seed (Seed): A seed, an existing generator, or None for fresh entropy.
+
+        Returns:
+        - np.ndarray: Array of totals, one per trial.
+        """
+        rng = make_rng(seed)
+        totals = np.zeros(trials, dtype=np.int64)
+        for term in self.terms:
+            totals += term.sample(trials, rng)
+        return totals
+
+    def distribution(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Compute the exact distribution of the total, once.
+
+        Returns:
+        - Optional[Tuple[np.ndarray, np.ndarray]]: The possible totals and their probabilities,
+          or None if the distribution is too large to compute exactly.
+        """
+        if not self._distribution_done:
+            self._distribution_done = True
+            offset, probabilities = 0, np.ones(1)
+            for term in self.terms:
+                term_distribution = term.distribution()
+                if term_distribution is None or len(probabilities) + len(term_distribution[1]) > MAX_SUPPORT:
+                    return None
+                offset += term_distribution[0]
+                probabilities = np.convolve(probabilities, term_distribution[1])
+            self._distribution = (offset, probabilities)
+
+        if self._distribution is None:
+            return None
+        offset, probabilities = self._distribution
+        return np.arange(offset, offset + len(probabilities)), probabilities
+
+def _parse_term(text: str, position: int, sign: int):
+    """
+    Parse one dice or constant term starting at a position.
+
+    Returns:
+    - Tuple: The term and the position after it.
+    """
+    match = DICE_TERM.match(text, position)
+    if match is None:
+        match = CONSTANT_TERM.match(text, position)
+        if match is None:
+            raise ValueError(f"Expected dice or a number at position {position} of '{text}'.")
+        return ConstantTerm(sign * int(match.group())), match.end()
+
+    count = int(match.group(1) or 1)
+    sides = 100 if match.group(2) == "%" else int(match.group(2))
+    if count <= 0 or sides <= 0:
+        raise ValueError(f"Dice and sides must be positive in '{match.group()}'.")
+    position = match.end()
+
+    keep = explode = reroll = None
+    reroll_once = False
+    while True:
+        modifier = MODIFIER.match(text, position)
+        if modifier is None:
+            break
+        name, operator, value = modifier.groups()
+        position = modifier.end()
+
+        if operator and not value:
+            raise ValueError(f"Comparison '{operator}' needs a face value in '{modifier.group()}'.")
+        if name == "!":
+            # Without a comparison, dice explode on their highest face
+            explode = _faces_matching(sides, operator, int(value)) if value else _faces_matching(sides, "=", sides)
+        elif name in ("r", "ro"):
+            if not value:
+                raise ValueError(f"Reroll needs a face to reroll, e.g. '{name}1' or '{name}<2'.")
+            reroll = _faces_matching(sides, operator, int(value))
+            reroll_once = name == "ro"
+        else:
+            if not value:
+                raise ValueError(f"Keep and drop need a number of dice, e.g. '{name}1'.")
+            number = int(value)
+            if number > count:
+                raise ValueError(f"Cannot keep or drop {number} of {count} dice.")
+            # Dropping some dice is keeping the rest from the other side
+            keep = {"k": ("h", number), "kh": ("h", number), "kl": ("l", number),
+                    "dh": ("l", count - number), "dl": ("h", count - number)}[name]
+
+    return DiceTerm(sign, count, sides, keep, explode, reroll, reroll_once), position
+
+@lru_cache(maxsize=256)
+def compile_notation(notation: str) -> DicePlan:
+    """
+    Compile a dice expression into a reusable evaluation plan.
+
+    Plans are cached by notation string, so repeated rolls of the same
+    expression skip parsing and compiling the dice distributions.
+
+    Args:
+    - notation (str): The dice expression, e.g. '4d6kh3+2d8-1'.
+
+    Returns:
+    - DicePlan: The compiled plan.
+    """
+    text = re.sub(r"\s+", "", notation.lower())
+    if not text:
+        raise ValueError("The dice notation is empty.")
+
+    terms = []
+    position = 0
+    sign = 1
+    if text[0] in "+-":
+        sign = -1 if text[0] == "-" else 1
+        position = 1
+    while True:
+        term, position = _parse_term(text, position, sign)
+        terms.append(term)
+        if position == len(text):
+            break
+        if text[position] not in "+-":
+            raise ValueError(f"Unexpected '{text[position]}' at position {position} of '{notation}'.")
+        sign = -1 if text[position] == "-" else 1
+        position += 1
+
+    return DicePlan(notation, terms)
+
+def roll_notation(notation: str, trials: int = 1, seed: Seed = None) -> np.ndarray:
+    """
+    Roll a dice expression for a number of trials.
+
+    Args:
+    - notation (str): The dice expression, e.g. '4d6kh3+2d8-1'.
+    - trials (int): Number of times to roll the expression.
+    - seed (Seed): A seed, an existing generator, or None for fresh entropy.
+
+    Returns:
+    - np.ndarray: Array of totals, one per trial.
+    """
+    return compile_notation(notation).evaluate(trials, seed)
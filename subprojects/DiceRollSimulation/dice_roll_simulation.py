@@ -19,12 +19,30 @@ Features:
 - Displays a histogram of the rolled values.
 - Displays the history of rolled values.
 - Calculates and displays the probability of each possible outcome.
+- Rolls and tallies with the batched NumPy dice engine, and compares outcomes with the exact distribution.
+- Full dice expressions with keep/drop, exploding dice and rerolls (e.g., 4d6kh3+2d8-1).
+- Streaming animation showing the distribution of millions of rolls converging live.
+- Running per-player statistics and a bounded roll history, so long sessions use constant memory.
 
 """
 
-import random
+import math
+import re
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from dice_engine import exact_pmf, make_rng, parse_dice, roll_array, tally
+from dice_notation import compile_notation
+from roll_stats import RollHistory, RollStatistics
+
+# Number of rolls streamed by the streaming animation, and rolls added per frame
+STREAM_ROLLS = 5_000_000
+STREAM_CHUNK = 50_000
+
+# Number of most recent rolls kept in the roll history, and the file older rolls are
+# appended to (None to discard them)
+HISTORY_CAPACITY = 1000
+HISTORY_SPILL_FILE = None
 
 def roll_dice(num_rolls, num_sides):
     """
@@ -37,31 +55,42 @@ def roll_dice(num_rolls, num_sides):
     Returns:
     - list: List of rolled values.
     """
-    return [random.randint(1, num_sides) for _ in range(num_rolls)]
+    return roll_array(num_rolls, num_sides).tolist()
+
+def roll_dice_notation(dice_notation, num_rolls=1):
+    """
+    Roll dice based on the provided dice notation.
 
-def roll_dice_notation(dice_notation):
-    """Roll dice based on the provided dice notation."""
-    num_rolls, num_sides = map(int, dice_notation.split('d'))
-    return roll_dice(num_rolls, num_sides)
+    Plain notation such as '2d6' returns each dice rolled. Full expressions such as
+    '4d6kh3+2' are compiled once and return the total of each of num_rolls rolls.
 
-def display_statistics(rolled_values, player_name):
+    Args:
+    - dice_notation (str): Dice notation or expression.
+    - num_rolls (int): Number of times to roll a full expression.
+
+    Returns:
+    - list: List of rolled values or totals.
+    """
+    if re.fullmatch(r"\s*\d+\s*d\s*\d+\s*", dice_notation):
+        num_dice, num_sides = parse_dice(dice_notation.replace(" ", ""))
+        return roll_dice(num_dice, num_sides)
+    return compile_notation(dice_notation).evaluate(num_rolls).tolist()
+
+def display_statistics(stats, player_name):
     """
     Display statistics about the rolled values.
 
     Args:
-    - rolled_values (list): List of rolled values.
+    - stats (RollStatistics): Running statistics of the player's rolls.
     - player_name (str): Player's name.
     """
-    total_sum = sum(rolled_values)
-    average = total_sum / len(rolled_values)
-    minimum_value = min(rolled_values)
-    maximum_value = max(rolled_values)
-
     print(f"\nStatistics for {player_name}:")
-    print(f"Total Sum: {total_sum}")
-    print(f"Average: {average:.2f}")
-    print(f"Minimum Value: {minimum_value}")
-    print(f"Maximum Value: {maximum_value}")
+    print(f"Rolls: {stats.count}")
+    print(f"Total Sum: {stats.total}")
+    print(f"Average: {stats.mean:.2f}")
+    print(f"Standard Deviation: {stats.std:.2f}")
+    print(f"Minimum Value: {stats.minimum}")
+    print(f"Maximum Value: {stats.maximum}")
 
 def display_histogram(all_rolls, num_sides):
     """
@@ -83,15 +112,18 @@ def display_histogram(all_rolls, num_sides):
     plt.legend()
     plt.show()
 
-def display_history(rolled_values):
+def display_history(history):
     """
     Display the history of rolled values.
 
     Args:
-    - rolled_values (list): List of rolled values.
+    - history (RollHistory): History of the most recent rolls.
     """
     print("\nRoll History:")
-    print(rolled_values)
+    if history.evicted:
+        where = f"saved to {history.spill_path}" if history.spill_path else "dropped"
+        print(f"(last {len(history.buffer)} of {len(history)} rolls; older rolls {where})")
+    print(history.recent())
 
 def calculate_probability(rolled_values, num_sides):
     """
@@ -101,11 +133,12 @@ def calculate_probability(rolled_values, num_sides):
     - rolled_values (list): List of rolled values.
     - num_sides (int): Number of sides on the dice.
     """
-    probabilities = {i: rolled_values.count(i) / len(rolled_values) for i in range(1, num_sides + 1)}
+    counts = tally(rolled_values, 1, num_sides)
+    _, exact = exact_pmf(1, num_sides)
     
     print("\nProbability of Each Outcome:")
-    for value, probability in probabilities.items():
-        print(f"Value {value}: {probability:.2%}")
+    for value, (count, exact_probability) in enumerate(zip(counts, exact), start=1):
+        print(f"Value {value}: {count / len(rolled_values):.2%} (exact {exact_probability:.2%})")
 
 def animated_dice_roll(num_rolls, num_sides):
     """
@@ -130,12 +163,63 @@ def animated_dice_roll(num_rolls, num_sides):
     ani = animation.FuncAnimation(fig, update, frames=10, interval=500, repeat=False)
     plt.show()
 
+def streaming_dice_roll(num_sides, total_rolls=STREAM_ROLLS, chunk_size=STREAM_CHUNK, interval=30, seed=None):
+    """
+    Display a histogram of dice rolls converging live, without re-rolling per frame.
+
+    Each frame rolls one more chunk, adds it to running totals with bincount and
+    only updates the heights of the existing bars, which are redrawn with blitting.
+
+    Args:
+    - num_sides (int): Number of sides on the dice.
+    - total_rolls (int): Number of rolls to stream.
+    - chunk_size (int): Number of rolls added per frame.
+    - interval (int): Delay between frames in milliseconds.
+    - seed (int): Seed for reproducible rolls, or None.
+
+    Returns:
+    - numpy.ndarray: Final count of each face.
+    """
+    rng = make_rng(seed)
+    counts = np.zeros(num_sides, dtype=np.int64)
+
+    fig, ax = plt.subplots()
+    bars = ax.bar(range(1, num_sides + 1), np.zeros(num_sides), width=0.8, label='Rolled')
+    ax.axhline(1 / num_sides, color='red', linestyle='--', label='Exact')
+    ax.set_xlim(0.5, num_sides + 0.5)
+    ax.set_ylim(0, 2 / num_sides)
+    ax.set_xticks(list(range(1, num_sides + 1)))
+    ax.set_title(f'Streaming Dice Rolls - d{num_sides}')
+    ax.set_xlabel('Dice Value')
+    ax.set_ylabel('Relative Frequency')
+    ax.legend(loc='upper right')
+    progress = ax.text(0.02, 0.95, '', transform=ax.transAxes, va='top')
+
+    def init():
+        # Drawing the empty bars here keeps blitting from rolling the first chunk twice
+        return (*bars, progress)
+
+    def update(frame):
+        size = min(chunk_size, total_rolls - frame * chunk_size)
+        counts[:] += np.bincount(rng.integers(0, num_sides, size), minlength=num_sides)
+        rolled = counts.sum()
+        for bar, count in zip(bars, counts):
+            bar.set_height(count / rolled)
+        progress.set_text(f'{rolled:,} rolls')
+        return (*bars, progress)
+
+    frames = math.ceil(total_rolls / chunk_size)
+    ani = animation.FuncAnimation(fig, update, frames=frames, init_func=init, interval=interval, blit=True, repeat=False)
+    plt.show()
+    return counts
+
 def multiplayer_mode():
     """
     Enable multiplayer mode for rolling multiple sets of dice.
     """
     all_rolls = {}
-    rolled_history = []
+    player_stats = {}
+    rolled_history = RollHistory(HISTORY_CAPACITY, HISTORY_SPILL_FILE)
 
     while True:
         try:
@@ -151,16 +235,18 @@ def multiplayer_mode():
                 dice_notation = input(f"\nEnter dice notation for {player_name} (e.g., 2d6): ")
                 
                 if 'd' in dice_notation:
-                    rolls = roll_dice_notation(dice_notation)
+                    rolls = roll_dice_notation(dice_notation, num_rolls)
                     rolled_history.extend(rolls)
                 else:
                     rolls = roll_dice(num_rolls, num_sides)
                     rolled_history.extend(rolls)
                 
                 all_rolls[player_name] = rolls
+                stats = player_stats.setdefault(player_name, RollStatistics())
+                stats.update(rolls)
                 
                 print(f"\n{player_name}'s rolls: {rolls}")
-                display_statistics(rolls, player_name)
+                display_statistics(stats, player_name)
                 calculate_probability(rolls, num_sides)
             
             display_histogram(all_rolls, num_sides)
@@ -170,6 +256,10 @@ def multiplayer_mode():
             if animate_choice in ['yes', 'y']:
                 animated_dice_roll(num_rolls, num_sides)
 
+            stream_choice = input(f"\nDo you want to stream {STREAM_ROLLS:,} rolls to watch the distribution converge? (yes/y or no/n): ").lower()
+            if stream_choice in ['yes', 'y']:
+                streaming_dice_roll(num_sides)
+
             another_round = input("\nDo you want to play another round of the game? (yes/y or no/n): ").lower()
             if another_round not in ['yes', 'y']:
                 break
@@ -0,0 +1,136 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Streaming Roll Statistics for the Dice Roll Simulation Program.
+
+Input:
+- Batches of rolled values, as lists or NumPy arrays.
+
+Output:
+- Running count, total, mean, variance, minimum, maximum and per-face counts.
+- The most recent rolls, with older rolls dropped or spilled to a file.
+
+Features:
+- Updates statistics from each batch without keeping the rolls, in memory independent of the number of rolls.
+- Merges batch statistics with the parallel variance formula, so large batches stay numerically stable.
+- Keeps roll history in a ring buffer with a configurable retention cap.
+- Optionally appends rolls evicted from the buffer to a spill file instead of discarding them.
+
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+import numpy as np
+
+class RollStatistics:
+    """
+    Online statistics of a player's rolls.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+        self.face_counts: Dict[int, int] = {}
+
+    def update(self, values: Iterable[int]) -> None:
+        """
+        Add a batch of rolls to the statistics.
+
+        Args:
+        - values (Iterable[int]): Rolled values.
+        """
+        if not isinstance(values, np.ndarray):
+            values = np.array(list(values))
+        if values.size == 0:
+            return
+
+        count = int(values.size)
+        total = int(values.sum())
+        mean = total / count
+        m2 = float(((values - mean) ** 2).sum())
+
+        # Combine the batch with the running statistics (Chan et al.)
+        combined = self.count + count
+        delta = mean - self.mean
+        self._m2 += m2 + delta ** 2 * self.count * count / combined
+        self.mean += delta * count / combined
+        self.count = combined
+        self.total += total
+
+        low, high = int(values.min()), int(values.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+        faces, counts = np.unique(values, return_counts=True)
+        for face, face_count in zip(faces.tolist(), counts.tolist()):
+            self.face_counts[face] = self.face_counts.get(face, 0) + face_count
+
+    @property
+    def variance(self) -> float:
+        """
+        Population variance of the rolls.
+        """
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """
+        Population standard deviation of the rolls.
+        """
+        return math.sqrt(self.variance)
+
+class RollHistory:
+    """
+    Most recent rolls, kept in a ring buffer with a retention cap.
+    """
+
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None):
+        """
+        Initialize the history.
+
+        Args:
+        - capacity (int): Number of most recent rolls kept in memory.
+        - spill_path (Optional[str]): File where evicted rolls are appended, or None to discard them.
+        """
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.buffer: Deque[int] = deque(maxlen=capacity)
+        self.evicted = 0
+
+    def extend(self, values: Iterable[int]) -> None:
+        """
+        Add rolls to the history, evicting the oldest ones past the cap.
+
+        Args:
+        - values (Iterable[int]): Rolled values.
+        """
+        values = list(values)
+        overflow = len(self.buffer) + len(values) - self.capacity
+        if overflow > 0:
+            if self.spill_path:
+                from_buffer = min(overflow, len(self.buffer))
+                evicted = [self.buffer.popleft() for _ in range(from_buffer)] + values[:overflow - from_buffer]
+                with open(self.spill_path, "a") as file:
+                    file.write("\n".join(map(str, evicted)) + "\n")
+            self.evicted += overflow
+        self.buffer.extend(values)
+
+    def recent(self) -> List[int]:
+        """
+        Return the rolls kept in memory, oldest first.
+
+        Returns:
+        - List[int]: The most recent rolls.
+        """
+        return list(self.buffer)
+
+    def __len__(self) -> int:
+        return len(self.buffer) + self.evicted
@@ -0,0 +1,153 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Bit-Packed Board for Conway's Game of Life.
+
+Input:
+- A board as a 2D list of 0/1 cell values, or one integer bit mask per row.
+
+Output:
+- The board evolved by any number of generations.
+
+Features:
+- Stores each row as an integer bit mask, one bit per cell (bit c is column c).
+- Counts the neighbors of a whole row at once with bitwise full adders,
+  so every bit operation updates all the cells of a row in parallel.
+- Bounded edges (cells outside the board are dead) or optional toroidal wrap.
+
+"""
+
+from typing import List, Optional, Tuple
+
+def _full_adder(a: int, b: int, c: int) -> Tuple[int, int]:
+    """
+    Add three bit masks bit by bit.
+
+    Returns:
+    - Tuple[int, int]: The sum bits and the carry bits.
+    """
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+class BitBoard:
+    """
+    Game of Life board packed at one bit per cell.
+    """
+
+    def __init__(self, rows: int, cols: int, bits: Optional[List[int]] = None, wrap: bool = False):
+        """
+        Initialize the board.
+
+        Args:
+        - rows (int): Number of rows of the board.
+        - cols (int): Number of columns of the board.
+        - bits (List[int]): One bit mask per row, or None for an empty board.
+        - wrap (bool): If True, edges wrap around to the opposite side of the board.
+        """
+        self.rows, self.cols = rows, cols
+        self.wrap = wrap
+        self.mask = (1 << cols) - 1
+        self.bits = [row & self.mask for row in bits] if bits is not None else [0] * rows
+        if len(self.bits) != rows:
+            raise ValueError(f"Expected {rows} rows of bits, got {len(self.bits)}!")
+        self.generation = 0
+
+    def get(self, row: int, col: int) -> int:
+        """
+        Return the value of a cell.
+        """
+        return (self.bits[row] >> col) & 1
+
+    def set(self, row: int, col: int, value: int = 1) -> None:
+        """
+        Set the value of a cell.
+        """
+        if value:
+            self.bits[row] |= 1 << col
+        else:
+            self.bits[row] &= ~(1 << col)
+
+    def _shifts(self, row: int) -> Tuple[int, int]:
+        """
+        Return a row shifted so each cell sees its left and its right neighbor.
+        """
+        if self.wrap:
+            left = ((row << 1) | (row >> (self.cols - 1))) & self.mask
+            right = (row >> 1) | ((row & 1) << (self.cols - 1))
+        else:
+            left = (row << 1) & self.mask
+            right = row >> 1
+        return left, right
+
+    def _next_row(self, up: int, mid: int, down: int) -> int:
+        """
+        Compute the next generation of a row from itself and the rows around it.
+        """
+        up_left, up_right = self._shifts(up)
+        mid_left, mid_right = self._shifts(mid)
+        down_left, down_right = self._shifts(down)
+
+        # Add the eight neighbor masks into ones, twos and fours bits
+        sum_a, carry_a = _full_adder(up_left, up, up_right)
+        sum_b, carry_b = _full_adder(mid_left, mid_right, down)
+        sum_c, carry_c = down_left ^ down_right, down_left & down_right
+        ones, carry_d = _full_adder(sum_a, sum_b, sum_c)
+        twos, carry_e = _full_adder(carry_a, carry_b, carry_c)
+        fours = carry_e | (twos & carry_d)
+        twos ^= carry_d
+
+        # Alive next on exactly three neighbors, or on two if alive now
+        return twos & ~fours & (ones | mid) & self.mask
+
+    def step(self, generations: int = 1) -> None:
+        """
+        Advance the board by a number of generations.
+
+        Args:
+        - generations (int): Number of generations to advance.
+        """
+        rows = self.rows
+        for _ in range(generations):
+            bits = self.bits
+            if self.wrap:
+                self.bits = [self._next_row(bits[r - 1], bits[r], bits[(r + 1) % rows]) for r in range(rows)]
+            else:
+                padded = [0] + bits + [0]
+                self.bits = [self._next_row(padded[r], padded[r + 1], padded[r + 2]) for r in range(rows)]
+        self.generation += generations
+
+    def population(self) -> int:
+        """
+        Count the live cells.
+
+        Returns:
+        - int: Number of live cells.
+        """
+        return sum(bin(row).count("1") for row in self.bits)
+
+    def to_board(self) -> List[List[int]]:
+        """
+        Export the board as a list of lists.
+
+        Returns:
+        - List[List[int]]: 2D list representing the game board.
+        """
+        return [[(row >> col) & 1 for col in range(self.cols)] for row in self.bits]
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], wrap: bool = False) -> "BitBoard":
+        """
+        Create a bit-packed board from a list of lists.
+
+        Args:
+        - board (List[List[int]]): 2D list representing the game board.
+        - wrap (bool): If True, edges wrap around to the opposite side of the board.
+
+        Returns:
+        - BitBoard: The packed board.
+        """
+        bits = [sum(1 << col for col, cell in enumerate(row) if cell) for row in board]
+        return cls(len(board), len(board[0]), bits, wrap)
@@ -17,14 +17,18 @@ Features:
 - Draws the game board based on the current cell values using Pygame.
 - Applies the rules of Conway's Game of Life to evolve the board to the next generation.
 - Continuously updates and displays the board, creating the simulation.
+- Selectable stepping engine (pure Python, NumPy, Hashlife, sparse or bit-packed) with optional edge wrapping.
+- Selectable renderer that redraws only changed cells or blits the whole board at once.
 
 """
 
 # Importing necessary libraries
-from typing import List
+from typing import List, Optional
 import pygame
 import random
 import time
+from life_engines import create_engine, step_python
+from life_render import create_renderer
 
 # Constants
 WIDTH, HEIGHT = 600, 600
@@ -33,20 +37,27 @@ CELL_SIZE = 10
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GREEN = (0, 255, 0)
+ENGINE = "python"  # Stepping engine, one of life_engines.ENGINES
+WRAP = False  # Wrap edges around to the opposite side of the board
+RENDERER = "dirty"  # Renderer, one of life_render.RENDERERS
 
-# Initialize Pygame
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Game of Life")
+# Display surface, created when the simulation starts so the module can be imported headless
+screen = None
 
-def initialize_board() -> List[List[int]]:
+def initialize_board(rows: int = ROWS, cols: int = COLS, seed: Optional[int] = None) -> List[List[int]]:
     """
     Initialize the game board with random cell values.
     
+    Args:
+    - rows (int): Number of rows of the board.
+    - cols (int): Number of columns of the board.
+    - seed (Optional[int]): Seed for a reproducible board, or None for a fresh random board.
+
     Returns:
     - List[List[int]]: 2D list representing the game board.
     """
-    return [[random.choice([0, 1]) for _ in range(COLS)] for _ in range(ROWS)]
+    rng = random.Random(seed) if seed is not None else random
+    return [[rng.choice([0, 1]) for _ in range(cols)] for _ in range(rows)]
 
 def draw_board(board: List[List[int]]) -> None:
     """
@@ -62,28 +73,25 @@ def draw_board(board: List[List[int]]) -> None:
             pygame.draw.rect(screen, color, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
     pygame.display.update()
 
-def game_of_life(board: List[List[int]]) -> None:
+def game_of_life(board: List[List[int]], wrap: bool = False) -> None:
     """
     Apply the rules of Conway's Game of Life to evolve the board to the next generation.
     
     Args:
     - board (List[List[int]]): 2D list representing the game board.
+    - wrap (bool): If True, edges wrap around to the opposite side of the board.
     """
-    neighbors = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (-1, 1), (1, -1)]
-    rows, cols = len(board), len(board[0])
-    copy_board = [[board[row][col] for col in range(cols)] for row in range(rows)]
-
-    for row in range(rows):
-        for col in range(cols):
-            live_neighbors = sum(copy_board[row + dr][col + dc] for dr, dc in neighbors if 0 <= row + dr < rows and 0 <= col + dc < cols)
-
-            if copy_board[row][col] == 1 and (live_neighbors < 2 or live_neighbors > 3):
-                board[row][col] = 0
-            elif copy_board[row][col] == 0 and live_neighbors == 3:
-                board[row][col] = 1
+    step_python(board, wrap)
 
 if __name__ == '__main__':
+    # Initialize Pygame
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Game of Life")
+
     board = initialize_board()
+    engine = create_engine(ENGINE, board, WRAP)
+    renderer = create_renderer(RENDERER, screen, CELL_SIZE, (WHITE, GREEN))
 
     running = True
     while running:
@@ -91,8 +99,8 @@ if __name__ == '__main__':
             if event.type == pygame.QUIT:
                 running = False
         
-        game_of_life(board)
-        draw_board(board)
+        engine.step()
+        renderer.draw(engine.to_board())
         time.sleep(0.1)
     
     pygame.quit()
\ No newline at end of file
@@ -0,0 +1,336 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Hashlife Engine for Conway's Game of Life.
+
+Input:
+- A board as a 2D list of 0/1 cell values, as produced by `initialize_board()`.
+
+Output:
+- The pattern evolved by any number of generations, including huge jumps such as 2**30.
+
+Features:
+- Stores the universe as a quadtree of canonical (hash-consed) nodes, so repeated regions are shared.
+- Memoizes the future of every node, so repeated work in space and time is done only once.
+- Advances by 2**k generations in a single recursive pass with `step(2**k)`.
+- Evicts the node and result caches when they grow past a size limit.
+- Runs on an unbounded plane; boards are imported and exported as list-of-lists windows.
+
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+class Node:
+    """
+    A square quadtree node of size 2**k.
+
+    Nodes are canonical: two nodes with the same children are the same object,
+    so identity comparison and the default hash are enough to key the caches.
+    """
+
+    __slots__ = ("k", "nw", "ne", "sw", "se", "n")
+
+    def __init__(self, k: int, nw: Optional["Node"], ne: Optional["Node"], sw: Optional["Node"], se: Optional["Node"], n: int):
+        """
+        Initialize a node.
+
+        Args:
+        - k (int): Level of the node; the node covers 2**k x 2**k cells.
+        - nw, ne, sw, se (Node): Quadrants of the node, None for single cells.
+        - n (int): Number of live cells inside the node.
+        """
+        self.k = k
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.n = n
+
+# The two single-cell nodes every quadtree is built from
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+class Hashlife:
+    """
+    Game of Life universe stepped with the Hashlife algorithm.
+
+    The root node is always centered on the origin, so a root of level k covers
+    rows and columns in [-2**(k-1), 2**(k-1)). Imported boards are placed with
+    their top-left cell at (0, 0).
+    """
+
+    def __init__(self, max_nodes: int = 1 << 20):
+        """
+        Initialize an empty universe.
+
+        Args:
+        - max_nodes (int): Size of the node cache above which unreachable nodes and results are evicted.
+        """
+        self.max_nodes = max_nodes
+        self._nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._zeros: List[Node] = [OFF]
+        self._results: Dict[Tuple[Node, int], Node] = {}
+        self.root = self._join(OFF, OFF, OFF, OFF)
+        self.generation = 0
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """
+        Return the canonical node with the given quadrants.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.k + 1, nw, ne, sw, se, nw.n + ne.n + sw.n + se.n)
+            self._nodes[key] = node
+        return node
+
+    def _zero(self, k: int) -> Node:
+        """
+        Return the empty node of level k.
+        """
+        while len(self._zeros) <= k:
+            z = self._zeros[-1]
+            self._zeros.append(self._join(z, z, z, z))
+        return self._zeros[k]
+
+    def _centre(self, m: Node) -> Node:
+        """
+        Return a node one level up with m in its center and an empty border.
+        """
+        z = self._zero(m.k - 1)
+        return self._join(self._join(z, z, z, m.nw), self._join(z, z, m.ne, z),
+                          self._join(z, m.sw, z, z), self._join(m.se, z, z, z))
+
+    def _inner(self, m: Node) -> Node:
+        """
+        Return the central node one level down.
+        """
+        return self._join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+    def _is_padded(self, m: Node) -> bool:
+        """
+        Check that every live cell of m lies in its central half.
+        """
+        return m.k >= 2 and self._inner(m).n == m.n
+
+    def _life_4x4(self, m: Node) -> Node:
+        """
+        Advance the central 2x2 cells of a 4x4 node by one generation.
+        """
+        def rule(cells: List[Node]) -> Node:
+            centre = cells.pop(4)
+            outer = sum(cell.n for cell in cells)
+            return ON if outer == 3 or (centre.n and outer == 2) else OFF
+
+        a, b, c, d = m.nw, m.ne, m.sw, m.se
+        grid = [
+            [a.nw, a.ne, b.nw, b.ne],
+            [a.sw, a.se, b.sw, b.se],
+            [c.nw, c.ne, d.nw, d.ne],
+            [c.sw, c.se, d.sw, d.se],
+        ]
+        quads = [rule([grid[row + dr][col + dc] for dr in range(3) for dc in range(3)]) for row in (0, 1) for col in (0, 1)]
+        return self._join(*quads)
+
+    def _successor(self, m: Node, j: int) -> Node:
+        """
+        Return the central node one level down advanced by 2**min(j, k - 2) generations.
+
+        Args:
+        - m (Node): Node of level k >= 2.
+        - j (int): Log2 of the number of generations.
+
+        Returns:
+        - Node: Node of level k - 1.
+        """
+        if m.n == 0:
+            return m.nw
+        j = min(j, m.k - 2)
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            join = self._join
+            a, b, c, d = m.nw, m.ne, m.sw, m.se
+            # Nine overlapping sub-squares of level k - 1, each advanced in turn
+            c1 = self._successor(a, j)
+            c2 = self._successor(join(a.ne, b.nw, a.se, b.sw), j)
+            c3 = self._successor(b, j)
+            c4 = self._successor(join(a.sw, a.se, c.nw, c.ne), j)
+            c5 = self._successor(join(a.se, b.sw, c.ne, d.nw), j)
+            c6 = self._successor(join(b.sw, b.se, d.nw, d.ne), j)
+            c7 = self._successor(c, j)
+            c8 = self._successor(join(c.ne, d.nw, c.se, d.sw), j)
+            c9 = self._successor(d, j)
+
+            if j < m.k - 2:
+                # The nine results are already far enough ahead; just stitch their centers
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw), join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw), join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                # Advance the four overlapping combinations a second time
+                result = join(self._successor(join(c1, c2, c4, c5), j), self._successor(join(c2, c3, c5, c6), j),
+                              self._successor(join(c4, c5, c7, c8), j), self._successor(join(c5, c6, c8, c9), j))
+
+        self._results[key] = result
+        return result
+
+    def _collect(self) -> None:
+        """
+        Evict cached results and every node no longer reachable from the root.
+        """
+        self._results.clear()
+        self._nodes = {}
+        self._zeros = [OFF]
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.k == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in self._nodes:
+                self._nodes[key] = node
+                stack.extend(key)
+
+    def _advance(self, j: int) -> None:
+        """
+        Advance the universe by exactly 2**j generations.
+        """
+        root = self.root
+        # Pad until the pattern cannot reach the edge of the region being computed
+        while root.k < j + 2 or not self._is_padded(root):
+            root = self._centre(root)
+        self.root = self._successor(self._centre(root), j)
+        self.generation += 1 << j
+
+    def _crop(self) -> None:
+        """
+        Shrink the root while its outer ring is empty.
+        """
+        while self.root.k > 1 and self._is_padded(self.root):
+            self.root = self._inner(self.root)
+
+    def step(self, generations: int = 1) -> None:
+        """
+        Advance the universe by a number of generations.
+
+        Powers of two are computed in a single recursive pass; other counts are
+        split into their binary digits.
+
+        Args:
+        - generations (int): Number of generations to advance.
+        """
+        if generations < 0:
+            raise ValueError("The number of generations cannot be negative!")
+        j = 0
+        while generations:
+            if generations & 1:
+                self._advance(j)
+                self._crop()
+                if len(self._nodes) > self.max_nodes:
+                    self._collect()
+            generations >>= 1
+            j += 1
+
+    def population(self) -> int:
+        """
+        Count the live cells in the universe.
+
+        Returns:
+        - int: Number of live cells.
+        """
+        return self.root.n
+
+    def _build(self, board: List[List[int]], k: int, top: int, left: int) -> Node:
+        """
+        Build the node of level k whose top-left cell is board[top][left].
+        """
+        if top >= len(board) or left >= len(board[0]):
+            return self._zero(k)
+        if k == 0:
+            return ON if board[top][left] else OFF
+        half = 1 << (k - 1)
+        return self._join(self._build(board, k - 1, top, left), self._build(board, k - 1, top, left + half),
+                          self._build(board, k - 1, top + half, left), self._build(board, k - 1, top + half, left + half))
+
+    def load(self, board: List[List[int]]) -> None:
+        """
+        Replace the universe with a board, its top-left cell at (0, 0).
+
+        Args:
+        - board (List[List[int]]): 2D list representing the game board.
+        """
+        size = max(len(board), len(board[0]))
+        k = max(1, (size - 1).bit_length())
+        z = self._zero(k)
+        # The board fills the south-east quadrant of a root centered on the origin
+        self.root = self._join(z, z, z, self._build(board, k, 0, 0))
+        self.generation = 0
+
+    def live_cells(self, top: int, left: int, rows: int, cols: int) -> List[Tuple[int, int]]:
+        """
+        List the live cells inside a window of the universe.
+
+        Args:
+        - top (int): First row of the window.
+        - left (int): First column of the window.
+        - rows (int): Height of the window.
+        - cols (int): Width of the window.
+
+        Returns:
+        - List[Tuple[int, int]]: (row, col) coordinates of the live cells.
+        """
+        cells = []
+        half = 1 << (self.root.k - 1)
+        stack = [(self.root, -half, -half)]
+        while stack:
+            node, y, x = stack.pop()
+            size = 1 << node.k
+            # Skip empty nodes and nodes entirely outside the window
+            if node.n == 0 or y >= top + rows or x >= left + cols or y + size <= top or x + size <= left:
+                continue
+            if node.k == 0:
+                cells.append((y, x))
+                continue
+            half = size >> 1
+            stack.extend([(node.nw, y, x), (node.ne, y, x + half), (node.sw, y + half, x), (node.se, y + half, x + half)])
+        return cells
+
+    def to_board(self, rows: int, cols: int, top: int = 0, left: int = 0) -> List[List[int]]:
+        """
+        Export a window of the universe as a board.
+
+        Args:
+        - rows (int): Height of the board.
+        - cols (int): Width of the board.
+        - top (int): First row of the window.
+        - left (int): First column of the window.
+
+        Returns:
+        - List[List[int]]: 2D list representing the game board.
+        """
+        board = [[0] * cols for _ in range(rows)]
+        for row, col in self.live_cells(top, left, rows, cols):
+            board[row - top][col - left] = 1
+        return board
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], max_nodes: int = 1 << 20) -> "Hashlife":
+        """
+        Create a universe from a board.
+
+        Args:
+        - board (List[List[int]]): 2D list representing the game board.
+        - max_nodes (int): Size of the node cache above which caches are evicted.
+
+        Returns:
+        - Hashlife: The universe holding the board.
+        """
+        universe = cls(max_nodes)
+        universe.load(board)
+        return universe
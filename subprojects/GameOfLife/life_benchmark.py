@@ -0,0 +1,141 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Headless Benchmark Runner for Conway's Game of Life.
+
+Input:
+- Command-line options for board size, number of generations, seed, engines and output format.
+
+Output:
+- One result per engine with the elapsed time, generations/sec and cells/sec,
+  as JSON lines or CSV so results can be tracked over time.
+
+Features:
+- Runs without a display: no Pygame window is opened and there is no frame delay.
+- Seeds the board so every engine steps exactly the same starting pattern.
+- Repeats each run and reports the fastest, to reduce timing noise.
+- Usable from Python through `run_benchmark()` and `benchmark_engines()`.
+
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+# Keep Pygame's import banner out of the machine-readable output
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game_of_life import initialize_board
+from life_engines import ENGINES, create_engine
+
+# Column order of a benchmark result
+FIELDS = ["engine", "rows", "cols", "generations", "wrap", "seed", "seconds", "generations_per_sec", "cells_per_sec", "population"]
+
+def run_benchmark(engine_name: str, board: List[List[int]], generations: int, wrap: bool = False, repeat: int = 1) -> Dict[str, Union[str, int, float, bool]]:
+    """
+    Time one engine stepping a board for a number of generations.
+
+    Args:
+    - engine_name (str): Name of the engine, one of the keys of `ENGINES`.
+    - board (List[List[int]]): 2D list representing the starting board.
+    - generations (int): Number of generations to run.
+    - wrap (bool): If True, edges wrap around to the opposite side of the board.
+    - repeat (int): Number of runs; the fastest one is reported.
+
+    Returns:
+    - Dict[str, Union[str, int, float, bool]]: The benchmark result.
+    """
+    rows, cols = len(board), len(board[0])
+    best = float("inf")
+
+    for _ in range(repeat):
+        # Loading the board is not part of the measured time
+        engine = create_engine(engine_name, board, wrap)
+        start = time.perf_counter()
+        engine.step(generations)
+        best = min(best, time.perf_counter() - start)
+
+    seconds = max(best, 1e-9)
+    return {
+        "engine": engine_name,
+        "rows": rows,
+        "cols": cols,
+        "generations": generations,
+        "wrap": wrap,
+        "seconds": round(best, 6),
+        "generations_per_sec": round(generations / seconds, 3),
+        "cells_per_sec": round(generations * rows * cols / seconds, 1),
+        "population": engine.population(),
+    }
+
+def benchmark_engines(rows: int, cols: int, generations: int, seed: int = 0, engines: Optional[Sequence[str]] = None, wrap: bool = False, repeat: int = 1) -> List[Dict[str, Union[str, int, float, bool]]]:
+    """
+    Benchmark several engines on the same seeded board.
+
+    Args:
+    - rows (int): Number of rows of the board.
+    - cols (int): Number of columns of the board.
+    - generations (int): Number of generations to run.
+    - seed (int): Seed of the starting board.
+    - engines (Optional[Sequence[str]]): Names of the engines to run, or None for all of them.
+    - wrap (bool): If True, edges wrap around to the opposite side of the board.
+    - repeat (int): Number of runs per engine; the fastest one is reported.
+
+    Returns:
+    - List[Dict[str, Union[str, int, float, bool]]]: One result per engine.
+    """
+    board = initialize_board(rows, cols, seed)
+    results = []
+
+    for name in engines or list(ENGINES):
+        # Engines without edge wrapping are skipped rather than compared unfairly
+        if wrap and not ENGINES[name].supports_wrap:
+            continue
+        result = run_benchmark(name, board, generations, wrap, repeat)
+        result["seed"] = seed
+        results.append(result)
+    return results
+
+def write_results(results: List[Dict[str, Union[str, int, float, bool]]], output_format: str = "json") -> None:
+    """
+    Write benchmark results to standard output.
+
+    Args:
+    - results (List[Dict[str, Union[str, int, float, bool]]]): The benchmark results.
+    - output_format (str): 'json' for one JSON object per line, or 'csv'.
+    """
+    if output_format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    else:
+        for result in results:
+            print(json.dumps(result))
+
+def main():
+    """
+    Main function to run the benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life stepping engines without a display.")
+    parser.add_argument("--rows", type=int, default=200, help="number of rows of the board")
+    parser.add_argument("--cols", type=int, default=200, help="number of columns of the board")
+    parser.add_argument("--generations", type=int, default=50, help="number of generations to run")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the starting board")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), help="engines to run (default: all)")
+    parser.add_argument("--wrap", action="store_true", help="wrap edges around to the opposite side of the board")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per engine; the fastest is reported")
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="output format")
+    args = parser.parse_args()
+
+    results = benchmark_engines(args.rows, args.cols, args.generations, args.seed, args.engines, args.wrap, args.repeat)
+    write_results(results, args.format)
+
+if __name__ == "__main__":
+    main()
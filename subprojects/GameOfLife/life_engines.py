@@ -0,0 +1,281 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Stepping Engines for Conway's Game of Life.
+
+Input:
+- A board as a 2D list of 0/1 cell values, as produced by `initialize_board()`.
+
+Output:
+- The board evolved by any number of generations.
+
+Features:
+- Pure-Python engine applying the B3/S23 rules cell by cell.
+- NumPy engine counting neighbors with shifted-array sums on a `uint8` grid.
+- Hashlife engine for long runs on an unbounded plane (see `hashlife.py`).
+- Sparse engine stepping only the cells next to last generation's changes (see `sparse_life.py`).
+- Bit-packed engine storing one bit per cell and counting neighbors with bitwise adders (see `bit_board.py`).
+- Bounded edges (cells outside the board are dead) or optional toroidal wrap.
+- Engine registry so engines can be selected by name and compared side by side.
+
+"""
+
+from typing import Dict, List, Type
+import numpy as np
+from bit_board import BitBoard
+from hashlife import Hashlife
+from sparse_life import SparseLife
+
+# Offsets of the eight cells surrounding a cell
+NEIGHBORS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (-1, 1), (1, -1)]
+
+def step_python(board: List[List[int]], wrap: bool = False) -> None:
+    """
+    Apply the rules of Conway's Game of Life to the board in place, one cell at a time.
+
+    Args:
+    - board (List[List[int]]): 2D list representing the game board.
+    - wrap (bool): If True, edges wrap around to the opposite side of the board.
+    """
+    rows, cols = len(board), len(board[0])
+    copy_board = [[board[row][col] for col in range(cols)] for row in range(rows)]
+
+    for row in range(rows):
+        for col in range(cols):
+            if wrap:
+                live_neighbors = sum(copy_board[(row + dr) % rows][(col + dc) % cols] for dr, dc in NEIGHBORS)
+            else:
+                live_neighbors = sum(copy_board[row + dr][col + dc] for dr, dc in NEIGHBORS if 0 <= row + dr < rows and 0 <= col + dc < cols)
+
+            if copy_board[row][col] == 1 and (live_neighbors < 2 or live_neighbors > 3):
+                board[row][col] = 0
+            elif copy_board[row][col] == 0 and live_neighbors == 3:
+                board[row][col] = 1
+
+def count_neighbors(grid: np.ndarray, wrap: bool = False) -> np.ndarray:
+    """
+    Count the live neighbors of every cell with eight shifted-array sums.
+
+    Args:
+    - grid (np.ndarray): 2D `uint8` array of 0/1 cell values.
+    - wrap (bool): If True, edges wrap around to the opposite side of the grid.
+
+    Returns:
+    - np.ndarray: 2D `uint8` array with the live neighbor count of each cell.
+    """
+    counts = np.zeros_like(grid)
+
+    if wrap:
+        for dr, dc in NEIGHBORS:
+            counts += np.roll(grid, (dr, dc), axis=(0, 1))
+        return counts
+
+    # Pad with a ring of dead cells so every shifted view has the grid's shape
+    rows, cols = grid.shape
+    padded = np.pad(grid, 1)
+    for dr, dc in NEIGHBORS:
+        counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return counts
+
+def step_numpy(grid: np.ndarray, wrap: bool = False) -> np.ndarray:
+    """
+    Apply the rules of Conway's Game of Life to a whole grid at once.
+
+    Args:
+    - grid (np.ndarray): 2D `uint8` array of 0/1 cell values.
+    - wrap (bool): If True, edges wrap around to the opposite side of the grid.
+
+    Returns:
+    - np.ndarray: 2D `uint8` array holding the next generation.
+    """
+    counts = count_neighbors(grid, wrap)
+    # Birth on exactly three neighbors, survival on two or three
+    return ((counts == 3) | ((grid == 1) & (counts == 2))).astype(np.uint8)
+
+class LifeEngine:
+    """
+    Base class for Game of Life stepping engines.
+
+    Engines are loaded from a list-of-lists board, advanced with `step()` and
+    exported back with `to_board()`, so they can be swapped for one another.
+    """
+
+    name = "base"
+    supports_wrap = True
+
+    def __init__(self, board: List[List[int]], wrap: bool = False):
+        """
+        Initialize the engine from a board.
+
+        Args:
+        - board (List[List[int]]): 2D list representing the game board.
+        - wrap (bool): If True, edges wrap around to the opposite side of the board.
+        """
+        self.rows, self.cols = len(board), len(board[0])
+        self.wrap = wrap
+        self.generation = 0
+
+    def step(self, generations: int = 1) -> None:
+        """
+        Advance the board by a number of generations.
+
+        Args:
+        - generations (int): Number of generations to advance.
+        """
+        raise NotImplementedError
+
+    def to_board(self) -> List[List[int]]:
+        """
+        Export the current state of the engine.
+
+        Returns:
+        - List[List[int]]: 2D list representing the game board.
+        """
+        raise NotImplementedError
+
+    def population(self) -> int:
+        """
+        Count the live cells on the board.
+
+        Returns:
+        - int: Number of live cells.
+        """
+        return sum(map(sum, self.to_board()))
+
+class PythonEngine(LifeEngine):
+    """
+    Engine stepping a list-of-lists board with the pure-Python rules.
+    """
+
+    name = "python"
+
+    def __init__(self, board: List[List[int]], wrap: bool = False):
+        super().__init__(board, wrap)
+        self.board = [list(row) for row in board]
+
+    def step(self, generations: int = 1) -> None:
+        for _ in range(generations):
+            step_python(self.board, self.wrap)
+        self.generation += generations
+
+    def to_board(self) -> List[List[int]]:
+        return [list(row) for row in self.board]
+
+class NumpyEngine(LifeEngine):
+    """
+    Engine stepping a `uint8` NumPy grid with vectorized neighbor counts.
+    """
+
+    name = "numpy"
+
+    def __init__(self, board: List[List[int]], wrap: bool = False):
+        super().__init__(board, wrap)
+        self.grid = np.array(board, dtype=np.uint8)
+
+    def step(self, generations: int = 1) -> None:
+        for _ in range(generations):
+            self.grid = step_numpy(self.grid, self.wrap)
+        self.generation += generations
+
+    def to_board(self) -> List[List[int]]:
+        return self.grid.tolist()
+
+    def population(self) -> int:
+        return int(self.grid.sum())
+
+class HashlifeEngine(LifeEngine):
+    """
+    Engine stepping a Hashlife quadtree on an unbounded plane.
+
+    Cells leaving the board keep evolving outside it, so results only match the
+    bounded engines while the pattern stays clear of the edges.
+    """
+
+    name = "hashlife"
+    supports_wrap = False
+
+    def __init__(self, board: List[List[int]], wrap: bool = False):
+        if wrap:
+            raise ValueError("The hashlife engine runs on an unbounded plane and cannot wrap edges!")
+        super().__init__(board, wrap)
+        self.universe = Hashlife.from_board(board)
+
+    def step(self, generations: int = 1) -> None:
+        self.universe.step(generations)
+        self.generation += generations
+
+    def to_board(self) -> List[List[int]]:
+        return self.universe.to_board(self.rows, self.cols)
+
+    def population(self) -> int:
+        return len(self.universe.live_cells(0, 0, self.rows, self.cols))
+
+class SparseEngine(LifeEngine):
+    """
+    Engine stepping a set of live cells, examining only the changed-cell frontier.
+    """
+
+    name = "sparse"
+
+    def __init__(self, board: List[List[int]], wrap: bool = False):
+        super().__init__(board, wrap)
+        self.universe = SparseLife.from_board(board, wrap=wrap)
+
+    def step(self, generations: int = 1) -> None:
+        self.universe.step(generations)
+        self.generation += generations
+
+    def to_board(self) -> List[List[int]]:
+        return self.universe.to_board()
+
+    def population(self) -> int:
+        return self.universe.population()
+
+class BitPackedEngine(LifeEngine):
+    """
+    Engine stepping a board packed at one bit per cell, a whole row at a time.
+    """
+
+    name = "bitpacked"
+
+    def __init__(self, board: List[List[int]], wrap: bool = False):
+        super().__init__(board, wrap)
+        self.packed = BitBoard.from_board(board, wrap)
+
+    def step(self, generations: int = 1) -> None:
+        self.packed.step(generations)
+        self.generation += generations
+
+    def to_board(self) -> List[List[int]]:
+        return self.packed.to_board()
+
+    def population(self) -> int:
+        return self.packed.population()
+
+# Registry of the available engines, keyed by name
+ENGINES: Dict[str, Type[LifeEngine]] = {
+    PythonEngine.name: PythonEngine,
+    NumpyEngine.name: NumpyEngine,
+    HashlifeEngine.name: HashlifeEngine,
+    SparseEngine.name: SparseEngine,
+    BitPackedEngine.name: BitPackedEngine,
+}
+
+def create_engine(name: str, board: List[List[int]], wrap: bool = False) -> LifeEngine:
+    """
+    Create a stepping engine by name.
+
+    Args:
+    - name (str): Name of the engine, one of the keys of `ENGINES`.
+    - board (List[List[int]]): 2D list representing the game board.
+    - wrap (bool): If True, edges wrap around to the opposite side of the board.
+
+    Returns:
+    - LifeEngine: The engine loaded with the board.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}'! Choose one of: {', '.join(ENGINES)}.")
+    return ENGINES[name](board, wrap)
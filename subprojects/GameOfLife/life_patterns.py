@@ -0,0 +1,207 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Pattern Files for Conway's Game of Life.
+
+Input:
+- Pattern files in the RLE (.rle) or plaintext (.cells) formats.
+
+Output:
+- Bit-packed boards, and pattern files written back from them.
+
+Features:
+- Parses RLE run lengths straight into row bit masks, without expanding cells into lists.
+- Reads and writes the plaintext format, with '!' comment lines.
+- Places a pattern at an offset inside a larger board, so known patterns can seed big boards.
+- Picks the format from the file extension.
+
+"""
+
+import re
+from typing import List, Optional
+from bit_board import BitBoard
+
+# Rules accepted in an RLE header, all spellings of Conway's B3/S23
+CONWAY_RULES = {"b3/s23", "23/3", "s23/b3"}
+
+# Longest line written to an RLE file, as recommended by the format
+RLE_LINE_LENGTH = 70
+
+RLE_HEADER = re.compile(r"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?", re.IGNORECASE)
+RLE_TOKEN = re.compile(r"(\d*)([a-zA-Z$!])")
+
+def _place(rows_bits: List[int], width: int, rows: Optional[int], cols: Optional[int], top: int, left: int, wrap: bool) -> BitBoard:
+    """
+    Build a board of the requested size with the pattern's rows at an offset.
+    """
+    rows = len(rows_bits) + top if rows is None else rows
+    cols = width + left if cols is None else cols
+    if top + len(rows_bits) > rows or left + width > cols:
+        raise ValueError(f"A {width}x{len(rows_bits)} pattern at ({top}, {left}) does not fit a {cols}x{rows} board!")
+
+    board = BitBoard(rows, cols, wrap=wrap)
+    for index, bits in enumerate(rows_bits):
+        board.bits[top + index] = bits << left
+    return board
+
+def parse_rle(text: str, rows: Optional[int] = None, cols: Optional[int] = None, top: int = 0, left: int = 0, wrap: bool = False) -> BitBoard:
+    """
+    Parse a pattern in the RLE format.
+
+    Args:
+    - text (str): Contents of the RLE file.
+    - rows (Optional[int]): Number of rows of the board, defaults to fit the pattern.
+    - cols (Optional[int]): Number of columns of the board, defaults to fit the pattern.
+    - top (int): Row of the board where the pattern's first row is placed.
+    - left (int): Column of the board where the pattern's first column is placed.
+    - wrap (bool): If True, edges of the board wrap around.
+
+    Returns:
+    - BitBoard: The board holding the pattern.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith("#")]
+    if not lines:
+        raise ValueError("The RLE pattern is empty!")
+
+    header = RLE_HEADER.match(lines[0])
+    if header is None:
+        raise ValueError(f"Invalid RLE header: '{lines[0]}'")
+    width, height = int(header.group(1)), int(header.group(2))
+    rule = header.group(3)
+    if rule is not None and rule.lower() not in CONWAY_RULES:
+        raise ValueError(f"Unsupported rule '{rule}'! Only B3/S23 patterns can be loaded.")
+
+    rows_bits = [0] * height
+    row = col = 0
+    for count, tag in RLE_TOKEN.findall("".join(lines[1:])):
+        run = int(count) if count else 1
+        if tag == "!":
+            break
+        if tag == "$":
+            row += run
+            col = 0
+            continue
+        if row >= height or col + run > width:
+            raise ValueError(f"The RLE pattern does not fit its {width}x{height} header!")
+        # Any state other than 'b' is treated as a live cell
+        if tag != "b":
+            rows_bits[row] |= ((1 << run) - 1) << col
+        col += run
+
+    return _place(rows_bits, width, rows, cols, top, left, wrap)
+
+def format_rle(board: BitBoard) -> str:
+    """
+    Format a board in the RLE format.
+
+    Args:
+    - board (BitBoard): The board to format.
+
+    Returns:
+    - str: Contents of the RLE file.
+    """
+    tokens = []
+
+    def emit(run: int, tag: str) -> None:
+        tokens.append(f"{run if run > 1 else ''}{tag}")
+
+    pending_rows = 0
+    for bits in board.bits:
+        if bits == 0:
+            pending_rows += 1
+            continue
+        # Empty rows before this one are folded into a single end-of-row run
+        if tokens or pending_rows:
+            emit(pending_rows + (1 if tokens else 0), "$")
+        pending_rows = 0
+
+        col = 0
+        while bits >> col:
+            tag = "o" if (bits >> col) & 1 else "b"
+            run = 1
+            while (bits >> (col + run)) and ((bits >> (col + run)) & 1) == (tag == "o"):
+                run += 1
+            emit(run, tag)
+            col += run
+    tokens.append("!")
+
+    lines = [f"x = {board.cols}, y = {board.rows}, rule = B3/S23"]
+    line = ""
+    for token in tokens:
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            lines.append(line)
+            line = ""
+        line += token
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+def parse_plaintext(text: str, rows: Optional[int] = None, cols: Optional[int] = None, top: int = 0, left: int = 0, wrap: bool = False) -> BitBoard:
+    """
+    Parse a pattern in the plaintext format, with 'O' for live and '.' for dead cells.
+
+    Args:
+    - text (str): Contents of the plaintext file.
+    - rows (Optional[int]): Number of rows of the board, defaults to fit the pattern.
+    - cols (Optional[int]): Number of columns of the board, defaults to fit the pattern.
+    - top (int): Row of the board where the pattern's first row is placed.
+    - left (int): Column of the board where the pattern's first column is placed.
+    - wrap (bool): If True, edges of the board wrap around.
+
+    Returns:
+    - BitBoard: The board holding the pattern.
+    """
+    lines = [line.rstrip() for line in text.splitlines() if not line.startswith("!")]
+    rows_bits = [sum(1 << col for col, char in enumerate(line) if char in "O*") for line in lines]
+    width = max((len(line) for line in lines), default=0)
+    return _place(rows_bits, width, rows, cols, top, left, wrap)
+
+def format_plaintext(board: BitBoard, name: Optional[str] = None) -> str:
+    """
+    Format a board in the plaintext format.
+
+    Args:
+    - board (BitBoard): The board to format.
+    - name (Optional[str]): Name of the pattern, written as a comment.
+
+    Returns:
+    - str: Contents of the plaintext file.
+    """
+    lines = [f"!Name: {name}"] if name else []
+    lines += ["".join("O" if (bits >> col) & 1 else "." for col in range(board.cols)) for bits in board.bits]
+    return "\n".join(lines) + "\n"
+
+def load_pattern(path: str, rows: Optional[int] = None, cols: Optional[int] = None, top: int = 0, left: int = 0, wrap: bool = False) -> BitBoard:
+    """
+    Load a pattern file, RLE for '.rle' files and plaintext otherwise.
+
+    Args:
+    - path (str): Path of the pattern file.
+    - rows (Optional[int]): Number of rows of the board, defaults to fit the pattern.
+    - cols (Optional[int]): Number of columns of the board, defaults to fit the pattern.
+    - top (int): Row of the board where the pattern's first row is placed.
+    - left (int): Column of the board where the pattern's first column is placed.
+    - wrap (bool): If True, edges of the board wrap around.
+
+    Returns:
+    - BitBoard: The board holding the pattern.
+    """
+    with open(path, "r") as file:
+        text = file.read()
+    parse = parse_rle if path.lower().endswith(".rle") else parse_plaintext
+    return parse(text, rows, cols, top, left, wrap)
+
+def save_pattern(board: BitBoard, path: str) -> None:
+    """
+    Save a board to a pattern file, RLE for '.rle' files and plaintext otherwise.
+
+    Args:
+    - board (BitBoard): The board to save.
+    - path (str): Path of the pattern file.
+    """
+    text = format_rle(board) if path.lower().endswith(".rle") else format_plaintext(board)
+    with open(path, "w") as file:
+        file.write(text)
@@ -0,0 +1,155 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Renderers for Conway's Game of Life.
+
+Input:
+- Successive generations of a board, as 2D lists or NumPy arrays of 0/1 cell values.
+
+Output:
+- The board drawn on a Pygame surface.
+
+Features:
+- Full renderer drawing one rectangle per cell, like `draw_board()`.
+- Dirty-rectangle renderer redrawing only the cells that changed since the last frame.
+- Surfarray renderer blitting the whole board at once from a NumPy array.
+- Renderer registry so renderers can be selected by name.
+
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+import numpy as np
+import pygame
+
+Board = Union[List[List[int]], np.ndarray]
+Color = Tuple[int, int, int]
+
+# Colors of dead and live cells, matching draw_board()
+DEFAULT_COLORS = ((255, 255, 255), (0, 255, 0))
+
+class Renderer:
+    """
+    Base class for Game of Life renderers.
+    """
+
+    name = "base"
+
+    def __init__(self, screen: pygame.Surface, cell_size: int, colors: Sequence[Color] = DEFAULT_COLORS):
+        """
+        Initialize the renderer.
+
+        Args:
+        - screen (pygame.Surface): Display surface to draw on.
+        - cell_size (int): Size of a cell in pixels.
+        - colors (Sequence[Color]): Colors of dead and live cells.
+        """
+        self.screen = screen
+        self.cell_size = cell_size
+        self.colors = colors
+
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        """
+        Return the screen rectangle covered by a cell.
+        """
+        return pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+
+    def draw(self, board: Board) -> None:
+        """
+        Draw a generation and update the display.
+
+        Args:
+        - board (Board): 2D list or array representing the game board.
+        """
+        raise NotImplementedError
+
+class FullRenderer(Renderer):
+    """
+    Renderer drawing every cell on every frame.
+    """
+
+    name = "full"
+
+    def draw(self, board: Board) -> None:
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                pygame.draw.rect(self.screen, self.colors[int(cell)], self.cell_rect(row, col))
+        pygame.display.update()
+
+class DirtyRectRenderer(Renderer):
+    """
+    Renderer diffing consecutive generations and redrawing only the changed cells.
+
+    Only the rectangles of the changed cells are passed to `pygame.display.update()`,
+    so the cost of a frame scales with how much the board changed.
+    """
+
+    name = "dirty"
+
+    def __init__(self, screen: pygame.Surface, cell_size: int, colors: Sequence[Color] = DEFAULT_COLORS):
+        super().__init__(screen, cell_size, colors)
+        self.previous: Optional[np.ndarray] = None
+
+    def draw(self, board: Board) -> None:
+        grid = np.asarray(board, dtype=np.uint8)
+
+        # The first frame, or a board of a new size, is drawn in full
+        if self.previous is None or self.previous.shape != grid.shape:
+            changed = np.argwhere(np.ones_like(grid, dtype=bool))
+        else:
+            changed = np.argwhere(grid != self.previous)
+
+        rects = []
+        for row, col in changed.tolist():
+            rect = self.cell_rect(row, col)
+            self.screen.fill(self.colors[grid[row, col]], rect)
+            rects.append(rect)
+
+        self.previous = grid.copy()
+        if rects:
+            pygame.display.update(rects)
+
+class SurfarrayRenderer(Renderer):
+    """
+    Renderer building the whole frame as a NumPy pixel array and blitting it at once.
+    """
+
+    name = "surfarray"
+
+    def __init__(self, screen: pygame.Surface, cell_size: int, colors: Sequence[Color] = DEFAULT_COLORS):
+        super().__init__(screen, cell_size, colors)
+        self.palette = np.array(colors, dtype=np.uint8)
+
+    def draw(self, board: Board) -> None:
+        grid = np.asarray(board, dtype=np.uint8)
+        # Surfarrays are indexed (x, y), so transpose before mapping cells to colors
+        pixels = self.palette[grid.T]
+        pixels = pixels.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1)
+        pygame.surfarray.blit_array(self.screen.subsurface((0, 0, pixels.shape[0], pixels.shape[1])), pixels)
+        pygame.display.update()
+
+# Registry of the available renderers, keyed by name
+RENDERERS: Dict[str, Type[Renderer]] = {
+    FullRenderer.name: FullRenderer,
+    DirtyRectRenderer.name: DirtyRectRenderer,
+    SurfarrayRenderer.name: SurfarrayRenderer,
+}
+
+def create_renderer(name: str, screen: pygame.Surface, cell_size: int, colors: Sequence[Color] = DEFAULT_COLORS) -> Renderer:
+    """
+    Create a renderer by name.
+
+    Args:
+    - name (str): Name of the renderer, one of the keys of `RENDERERS`.
+    - screen (pygame.Surface): Display surface to draw on.
+    - cell_size (int): Size of a cell in pixels.
+    - colors (Sequence[Color]): Colors of dead and live cells.
+
+    Returns:
+    - Renderer: The renderer.
+    """
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer '{name}'! Choose one of: {', '.join(RENDERERS)}.")
+    return RENDERERS[name](screen, cell_size, colors)
@@ -0,0 +1,161 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Sparse Active-Set Engine for Conway's Game of Life.
+
+Input:
+- A board as a 2D list of 0/1 cell values, or any set of live (row, col) coordinates.
+
+Output:
+- The live cells evolved by any number of generations.
+
+Features:
+- Stores only the coordinates of live cells, so empty space costs nothing.
+- Re-examines only cells whose neighborhood changed in the last generation,
+  so the work per step is proportional to activity rather than board area.
+- Bounded boards, toroidal wrap, or an unbounded plane when no size is given.
+
+"""
+
+from typing import Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+
+# Offsets of a cell and the eight cells surrounding it
+NEIGHBORHOOD = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+
+class SparseLife:
+    """
+    Game of Life universe stored as a set of live cells with a changed-cell frontier.
+    """
+
+    def __init__(self, cells: Iterable[Cell] = (), rows: Optional[int] = None, cols: Optional[int] = None, wrap: bool = False):
+        """
+        Initialize the universe.
+
+        Args:
+        - cells (Iterable[Cell]): (row, col) coordinates of the live cells.
+        - rows (Optional[int]): Number of rows of the board, or None for an unbounded plane.
+        - cols (Optional[int]): Number of columns of the board, or None for an unbounded plane.
+        - wrap (bool): If True, edges wrap around to the opposite side of the board.
+        """
+        if wrap and (rows is None or cols is None):
+            raise ValueError("Wrapping edges needs a board size!")
+        self.rows, self.cols = rows, cols
+        self.wrap = wrap
+        self.live: Set[Cell] = set(cells)
+        # Every cell is unknown at the start, so every live cell seeds the frontier
+        self.changed: Set[Cell] = set(self.live)
+        self.generation = 0
+
+    def _neighborhood(self, row: int, col: int) -> List[Cell]:
+        """
+        Return a cell and its neighbors that lie on the board.
+        """
+        cells = [(row + dr, col + dc) for dr, dc in NEIGHBORHOOD]
+        if self.wrap:
+            return [(r % self.rows, c % self.cols) for r, c in cells]
+        if self.rows is None:
+            return cells
+        return [(r, c) for r, c in cells if 0 <= r < self.rows and 0 <= c < self.cols]
+
+    def _advance(self) -> None:
+        """
+        Advance the universe by one generation, examining only the frontier.
+        """
+        # Only cells next to a change can change themselves
+        candidates = set()
+        for row, col in self.changed:
+            candidates.update(self._neighborhood(row, col))
+
+        live = self.live
+        births, deaths = [], []
+        for cell in candidates:
+            if self.wrap:
+                live_neighbors = sum(neighbor in live for neighbor in self._neighborhood(*cell))
+            else:
+                # Cells off the board are never live, so they need no bounds check here
+                row, col = cell
+                live_neighbors = ((row - 1, col - 1) in live) + ((row - 1, col) in live) + ((row - 1, col + 1) in live) + \
+                                 ((row, col - 1) in live) + (cell in live) + ((row, col + 1) in live) + \
+                                 ((row + 1, col - 1) in live) + ((row + 1, col) in live) + ((row + 1, col + 1) in live)
+
+            # The count includes the cell itself: a live cell survives on 3 or 4, a dead one is born on 3
+            if cell in live:
+                if live_neighbors != 3 and live_neighbors != 4:
+                    deaths.append(cell)
+            elif live_neighbors == 3:
+                births.append(cell)
+
+        live.difference_update(deaths)
+        live.update(births)
+        self.changed = set(births)
+        self.changed.update(deaths)
+
+    def step(self, generations: int = 1) -> None:
+        """
+        Advance the universe by a number of generations.
+
+        Args:
+        - generations (int): Number of generations to advance.
+        """
+        for _ in range(generations):
+            # Once nothing changes, nothing can change again
+            if not self.changed:
+                break
+            self._advance()
+        self.generation += generations
+
+    def population(self) -> int:
+        """
+        Count the live cells.
+
+        Returns:
+        - int: Number of live cells.
+        """
+        return len(self.live)
+
+    def to_board(self, rows: Optional[int] = None, cols: Optional[int] = None, top: int = 0, left: int = 0) -> List[List[int]]:
+        """
+        Export a window of the universe as a board.
+
+        Args:
+        - rows (Optional[int]): Height of the board, defaults to the board size.
+        - cols (Optional[int]): Width of the board, defaults to the board size.
+        - top (int): First row of the window.
+        - left (int): First column of the window.
+
+        Returns:
+        - List[List[int]]: 2D list representing the game board.
+        """
+        rows = self.rows if rows is None else rows
+        cols = self.cols if cols is None else cols
+        if rows is None or cols is None:
+            raise ValueError("An unbounded universe needs a window size to export!")
+
+        board = [[0] * cols for _ in range(rows)]
+        for row, col in self.live:
+            if top <= row < top + rows and left <= col < left + cols:
+                board[row - top][col - left] = 1
+        return board
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], bounded: bool = True, wrap: bool = False) -> "SparseLife":
+        """
+        Create a universe from a board.
+
+        Args:
+        - board (List[List[int]]): 2D list representing the game board.
+        - bounded (bool): If False, the board is placed on an unbounded plane.
+        - wrap (bool): If True, edges wrap around to the opposite side of the board.
+
+        Returns:
+        - SparseLife: The universe holding the board's live cells.
+        """
+        cells = [(row, col) for row, values in enumerate(board) for col, cell in enumerate(values) if cell]
+        if not bounded:
+            return cls(cells)
+        return cls(cells, len(board), len(board[0]), wrap)
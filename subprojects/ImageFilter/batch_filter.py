@@ -0,0 +1,275 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Headless Batch Filtering for the Image Filtering Program.
+
+Input:
+- Command-line options for the input directory, the output directory, the filter chain
+  (e.g. Gaussian:5 Median:3) and the number of worker processes.
+
+Output:
+- For every image under the input directory, the filtered color image, and optionally its grayscale
+  version, at the same relative path under the output directory, e.g. photos/a.png filtered with
+  Gaussian:5 gives photos/a_png_color_Gaussian5.jpg.
+- The number of images filtered, skipped and failed, and the throughput in images/sec and megapixels/sec.
+
+Features:
+- Runs without a display, using the same Mean, Gaussian, Median and Custom filters as the GUI.
+- Decodes, filters and encodes every image inside a worker process, so the main process only handles
+  paths and at most a few images per worker are in memory at once, however large the directory is.
+- Skips images whose outputs are newer than the image; the filter chain is part of the output names,
+  so changing it writes new outputs.
+- Writes outputs through a temporary file, so an interrupted run never leaves a truncated output
+  that would later be taken as up to date.
+- Keeps going when an image fails, reporting the error.
+
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set
+import cv2
+import numpy as np
+from tiled_filter import FILTERS, validate
+from custom_filter import snap_filter
+
+# Extensions of the images read, as in the GUI's file dialog
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Extension of the outputs, as written by save_filtered_images()
+OUTPUT_EXTENSION = '.jpg'
+
+# Images submitted per worker ahead of the results, bounding the pending tasks
+TASKS_PER_WORKER = 2
+
+class FilterStep(NamedTuple):
+    """
+    One filter of a chain and its kernel size.
+    """
+    filter_name: str
+    kernel_size: int
+
+    def __str__(self) -> str:
+        return f"{self.filter_name}{self.kernel_size}"
+
+class Outcome(NamedTuple):
+    """
+    What happened to one image: 'filtered', 'skipped' or 'failed'.
+    """
+    status: str
+    path: str
+    pixels: int = 0
+    error: str = ""
+
+def parse_step(text: str) -> FilterStep:
+    """
+    Parse a filter step written as NAME:KERNEL, e.g. Gaussian:5.
+
+    Args:
+    - text (str): The filter step.
+
+    Returns:
+    - FilterStep: The parsed step.
+    """
+    name, _, kernel = text.partition(':')
+    names = {filter_name.lower(): filter_name for filter_name in list(FILTERS) + ['Custom']}
+    if name.lower() not in names or not kernel.isdigit():
+        raise argparse.ArgumentTypeError(f"Invalid filter step '{text}'. Use NAME:KERNEL with NAME one of: {', '.join(names.values())}.")
+    step = FilterStep(names[name.lower()], int(kernel))
+    try:
+        if step.filter_name != 'Custom':
+            validate(step.filter_name, step.kernel_size)
+        elif step.kernel_size <= 0:
+            raise ValueError("Invalid kernel size. Please use a positive integer.")
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+    return step
+
+def apply_chain(image: np.ndarray, chain: List[FilterStep]) -> np.ndarray:
+    """
+    Apply a chain of filters to an image, in order.
+
+    Args:
+    - image (np.ndarray): The image.
+    - chain (List[FilterStep]): The filters.
+
+    Returns:
+    - np.ndarray: The filtered image.
+    """
+    for step in chain:
+        if step.filter_name == 'Custom':
+            image = snap_filter(image, step.kernel_size)
+        else:
+            image = FILTERS[step.filter_name](image, step.kernel_size)
+    return image
+
+def find_images(input_dir: str, skip_dir: Optional[str] = None) -> Iterator[str]:
+    """
+    Find the images under a directory, in a stable order.
+
+    Args:
+    - input_dir (str): The directory searched.
+    - skip_dir (Optional[str]): A directory left out, such as an output directory inside the input one.
+
+    Yields:
+    - str: Path of every image.
+    """
+    skip_dir = os.path.abspath(skip_dir) if skip_dir else None
+    for directory, subdirectories, files in os.walk(input_dir):
+        subdirectories[:] = sorted(name for name in subdirectories if os.path.abspath(os.path.join(directory, name)) != skip_dir)
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(directory, name)
+
+def output_paths(image_path: str, input_dir: str, output_dir: str, chain: List[FilterStep], gray: bool) -> Dict[str, str]:
+    """
+    Name the outputs of an image, mirroring its path under the input directory.
+
+    The image's extension is kept in the names, so a.jpg and a.png in one directory get different outputs.
+
+    Args:
+    - image_path (str): Path of the image.
+    - input_dir (str): The input directory.
+    - output_dir (str): The output directory.
+    - chain (List[FilterStep]): The filters, which are part of the names.
+    - gray (bool): If True, also name the grayscale output.
+
+    Returns:
+    - Dict[str, str]: Path of the 'color' output, and of the 'gray' one if asked for.
+    """
+    relative, extension = os.path.splitext(os.path.relpath(image_path, input_dir))
+    relative = f"{relative}_{extension[1:]}"
+    suffix = '-'.join(str(step) for step in chain)
+    kinds = ['color', 'gray'] if gray else ['color']
+    return {kind: os.path.join(output_dir, f"{relative}_{kind}_{suffix}{OUTPUT_EXTENSION}") for kind in kinds}
+
+def is_up_to_date(image_path: str, outputs: Dict[str, str]) -> bool:
+    """
+    Check whether every output of an image is newer than the image.
+
+    Args:
+    - image_path (str): Path of the image.
+    - outputs (Dict[str, str]): Paths of its outputs.
+
+    Returns:
+    - bool: True if none of the outputs needs to be written again.
+    """
+    modified = os.path.getmtime(image_path)
+    return all(os.path.exists(path) and os.path.getmtime(path) >= modified for path in outputs.values())
+
+def write_image(path: str, image: np.ndarray) -> None:
+    """
+    Encode an image and write it through a temporary file.
+
+    Args:
+    - path (str): Path of the output.
+    - image (np.ndarray): The image.
+    """
+    encoded, data = cv2.imencode(os.path.splitext(path)[1], image)
+    if not encoded:
+        raise ValueError(f"Unable to encode '{path}'!")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(data.tobytes())
+    os.replace(temporary, path)
+
+def _init_worker() -> None:
+    """
+    Keep OpenCV to one thread in every worker, as the workers already use all the cores.
+    """
+    cv2.setNumThreads(1)
+
+def filter_file(image_path: str, outputs: Dict[str, str], chain: List[FilterStep]) -> Outcome:
+    """
+    Decode, filter and encode one image in a worker process.
+
+    Args:
+    - image_path (str): Path of the image.
+    - outputs (Dict[str, str]): Paths of its outputs.
+    - chain (List[FilterStep]): The filters.
+
+    Returns:
+    - Outcome: What happened to the image.
+    """
+    try:
+        image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError("Invalid image file.")
+        filtered = apply_chain(image, chain)
+        write_image(outputs['color'], filtered)
+        if 'gray' in outputs:
+            write_image(outputs['gray'], cv2.cvtColor(filtered, cv2.COLOR_BGR2GRAY))
+        return Outcome('filtered', image_path, image.shape[0] * image.shape[1])
+    except Exception as error:
+        return Outcome('failed', image_path, error=str(error))
+
+def filter_directory(input_dir: str, output_dir: str, chain: List[FilterStep], gray: bool = False, workers: Optional[int] = None, force: bool = False) -> Iterator[Outcome]:
+    """
+    Filter every image under a directory across a pool of worker processes.
+
+    Args:
+    - input_dir (str): The directory of the images.
+    - output_dir (str): The directory of the outputs.
+    - chain (List[FilterStep]): The filters, applied in order.
+    - gray (bool): If True, also write the grayscale version of every filtered image.
+    - workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+    - force (bool): If True, filter images whose outputs are up to date as well.
+
+    Yields:
+    - Outcome: What happened to every image, in the order they finish.
+    """
+    if not chain:
+        raise ValueError("The filter chain is empty!")
+    workers = workers or os.cpu_count()
+    images = find_images(input_dir, skip_dir=output_dir)
+    pending: Set[Future] = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for image_path in images:
+            outputs = output_paths(image_path, input_dir, output_dir, chain, gray)
+            if not force and is_up_to_date(image_path, outputs):
+                yield Outcome('skipped', image_path)
+                continue
+            pending.add(executor.submit(filter_file, image_path, outputs, chain))
+            # Wait for a result before submitting more, so the directory is never read ahead of the workers
+            if len(pending) >= workers * TASKS_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+def main():
+    """
+    Main function to filter a directory of images from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Apply a chain of filters to every image under a directory, without a display.")
+    parser.add_argument("input", help="directory of the images, searched recursively")
+    parser.add_argument("output", help="directory where the filtered images are written")
+    parser.add_argument("--filter", dest="chain", type=parse_step, action="append", required=True, metavar="NAME:KERNEL",
+                        help="filter to apply, e.g. Gaussian:5; repeat to chain filters in order")
+    parser.add_argument("--gray", action="store_true", help="also write the grayscale version of every filtered image")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="filter images whose outputs are up to date as well")
+    args = parser.parse_args()
+
+    counts = {'filtered': 0, 'skipped': 0, 'failed': 0}
+    pixels = 0
+    start = time.perf_counter()
+    for outcome in filter_directory(args.input, args.output, args.chain, args.gray, args.workers, args.force):
+        counts[outcome.status] += 1
+        pixels += outcome.pixels
+        if outcome.status == 'failed':
+            print(f"Failed to filter '{outcome.path}': {outcome.error}")
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(f"Filtered {counts['filtered']} images, skipped {counts['skipped']} up to date, {counts['failed']} failed in {elapsed:.1f}s.")
+    print(f"Throughput: {counts['filtered'] / elapsed:.2f} images/sec, {pixels / 1e6 / elapsed:.2f} MP/sec.")
+
+if __name__ == "__main__":
+    main()
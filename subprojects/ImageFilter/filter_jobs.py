@@ -0,0 +1,172 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Background Filter Jobs for the Image Filtering Program.
+
+Input:
+- Filter jobs submitted by the GUI, each a function that accepts `progress` and `cancel` keyword arguments.
+
+Output:
+- Progress, result, error and cancellation events, collected by the GUI from its main loop.
+
+Features:
+- Runs jobs in a worker pool, so the Tk main loop never blocks on a filter.
+- Passes events back through a thread-safe queue that the GUI drains with `after()`,
+  as Tk widgets may only be touched from the main thread.
+- Groups jobs into channels; a new job on a channel cancels the one it supersedes
+  instead of waiting behind it, and events of superseded jobs are dropped.
+- Cancels jobs cooperatively, between the tiles or bands of the filtering engines.
+
+"""
+
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from tiled_filter import FilterCancelled
+
+# Number of jobs that can run at once; a superseded job finishing its current tile must not hold up its successor
+JOB_WORKERS = 2
+
+class Job:
+    """
+    A job submitted to the runner.
+    """
+
+    def __init__(self, job_id: int, channel: str):
+        self.job_id = job_id
+        self.channel = channel
+        self.cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Ask the job to stop at its next tile or band.
+        """
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+class JobEvent(NamedTuple):
+    """
+    Something that happened to a job: 'progress', 'done', 'error' or 'cancelled'.
+    """
+    kind: str
+    job: Job
+    payload: Any = None
+
+class JobRunner:
+    """
+    Runs filter jobs in a worker pool and queues their events for the GUI.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        """
+        Initialize the runner.
+
+        Args:
+        - workers (int): Number of jobs that can run at once.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.events: "queue.Queue[JobEvent]" = queue.Queue()
+        # Current job of every channel; only touched from the GUI thread
+        self.active: Dict[str, Job] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, channel: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Job:
+        """
+        Start a job, cancelling the current job of its channel.
+
+        Args:
+        - channel (str): Channel of the job.
+        - function (Callable[..., Any]): Function run by the job; it is also given `progress` and `cancel` keyword arguments.
+        - args (Any): Positional arguments of the function.
+        - kwargs (Any): Keyword arguments of the function.
+
+        Returns:
+        - Job: The new job.
+        """
+        self.cancel(channel)
+        job = Job(next(self._ids), channel)
+        self.active[channel] = job
+        self.executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def _run(self, job: Job, function: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        """
+        Run a job in a worker thread, queueing its events.
+        """
+        if job.cancelled:
+            self.events.put(JobEvent('cancelled', job))
+            return
+        try:
+            progress = lambda done, total: self.events.put(JobEvent('progress', job, (done, total)))
+            result = function(*args, progress=progress, cancel=job.cancel_event, **kwargs)
+        except FilterCancelled:
+            self.events.put(JobEvent('cancelled', job))
+        except Exception as error:
+            self.events.put(JobEvent('error', job, error))
+        else:
+            # A job cancelled during its last tile still finishes; its result is stale
+            self.events.put(JobEvent('cancelled' if job.cancelled else 'done', job, result))
+
+    def cancel(self, channel: str) -> Optional[Job]:
+        """
+        Cancel the current job of a channel, if any.
+
+        Args:
+        - channel (str): Channel of the job.
+
+        Returns:
+        - Optional[Job]: The cancelled job.
+        """
+        job = self.active.pop(channel, None)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def busy(self, channel: str) -> bool:
+        """
+        Check whether a channel has a job that has not finished.
+
+        Args:
+        - channel (str): Channel of the job.
+
+        Returns:
+        - bool: True if a job is running or waiting on the channel.
+        """
+        return channel in self.active
+
+    def poll(self) -> List[JobEvent]:
+        """
+        Collect the events queued since the last poll, from the GUI thread.
+
+        Events of jobs that were cancelled or superseded are dropped.
+
+        Returns:
+        - List[JobEvent]: The events of the current jobs, in order.
+        """
+        events = []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return events
+            if self.active.get(event.job.channel) is not event.job:
+                continue
+            if event.kind != 'progress':
+                del self.active[event.job.channel]
+            events.append(event)
+
+    def shutdown(self) -> None:
+        """
+        Cancel every job and stop the workers without waiting for them.
+        """
+        for channel in list(self.active):
+            self.cancel(channel)
+        self.executor.shutdown(wait=False, cancel_futures=True)
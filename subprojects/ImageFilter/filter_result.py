@@ -0,0 +1,100 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Filter Results for the Image Filtering Program.
+
+Input:
+- The filtered color image, and the image and kernel size it was filtered from.
+
+Output:
+- The filtered color image, and its grayscale version when asked for.
+
+Features:
+- Computes the color image eagerly and the grayscale one only when saving needs it,
+  so applying a filter runs it once instead of once per version.
+- Derives the grayscale version of linear filters (Mean, Gaussian) from the filtered color image,
+  as converting to gray and filtering commute up to rounding.
+- Filters the grayscale source for non-linear filters (Median), where the order matters.
+- Computes the statistics of the filtered color image once, when first asked for.
+- Unpacks as (color, gray, filter_type), like the tuples the filters returned before.
+
+"""
+
+import threading
+from typing import Iterator, Optional
+import cv2
+import numpy as np
+from tiled_filter import FILTERS
+from image_stats import ImageStatistics, compute_statistics
+
+# Filters whose grayscale version can be derived from the filtered color image
+LINEAR_FILTERS = ('Mean', 'Gaussian')
+
+class FilterResult:
+    """
+    A filtered image, with its grayscale version computed on demand.
+    """
+
+    def __init__(self, color: np.ndarray, filter_type: str, kernel_size: Optional[int] = None, source: Optional[np.ndarray] = None):
+        """
+        Initialize the result.
+
+        Args:
+        - color (np.ndarray): The filtered color image.
+        - filter_type (str): Name of the filter.
+        - kernel_size (Optional[int]): Side of the filter's kernel.
+        - source (Optional[np.ndarray]): The image that was filtered, needed for non-linear filters.
+        """
+        filters_gray = filter_type in FILTERS and filter_type not in LINEAR_FILTERS
+        if filters_gray and (source is None or kernel_size is None):
+            raise ValueError(f"The {filter_type} filter needs its source image and kernel size to compute the grayscale version!")
+        self.color = color
+        self.filter_type = filter_type
+        self.kernel_size = kernel_size
+        # The source is only kept by filters that compute the grayscale version from it
+        self.source = source if filters_gray else None
+        self._gray: Optional[np.ndarray] = None
+        self._statistics: Optional[ImageStatistics] = None
+        # Saving and the histograms read the gray image and the statistics from different threads; separate
+        # locks keep a slow grayscale filter in a save job from blocking the histograms in the GUI thread
+        self._gray_lock = threading.Lock()
+        self._statistics_lock = threading.Lock()
+
+    @property
+    def gray(self) -> np.ndarray:
+        """
+        The grayscale version of the filtered image, computed the first time it is read.
+        """
+        with self._gray_lock:
+            if self._gray is None:
+                if self.source is not None:
+                    self._gray = FILTERS[self.filter_type](cv2.cvtColor(self.source, cv2.COLOR_BGR2GRAY), self.kernel_size)
+                    self.source = None
+                else:
+                    self._gray = cv2.cvtColor(self.color, cv2.COLOR_BGR2GRAY)
+            return self._gray
+
+    @property
+    def statistics(self) -> ImageStatistics:
+        """
+        Histograms, means and percentiles of the filtered color image, computed the first time they are read.
+        """
+        with self._statistics_lock:
+            if self._statistics is None:
+                self._statistics = compute_statistics(self.color)
+            return self._statistics
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the result, counting the grayscale version whether or not it was computed yet,
+        and the source image it keeps until then.
+        """
+        source = self.source
+        return self.color.nbytes + self.color.nbytes // self.color.shape[2] + (source.nbytes if source is not None else 0)
+
+    def __iter__(self) -> Iterator:
+        return iter((self.color, self.gray, self.filter_type))
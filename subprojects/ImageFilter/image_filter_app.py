@@ -15,27 +15,65 @@ Output:
 
 Features:
 - Load Image: Allows the user to load an image file (jpg, jpeg, png).
-- Resize Image: Resizes the loaded image by a factor of 0.5.
+- Resize Image: Resizes the loaded image by a factor of 0.5, using the first level of its preview pyramid.
 - Choose Filter: Entry for the user to choose a filter type (1: Mean, 2: Gaussian, 3: Median, 4: Custom).
-- Apply Filter: Applies the selected filter to the image.
-- Apply in Parallel: Checkbox to choose whether to apply the filter in parallel using multi-threading.
-- Compare Filters: Compares the original image with multiple filtered versions.
-- Show Histogram: Displays histograms for the original and filtered images.
+- Apply Filter: Applies the selected filter to a half-resolution preview of the image.
+- Apply in Parallel: Checkbox to choose whether to apply the filter in parallel, splitting the image into overlapping tiles filtered across all cores.
+- Compare Filters: Compares the original image with the latest filtered versions, kept at preview resolution.
+- Show Histogram: Displays per-channel histograms, means and percentiles of the original and filtered images,
+  computed once per image and updated in place in a single window.
 - Adjust Filter Parameter: Adjusts the parameter (kernel size) of the selected filter.
-- Apply Adjustment: Applies the filter with the adjusted parameter.
-- Save Filtered Images: Saves the filtered color and grayscale images in a 'filtered' folder.
-- Progress Bar: Shows a progress bar during filter application.
+- Apply Adjustment: Applies the filter with the adjusted parameter on a half-resolution preview.
+- Save Filtered Images: Saves the filtered color and grayscale images in a 'filtered' folder, at full resolution
+  (or half resolution after Resize Image), in a background job that previews and Cancel do not interrupt.
+- Lazy Grayscale: Filters compute the color image only; the grayscale version is computed when
+  saving needs it, from the filtered color image for linear filters.
+- Preview Cache: A pyramid of downscaled copies is built once per loaded image, and filter results are cached
+  by image, filter, kernel size and level within a memory budget, so scrubbing the slider reuses earlier results.
+- Progress Bar: Shows the real progress of the filter, tile by tile.
+- Background Jobs: Filters run in worker threads so the window stays responsive; a new
+  filter or slider value cancels the stale one, and the Cancel button stops it.
 - Message Label: Displays informative messages and errors.
 
 """
 
 import cv2, os
-import numpy as np
-import concurrent.futures
+from collections import deque
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 import tkinter as tk
 from tkinter import Scale, Button, Label, filedialog, messagebox, ttk
+from tiled_filter import FilterCancelled, filter_tiled
+from custom_filter import snap_filter
+from filter_jobs import JobRunner
+from preview_cache import ResultCache, build_pyramid, image_hash
+from filter_result import FilterResult
+from image_stats import LEVELS, compute_statistics
+
+# Milliseconds between polls of the background jobs' events
+POLL_INTERVAL = 50
+
+# Milliseconds the kernel size slider must rest before the filter is adjusted
+SCALE_DELAY = 200
+
+# Channel of the filter jobs; a new filter job supersedes the running one
+FILTER_CHANNEL = 'filter'
+
+# Channel of the save jobs, which run alongside the filter jobs and are not cancelled by them
+SAVE_CHANNEL = 'save'
+
+# Pyramid level of the adjusted previews, half the full resolution
+PREVIEW_LEVEL = 1
+
+# Pyramid level filtered while scrubbing the slider, the coarsest one
+SCRUB_LEVEL = 2
+
+# Number of filtered images kept for comparison
+COMPARE_LIMIT = 6
+
+# Colors of the histogram lines of every channel
+CHANNEL_COLORS = {'Blue': 'blue', 'Green': 'green', 'Red': 'red', 'Gray': 'black'}
 
 class ImageFilterApp:
     def __init__(self, master):
@@ -46,12 +84,33 @@ class ImageFilterApp:
         self.image_path = None
         self.filter_choice = None
         self.resized_image = None
+        self.filtered = None
+
+        # Preview pyramid of the loaded image, the level saved (0, or 1 once resized), and the cached results
+        self.pyramid = None
+        self.image_key = None
+        self.image_level = 0
+        self.results = ResultCache()
 
-        self.filter_comparison_images = []
+        self.filter_comparison_images = deque(maxlen=COMPARE_LIMIT)
+
+        # Statistics of the loaded image, and the histogram window, reused until it is closed
+        self.image_statistics = None
+        self.histogram_window = None
+        self.histogram_canvas = None
+        self.histogram_axes = None
+        self.histogram_lines = {}
 
         self.apply_parallel_var = tk.BooleanVar(value=False)
 
+        # Background jobs, and the function handling the result of the current job of every channel
+        self.jobs = JobRunner()
+        self.job_done = {}
+        self.scale_after_id = None
+
         self.create_widgets()
+        master.protocol("WM_DELETE_WINDOW", self.close)
+        self.master.after(POLL_INTERVAL, self.poll_jobs)
     
     def create_widgets(self):
         # Load Image Button
@@ -84,9 +143,13 @@ class ImageFilterApp:
         self.hist_button = Button(self.master, text="Show Histogram", command=self.show_histograms)
         self.hist_button.grid(row=4, column=0, pady=10, padx=10, sticky="ew")
 
+        # Cancel Filter Button
+        cancel_button = Button(self.master, text="Cancel Filter", command=self.cancel_filter)
+        cancel_button.grid(row=4, column=1, pady=10, padx=10, sticky="ew")
+
         #Adjust Filter Parameter Scale
         Label(self.master, text="Adjust Filter Parameter:").grid(row=5, column=0, pady=5, padx=10, sticky="w")
-        self.param_scale = Scale(self.master, from_=1, to=15, orient=tk.HORIZONTAL, label="Kernel Size")
+        self.param_scale = Scale(self.master, from_=1, to=15, orient=tk.HORIZONTAL, label="Kernel Size", command=self.on_scale_change)
         self.param_scale.grid(row=5, column=1, pady=5, padx=10, sticky="ew")
 
         # Apply Adjusted Button
@@ -98,7 +161,7 @@ class ImageFilterApp:
         save_images_button.grid(row=6, column=1, pady=10, padx=10, sticky="ew")
 
         # Progress Bar
-        self.progress_bar = ttk.Progressbar(self.master, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(self.master, mode='determinate', maximum=100)
         self.progress_bar.grid(row=7, column=0, columnspan=2, pady=10, padx=10, sticky="ew")
 
         # Message Label
@@ -115,6 +178,13 @@ class ImageFilterApp:
                 self.image_path = file_path
                 self.image = cv2.imread(self.image_path)
                 if self.image is not None:
+                    # Downscale once per image; every preview and cached result refers to this pyramid
+                    self.image_key = image_hash(self.image)
+                    self.pyramid = build_pyramid(self.image)
+                    self.image_level = 0
+                    self.image_statistics = None
+                    self.resized_image = None
+                    self.filter_comparison_images.clear()
                     self.display_image("Original Image", self.image)
                     self.update_message("Image loaded successfully.")
                 else:
@@ -128,8 +198,9 @@ class ImageFilterApp:
         
         try:
             if self.image is not None:
-                resize_factor = 0.5
-                self.resized_image = cv2.resize(self.image, None, fx=resize_factor, fy=resize_factor)
+                # The first pyramid level is the image resized by a factor of 0.5
+                self.image_level = self.pyramid_level(1)
+                self.resized_image = self.pyramid[self.image_level]
                 self.display_image("Resized Image", self.resized_image)
                 self.update_message("Image resized successfully.")
             else:
@@ -145,84 +216,104 @@ class ImageFilterApp:
 
         if self.image is not None:
             try:
-                self.star_progress_bar()
-                if self.resized_image is not None:
-                    self.apply_selected_filter(self.resized_image, parallel=self.apply_parallel_var.get())
-                else:
-                    self.apply_selected_filter(self.image, parallel=self.apply_parallel_var.get())
-                self.update_message("Filter applied successfully.")
+                # Filter a preview; the resolution being saved is only filtered by Save Filtered Images
+                self.apply_selected_filter(max(self.image_level, PREVIEW_LEVEL), parallel=self.apply_parallel_var.get())
             except ValueError as ve:
                 self.show_error("Error", str(ve))
             except Exception as e:
                 self.show_error("Error", str(e))
-            finally:
-                self.stop_progress_bar()
         else:
             self.show_error("Error", "Load an image first.")
     
-    def apply_selected_filter(self, selected_image, parallel=False):
+    def apply_selected_filter(self, level, parallel=False):
         if self.filter_choice == '1':
-            filter_class = MeanFilter
+            filter_type = 'Mean'
         elif self.filter_choice == '2':
-            filter_class = GaussianFilter
+            filter_type = 'Gaussian'
         elif self.filter_choice == '3':
-            filter_class = MedianFilter
+            filter_type = 'Median'
         elif self.filter_choice == '4':
-            filter_class = CustomFilter
+            filter_type = 'Custom'
         else:
             raise ValueError("Invalid filter choice. Using Mean FIlter.")
 
-        if selected_image is not None:
-            try:
-                self.star_progress_bar()
-                if parallel:
-                    colr_filtered, _, _ = filter_class.apply_parallel(selected_image, 9)
-                else:
-                    colr_filtered, _, _ = filter_class.apply(selected_image, 9)
-
-                self.filter_comparison_images.append(colr_filtered)
-                self.color_filtered, self.gray_filtered, self.filter_type = colr_filtered, _, 'Custom'
-                self.display_image(f"Filtered Image ({self.filter_type})", self.color_filtered)
-            except Exception as e:
-                self.show_error("Error", str(e))
+        if self.pyramid is not None:
+            self.filter_image(self.filter_applied, level, filter_type, 9, parallel)
         else:
             self.show_error("Error", "Load an image first.")
 
+    def filter_applied(self, result):
+        self.filtered = result
+        self.filter_comparison_images.append(self.preview_image(result.color))
+        self.display_image(f"Filtered Image ({result.filter_type})", result.color)
+        self.update_histograms()
+        self.update_message("Filter applied successfully.")
+
     def show_histograms(self):
         try:
-            if self.image is not None and hasattr(self, 'color_filtered') and hasattr(self, 'gray_filtered'):
-                histograms_window = tk.Toplevel(self.master)
-                histograms_window.title("Histograms")
-
-                original_hist = cv2.calcHist([cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)], [0], None, [256], [0, 256])
-                filtered_hist = cv2.calcHist([cv2.cvtColor(self.color_filtered, cv2.COLOR_BGR2GRAY)], [0], None, [256], [0, 256])
-                plt.figure(figsize=(10, 5))
-
-                # Original Image Histogram
-                plt.subplot(1, 2, 1)
-                plt.title("Original Image Histogram")
-                plt.xlabel("Pixel Intensity")
-                plt.ylabel("Frequency")
-                plt.plot(original_hist, color='black')
-
-                # Filtered Image Histogram
-                plt.subplot(1, 2, 2)
-                plt.title("Filtered Image Histogram")
-                plt.xlabel("Pixel Intensity")
-                plt.ylabel("Frequency")
-                plt.plot(filtered_hist, color='red')
-
-                plt.tight_layout()
-                # Embed the Matplotlib figure in Tkinter window
-                canvas = FigureCanvasTkAgg(plt.gcf(), master=histograms_window)
-                canvas.draw()
-                canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
-
+            if self.image is not None and self.filtered is not None:
+                if self.histogram_window is None:
+                    self.create_histogram_window()
+                self.update_histograms()
+                self.histogram_window.lift()
             else:
                 self.show_error("Error", "Load and apply a filter to the image first.")
         except Exception as e:
             self.show_error("Error", str(e))
 
+    def create_histogram_window(self):
+        self.histogram_window = tk.Toplevel(self.master)
+        self.histogram_window.title("Histograms")
+        self.histogram_window.protocol("WM_DELETE_WINDOW", self.close_histograms)
+
+        # A standalone figure, so closing the pyplot figures leaves it alone
+        figure = Figure(figsize=(10, 5))
+        self.histogram_axes = figure.subplots(1, 2)
+        self.histogram_lines = {}
+
+        # Embed the Matplotlib figure in Tkinter window
+        self.histogram_canvas = FigureCanvasTkAgg(figure, master=self.histogram_window)
+        self.histogram_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+    def update_histograms(self):
+        # Only refresh a window that is open
+        if self.histogram_window is None or self.image is None or self.filtered is None:
+            return
+        if self.image_statistics is None:
+            self.image_statistics = compute_statistics(self.image)
+
+        self.plot_statistics(self.histogram_axes[0], "Original Image Histogram", self.image_statistics)
+        self.plot_statistics(self.histogram_axes[1], f"Filtered Image Histogram ({self.filtered.filter_type})", self.filtered.statistics)
+        self.histogram_canvas.figure.tight_layout()
+        self.histogram_canvas.draw_idle()
+
+    def plot_statistics(self, axis, title, statistics):
+        # Create the lines once, then only replace their data
+        lines = self.histogram_lines.get(axis)
+        if lines is None or len(lines) != len(statistics.channel_names):
+            axis.clear()
+            axis.set_xlabel("Pixel Intensity")
+            axis.set_ylabel("Frequency")
+            lines = [axis.plot(range(LEVELS), histogram, color=CHANNEL_COLORS.get(name))[0] for name, histogram in zip(statistics.channel_names, statistics.histograms)]
+            self.histogram_lines[axis] = lines
+
+        for index, (line, name) in enumerate(zip(lines, statistics.channel_names)):
+            line.set_ydata(statistics.histograms[index])
+            line.set_label(f"{name}: mean {statistics.means[index]:.1f}, median {statistics.percentiles[50][index]}, "
+                           f"5-95% {statistics.percentiles[5][index]}-{statistics.percentiles[95][index]}")
+
+        axis.set_title(title)
+        axis.legend(loc='upper right', fontsize='small')
+        axis.relim()
+        axis.autoscale_view()
+
+    def close_histograms(self):
+        self.histogram_window.destroy()
+        self.histogram_window = None
+        self.histogram_canvas = None
+        self.histogram_axes = None
+        self.histogram_lines = {}
+
     def display_image(self, title, img):
         try:
             plt.figure(figsize=(5, 5))
@@ -236,40 +327,109 @@ class ImageFilterApp:
         except Exception as e:
             self.show_error("Error", str(e))
 
-    def adjust_parameter(self):
+    def adjust_parameter(self, level=PREVIEW_LEVEL):
         # Clear previous images
         self.clear_images()
 
-        if self.image is not None and hasattr(self, 'color_filtered') and hasattr(self, 'gray_filtered'):
+        if self.image is not None and self.filtered is not None:
             kernel_size = self.param_scale.get()
-            try:
-                self.star_progress_bar()
-
-                # Resize the image for quicker adjustments
-                resized_image = cv2.resize(self.image, None, fx=0.5, fy=0.5)
-
-                if self.filter_type == 'Mean':
-                    self.color_filtered, self.gray_filtered, _ = MeanFilter.apply(resized_image, kernel_size)
-                elif self.filter_type == 'Gaussian':
-                    self.color_filtered, self.gray_filtered, _ = GaussianFilter.apply(resized_image, kernel_size)
-                elif self.filter_type == 'Median':
-                    self.color_filtered, self.gray_filtered, _ = MedianFilter.apply(resized_image, kernel_size)
-                elif self.filter_type == 'Custom':
-                    self.color_filtered, self.gray_filtered, _ = CustomFilter.apply(resized_image, kernel_size)
-                
-                self.display_image(f"Filtered Image ({self.filter_type})", self.color_filtered)
-                self.update_message("Parameter adjusted successfully.")
-            except Exception as e:
-                self.show_error("Error", str(e))
-            finally:
-                self.stop_progress_bar()
+
+            # Filter a downscaled level of the pyramid for quicker adjustments
+            self.filter_image(self.parameter_adjusted, level, self.filtered.filter_type, kernel_size, self.apply_parallel_var.get())
         else:
             self.show_error("Error", "Load and apply a filter to the image first.")
 
+    def parameter_adjusted(self, result):
+        self.filtered = result
+        self.display_image(f"Filtered Image ({result.filter_type})", result.color)
+        self.update_histograms()
+        self.update_message("Parameter adjusted successfully.")
+
+    def on_scale_change(self, value):
+        # Wait for the slider to rest, so dragging it does not start a job per value
+        if self.scale_after_id is not None:
+            self.master.after_cancel(self.scale_after_id)
+        self.scale_after_id = self.master.after(SCALE_DELAY, self.scale_settled)
+
+    def scale_settled(self):
+        self.scale_after_id = None
+        if self.image is None or self.filtered is None:
+            return
+        # Skip the even sizes that Gaussian and Median filters reject while scrubbing
+        kernel_size = self.param_scale.get()
+        if self.filtered.filter_type in ('Gaussian', 'Median') and kernel_size % 2 == 0:
+            return
+        # Show the preview if it was computed before, else filter the coarsest level
+        if self.result_key(PREVIEW_LEVEL, self.filtered.filter_type, kernel_size) in self.results:
+            self.adjust_parameter(PREVIEW_LEVEL)
+        else:
+            self.adjust_parameter(SCRUB_LEVEL)
+
+    def pyramid_level(self, level):
+        # Small images have fewer levels; use the coarsest one they have
+        return min(level, len(self.pyramid) - 1)
+
+    def result_key(self, level, filter_type, kernel_size):
+        return self.image_key, filter_type, kernel_size, self.pyramid_level(level)
+
+    def filter_image(self, on_done, level, filter_type, kernel_size, parallel=False):
+        key = self.result_key(level, filter_type, kernel_size)
+
+        def filtered(result):
+            self.results.put(key, result)
+            on_done(result)
+
+        result = self.results.get(key)
+        if result is not None:
+            # The cached result supersedes whatever filter is still running
+            self.jobs.cancel(FILTER_CHANNEL)
+            self.stop_progress_bar()
+            on_done(result)
+        else:
+            self.start_job(filtered, run_filter, self.pyramid[key[-1]], filter_type, kernel_size, parallel)
+
+    def preview_image(self, img):
+        # Keep comparisons at preview resolution, whatever level they were filtered at
+        preview = self.pyramid[self.pyramid_level(PREVIEW_LEVEL)]
+        if img.shape[:2] == preview.shape[:2]:
+            return img
+        return cv2.resize(img, (preview.shape[1], preview.shape[0]), interpolation=cv2.INTER_AREA)
+
+    def start_job(self, on_done, function, *args, channel=FILTER_CHANNEL):
+        # Submitting cancels the job still running on the channel, whose result would be stale
+        self.jobs.submit(channel, function, *args)
+        self.job_done[channel] = on_done
+        self.star_progress_bar()
+
+    def poll_jobs(self):
+        for event in self.jobs.poll():
+            if event.kind == 'progress':
+                done, total = event.payload
+                self.progress_bar['value'] = 100 * done / total
+            elif event.kind == 'done':
+                self.stop_progress_bar()
+                self.job_done.pop(event.job.channel)(event.payload)
+            elif event.kind == 'error':
+                self.stop_progress_bar()
+                self.job_done.pop(event.job.channel, None)
+                self.show_error("Error", str(event.payload))
+            elif event.kind == 'cancelled':
+                self.job_done.pop(event.job.channel, None)
+        self.master.after(POLL_INTERVAL, self.poll_jobs)
+
+    def cancel_filter(self):
+        if self.jobs.cancel(FILTER_CHANNEL) is not None:
+            self.stop_progress_bar()
+            self.update_message("Filter cancelled.")
+
+    def close(self):
+        self.jobs.shutdown()
+        self.master.destroy()
+
     def compare_filters(self):
         try:
             if self.image is not None and self.filter_comparison_images:
-                images_to_display = [self.image] + self.filter_comparison_images
+                images_to_display = [self.preview_image(self.image)] + list(self.filter_comparison_images)
                 titles = ["Original Image"] + [f"Filtered Image ({i+1})" for i in range(len(self.filter_comparison_images))]
 
                 self.display_images_side_by_side(images_to_display, titles)
@@ -302,10 +462,22 @@ class ImageFilterApp:
             self.show_error("Error", str(e))
 
     def save_images(self):
-        if self.image is not None and hasattr(self, 'color_filtered') and hasattr(self, 'gray_filtered'):
+        if self.image is not None and self.filtered is not None:
+            if self.jobs.busy(SAVE_CHANNEL):
+                self.show_error("Error", "The filtered images are still being saved.")
+                return
+            # Previews are downscaled; filter the image at the saved resolution, unless it was done before
+            key = self.result_key(self.image_level, self.filtered.filter_type, self.filtered.kernel_size)
             image_name = os.path.splitext(os.path.basename(str(self.image_path)))[0]
-            save_filtered_images(self.color_filtered, self.gray_filtered, image_name, self.filter_type)
-            self.show_info("Success", "Filtered images saved successfully.")
+
+            def saved(result):
+                self.results.put(key, result)
+                self.show_info("Success", "Filtered images saved successfully.")
+
+            # Saving has its own channel, so adjusting a preview or cancelling a filter does not drop it
+            self.start_job(saved, save_result, self.pyramid[key[-1]], self.results.get(key), self.filtered.filter_type,
+                           self.filtered.kernel_size, image_name, self.apply_parallel_var.get(), channel=SAVE_CHANNEL)
+            self.update_message("Saving filtered images...")
         else:
             self.show_error("Error", "Load and apply a filter to the image first.")
 
@@ -316,19 +488,10 @@ class ImageFilterApp:
         messagebox.showinfo(title, message)
 
     def star_progress_bar(self):
-        self.progress_bar.start(10)
-        self.progress_bar_after_id = self.master.after(100, self.update_progress_bar)
-
-    def update_progress_bar(self):
-        self.progress_bar.step(1)
-        if self.progress_bar['value'] < 100:
-            self.progress_bar_after_id = self.master.after(100, self.update_progress_bar)
+        self.progress_bar['value'] = 0
 
     def stop_progress_bar(self):
-        self.progress_bar.stop()
         self.progress_bar['value'] = 0
-        if self.progress_bar_after_id is not None:
-            self.master.after_cancel(self.progress_bar_after_id)
 
     def clear_images(self):
         plt.close('all')
@@ -350,24 +513,17 @@ class ImageFilterApp:
 class MeanFilter:
     @staticmethod
     def apply(image, kernel_size):
-        # Apply filter to the grayscale version
-        gray_filtered = cv2.blur(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), (kernel_size, kernel_size))
-
-        # Apply filter to the color version
+        # Apply filter to the color version; the grayscale one is computed when needed
         color_filtered = cv2.blur(image, (kernel_size, kernel_size))
 
-        return color_filtered, gray_filtered, 'Mean'
+        return FilterResult(color_filtered, 'Mean', kernel_size, image)
     
     @staticmethod
     def apply_parallel(image, kernel_size):
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_gray = executor.submit(cv2.blur, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), (kernel_size, kernel_size))
-            future_color = executor.submit(cv2.blur, image, (kernel_size, kernel_size))
+        # Filter overlapping tiles across all cores
+        color_filtered = filter_tiled(image, 'Mean', kernel_size)
 
-            gray_filtered = future_gray.result()
-            color_filtered = future_color.result()
-        
-        return color_filtered, gray_filtered, 'Mean'
+        return FilterResult(color_filtered, 'Mean', kernel_size, image)
 
 class GaussianFilter:
     @staticmethod
@@ -375,13 +531,10 @@ class GaussianFilter:
         if kernel_size <= 0 or kernel_size % 2 == 0:
             raise ValueError("Invalid kernel size. Please use an odd positive integer.")
             
-        # Apply filter to the grayscale version
-        gray_filtered = cv2.GaussianBlur(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), (kernel_size, kernel_size), 0)
-
-        # Apply filter to the color version
+        # Apply filter to the color version; the grayscale one is computed when needed
         color_filtered = cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
 
-        return color_filtered, gray_filtered, 'Gaussian'
+        return FilterResult(color_filtered, 'Gaussian', kernel_size, image)
 
     
     @staticmethod
@@ -389,14 +542,10 @@ class GaussianFilter:
         if kernel_size <= 0 or kernel_size % 2 == 0:
             raise ValueError("Invalid kernel size. Please use an odd positive integer.")
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_gray = executor.submit(cv2.GaussianBlur, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), (kernel_size, kernel_size), 0)
-            future_color = executor.submit(cv2.GaussianBlur, image, (kernel_size, kernel_size), 0)
+        # Filter overlapping tiles across all cores
+        color_filtered = filter_tiled(image, 'Gaussian', kernel_size)
 
-            gray_filtered = future_gray.result()
-            color_filtered = future_color.result()
-        
-        return color_filtered, gray_filtered, 'Gaussian'
+        return FilterResult(color_filtered, 'Gaussian', kernel_size, image)
         
 class MedianFilter:
     @staticmethod
@@ -404,13 +553,10 @@ class MedianFilter:
         if kernel_size <= 0 or kernel_size % 2 == 0:
             raise ValueError("Invalid kernel size. Please use an odd positive integer.")
 
-        # Apply filter to the grayscale version
-        gray_filtered = cv2.medianBlur(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), kernel_size)
-
-        # Apply filter to the color version
+        # Apply filter to the color version; the grayscale one is computed when needed
         color_filtered = cv2.medianBlur(image, kernel_size)
 
-        return color_filtered, gray_filtered, 'Median'
+        return FilterResult(color_filtered, 'Median', kernel_size, image)
         
     @staticmethod
     def apply_parallel(image, kernel_size):
@@ -418,95 +564,55 @@ class MedianFilter:
             if kernel_size <= 0 or kernel_size % 2 == 0:
                 raise ValueError("Invalid kernel size. Please use an odd positive integer.")
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future_gray = executor.submit(cv2.medianBlur, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), kernel_size)
-                future_color = executor.submit(cv2.medianBlur, image, kernel_size)
+            # Filter overlapping tiles across all cores
+            color_filtered = filter_tiled(image, 'Median', kernel_size)
 
-                gray_filtered = future_gray.result()
-                color_filtered = future_color.result()
-            
-            return color_filtered, gray_filtered, 'Median'
+            return FilterResult(color_filtered, 'Median', kernel_size, image)
         except Exception as e:
             raise ValueError(f"Median filter failed: {str(e)}")
             
 class CustomFilter:
     @staticmethod
     def apply(image, kernel_size):
-        temp = []
-        indexer = kernel_size // 2
-        new_image = image.copy()
-        nrow, ncol, _ = image.shape
-
-        for i in range(nrow):
-            for j in range(ncol):
-                for k in range(i - indexer, i + indexer + 1):
-                    for m in range(j - indexer, j + indexer + 1):
-                        if 0 <= k < nrow and 0 <= m < ncol:
-                            temp.append(image[k, m])
-                temp = [x for x in temp if not np.array_equal(x, image[i, j])]
-                if temp:
-                    max_value = max(temp, key=lambda x: np.linalg.norm(x - image[i, j]))
-                    min_value = min(temp, key=lambda x: np.linalg.norm(x - image[i, j]))
-                    if np.array_equal(image[i, j], max_value):
-                        new_image[i, j] = max_value
-                    elif np.array_equal(image[i, j], min_value):
-                        new_image[i, j] = min_value
-                temp = []
-
-        # Apply filter to the grayscale version
-        gray_filtered = cv2.cvtColor(new_image, cv2.COLOR_BGR2GRAY)
-
-        return new_image, gray_filtered, 'Custom'
+        # Snap pixels to their farthest/nearest neighbour, vectorized over bands of rows
+        new_image = snap_filter(image, kernel_size)
+
+        # The grayscale version is converted from the filtered image when needed
+        return FilterResult(new_image, 'Custom', kernel_size)
 
     @staticmethod
     def apply_parallel(image, kernel_size):
-        indexer = kernel_size // 2
-        new_image = image.copy()
-        nrow, ncol, _ = image.shape
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = []
-            for i in range(nrow):
-                for j in range(ncol):
-                    future = executor.submit(CustomFilter._process_pixel, image, new_image, i, j, indexer, nrow, ncol)
-                    futures.append(future)
-            
-            # Wait for all threads to complete
-            concurrent.futures.wait(futures)
+        # Filter the bands of rows across all cores
+        new_image = snap_filter(image, kernel_size, workers=None)
 
-        # Apply filter to the grayscale version
-        gray_filtered = cv2.cvtColor(new_image, cv2.COLOR_BGR2GRAY)
+        # The grayscale version is converted from the filtered image when needed
+        return FilterResult(new_image, 'Custom', kernel_size)
 
-        return new_image, gray_filtered, 'Custom'
-    
-    @staticmethod
-    def _process_pixel(image, new_image,i, j, indexer, nrow, ncol):
-        temp = CustomFilter._collect_neighboring_pixels(image, i, j, indexer, nrow, ncol)
 
-        if temp:
-            max_value, min_value = CustomFilter._find_max_and_min_values(temp, image[i, j])
+def run_filter(image, filter_type, kernel_size, parallel=False, progress=None, cancel=None):
+    # Tile by tile on one worker, or across all cores in parallel, so progress and cancellation work either way
+    workers = None if parallel else 1
 
-            if np.array_equal(image[i, j], max_value):
-                new_image[i, j] = max_value
-            elif np.array_equal(image[i, j], min_value):
-                new_image[i, j] = min_value
+    if filter_type == 'Custom':
+        color_filtered = snap_filter(image, kernel_size, workers=workers, progress=progress, cancel=cancel)
+        return FilterResult(color_filtered, 'Custom', kernel_size)
 
-    @staticmethod
-    def _collect_neighboring_pixels(image, i, j, indexer, nrow, ncol):
-        indices = np.indices((2*indexer+1, 2*indexer+1)) - indexer
-        indices += np.array([i, j])[:, None, None]
-
-        valid_indices = (indices[0] >= 0) & (indices[0] < nrow) & (indices[1] >= 0) & (indices[1] < ncol)
+    # Only the color image is filtered here; the grayscale version waits until saving needs it
+    color_filtered = filter_tiled(image, filter_type, kernel_size, workers=workers, progress=progress, cancel=cancel)
 
-        return image[indices[0, valid_indices], indices[1, valid_indices]]
+    return FilterResult(color_filtered, filter_type, kernel_size, image)
 
-    @staticmethod
-    def _find_max_and_min_values(pixel_list, current_pixel):
-        norms = np.linalg.norm(pixel_list - current_pixel, axis=1)
-        max_index = np.argmax(norms)
-        min_index = np.argmin(norms)
-        return pixel_list[max_index], pixel_list[min_index]
+def save_result(image, result, filter_type, kernel_size, image_name, parallel=False, progress=None, cancel=None):
+    # Run as a background job, as the image and its grayscale version may be filtered here
+    if result is None:
+        result = run_filter(image, filter_type, kernel_size, parallel, progress, cancel)
+    gray_filtered = result.gray
 
+    # Stop before writing anything if the job was cancelled, e.g. when the window is closed
+    if cancel is not None and cancel.is_set():
+        raise FilterCancelled()
+    save_filtered_images(result.color, gray_filtered, image_name, result.filter_type)
+    return result
 
 def save_filtered_images(filtered_color, filtered_gray, image_name, filter_type):
     try:
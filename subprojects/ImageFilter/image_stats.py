@@ -0,0 +1,88 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Image Statistics for the Image Filtering Program.
+
+Input:
+- An 8-bit color or grayscale image as a NumPy array.
+
+Output:
+- Per-channel histograms, means and percentiles.
+
+Features:
+- Counts every channel's histogram in a single vectorized pass, offsetting each channel's
+  values into its own range of bins so one `bincount` covers all of them, a chunk of pixels at a time
+  so the offset copy stays small for large images.
+- Derives the means and percentiles from the histograms instead of sorting the pixels.
+- Computes the statistics once per image version; filter results and the loaded image keep theirs.
+
+"""
+
+from typing import Dict, List, NamedTuple
+import numpy as np
+
+# Number of intensity levels of 8-bit images
+LEVELS = 256
+
+# Percentiles reported for every channel
+PERCENTILES = [1, 5, 25, 50, 75, 95, 99]
+
+# Pixels counted per chunk, bounding the offset copy to a few megabytes
+CHUNK_PIXELS = 1 << 20
+
+# Names of the channels of OpenCV's BGR images
+CHANNEL_NAMES = ['Blue', 'Green', 'Red']
+
+class ImageStatistics(NamedTuple):
+    """
+    Statistics of an image, with one row per channel.
+    """
+    histograms: np.ndarray
+    means: np.ndarray
+    percentiles: Dict[int, np.ndarray]
+    channel_names: List[str]
+
+    @property
+    def pixels(self) -> int:
+        return int(self.histograms[0].sum())
+
+def compute_statistics(image: np.ndarray) -> ImageStatistics:
+    """
+    Compute the per-channel histograms, means and percentiles of an image.
+
+    Args:
+    - image (np.ndarray): The image, color (rows, columns, channels) or grayscale (rows, columns), of type uint8.
+
+    Returns:
+    - ImageStatistics: The statistics, with the channels in the image's order.
+    """
+    if image.dtype != np.uint8:
+        raise ValueError("Only 8-bit images are supported!")
+    pixels = image.reshape(-1, 1) if image.ndim == 2 else image.reshape(-1, image.shape[2])
+    channels = pixels.shape[1]
+    count = len(pixels)
+    if count == 0:
+        raise ValueError("The image has no pixels!")
+
+    # Shift channel c into bins [c * 256, (c + 1) * 256) and count all channels at once
+    offsets = np.arange(channels, dtype=np.uint16) * LEVELS
+    histograms = np.zeros(channels * LEVELS, dtype=np.int64)
+    for start in range(0, count, CHUNK_PIXELS):
+        histograms += np.bincount((pixels[start:start + CHUNK_PIXELS] + offsets).ravel(), minlength=channels * LEVELS)
+    histograms = histograms.reshape(channels, LEVELS)
+
+    levels = np.arange(LEVELS)
+    means = histograms @ levels / count
+
+    # The p-th percentile is the value at sorted index floor(p / 100 * (count - 1)), as np.percentile(method='lower')
+    cumulative = histograms.cumsum(axis=1)
+    percentiles = {}
+    for percentile in PERCENTILES:
+        rank = int(percentile / 100 * (count - 1))
+        percentiles[percentile] = (cumulative <= rank).sum(axis=1)
+
+    channel_names = CHANNEL_NAMES if channels == 3 else ['Gray'] if channels == 1 else [f"Channel {index}" for index in range(channels)]
+    return ImageStatistics(histograms, means, percentiles, channel_names)
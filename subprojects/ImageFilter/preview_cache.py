@@ -0,0 +1,129 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Preview Pyramid and Result Cache for the Image Filtering Program.
+
+Input:
+- Loaded images, and filter results keyed by image, filter, kernel size and pyramid level.
+
+Output:
+- Downscaled copies of an image, and cached filter results.
+
+Features:
+- Builds a multi-resolution pyramid once per image, each level half the size of the previous one.
+- Identifies images by a hash of their pixels, so reloading the same file reuses its results.
+- Caches filter results in least-recently-used order within a memory budget, so moving the
+  kernel size slider back to a previous value is instant.
+
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Hashable, List, Tuple
+import cv2
+import numpy as np
+
+# Number of pyramid levels, the first one being the full-resolution image
+PYRAMID_LEVELS = 3
+
+# Smallest side of a pyramid level; no level is made smaller
+MIN_LEVEL_SIDE = 64
+
+# Memory budget of the result cache, in bytes
+CACHE_BUDGET = 512 * 1024 * 1024
+
+def image_hash(image: np.ndarray) -> str:
+    """
+    Compute a hash identifying the pixels of an image.
+
+    Args:
+    - image (np.ndarray): The image.
+
+    Returns:
+    - str: Hexadecimal digest of the image's shape, type and pixels.
+    """
+    digest = hashlib.blake2b(f"{image.shape}{image.dtype}".encode(), digest_size=16)
+    digest.update(memoryview(np.ascontiguousarray(image)).cast('B'))
+    return digest.hexdigest()
+
+def build_pyramid(image: np.ndarray, levels: int = PYRAMID_LEVELS, min_side: int = MIN_LEVEL_SIDE) -> List[np.ndarray]:
+    """
+    Build the preview pyramid of an image.
+
+    Args:
+    - image (np.ndarray): The full-resolution image.
+    - levels (int): Largest number of levels, including the full-resolution one.
+    - min_side (int): Smallest side of a level.
+
+    Returns:
+    - List[np.ndarray]: The levels, from full resolution down, each half the size of the previous one.
+    """
+    pyramid = [image]
+    while len(pyramid) < levels and min(pyramid[-1].shape[:2]) // 2 >= min_side:
+        # Area interpolation averages the pixels each output pixel covers, avoiding aliasing
+        pyramid.append(cv2.resize(pyramid[-1], None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA))
+    return pyramid
+
+class ResultCache:
+    """
+    Filter results in least-recently-used order, within a memory budget.
+
+    Results may be any object with an `nbytes` attribute, such as a FilterResult or an array. Their size
+    is recorded when they are cached, as a FilterResult shrinks once it releases its source image.
+    """
+
+    def __init__(self, budget: int = CACHE_BUDGET):
+        """
+        Initialize the cache.
+
+        Args:
+        - budget (int): Largest number of bytes of results kept.
+        """
+        self.budget = budget
+        self.nbytes = 0
+        # Every result with its size when it was cached
+        self.entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: Hashable):
+        """
+        Return a cached result and mark it as recently used.
+
+        Args:
+        - key (Hashable): Key of the result, such as (image hash, filter, kernel size, level).
+
+        Returns:
+        - The result, or None if it is not cached.
+        """
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """
+        Cache a result, evicting the least recently used ones beyond the budget.
+
+        Args:
+        - key (Hashable): Key of the result.
+        - result (Any): The result.
+        """
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+        size = result.nbytes
+        # A result larger than the whole budget would only evict everything else
+        if size > self.budget:
+            return
+        self.entries[key] = (result, size)
+        self.nbytes += size
+        while self.nbytes > self.budget:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.nbytes -= evicted_size
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
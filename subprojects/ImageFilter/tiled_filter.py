@@ -0,0 +1,199 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Tiled Filtering Engine for the Image Filtering Program.
+
+Input:
+- An image as a NumPy array, a filter name (Mean, Gaussian or Median) and a kernel size.
+
+Output:
+- The filtered image, identical to filtering the whole image with a single OpenCV call.
+
+Features:
+- Splits the image into tiles, each read with a halo of kernel_size // 2 pixels so every output
+  pixel sees its full neighbourhood, and writes back only the tile's own pixels.
+- Tiles touching the image border are filtered with OpenCV's own border handling, so the stitched
+  result matches the whole-image filter exactly.
+- Filters tiles across a thread pool (OpenCV releases the GIL) or a process pool that shares the
+  input and output images through shared memory instead of copying them.
+- Holds at most one tile and its halo per worker besides the input and output images.
+- Reports progress after every tile, and stops between tiles when cancelled.
+
+"""
+
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import cv2
+import numpy as np
+
+# Side of the square tiles, in pixels, before adding the halo
+TILE_SIZE = 1024
+
+# Filters of the engine, each applied to one tile with a kernel size
+FILTERS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    'Mean': lambda tile, kernel_size: cv2.blur(tile, (kernel_size, kernel_size)),
+    'Gaussian': lambda tile, kernel_size: cv2.GaussianBlur(tile, (kernel_size, kernel_size), 0),
+    'Median': lambda tile, kernel_size: cv2.medianBlur(tile, kernel_size),
+}
+
+# Called with the number of tiles done and the total number of tiles
+ProgressCallback = Callable[[int, int], None]
+
+class FilterCancelled(Exception):
+    """
+    Raised when a filter is cancelled before all its tiles are done.
+    """
+
+class Tile(NamedTuple):
+    """
+    A tile of the output image and the region of the input it is computed from.
+    """
+    top: int
+    left: int
+    bottom: int
+    right: int
+    halo_top: int
+    halo_left: int
+    halo_bottom: int
+    halo_right: int
+
+def plan_tiles(height: int, width: int, halo: int, tile_size: int = TILE_SIZE) -> List[Tile]:
+    """
+    Split an image into tiles, each with a halo clipped to the image.
+
+    Args:
+    - height (int): Height of the image.
+    - width (int): Width of the image.
+    - halo (int): Number of extra pixels read around every tile.
+    - tile_size (int): Side of the tiles.
+
+    Returns:
+    - List[Tile]: The tiles, row by row.
+    """
+    return [
+        Tile(top, left, min(top + tile_size, height), min(left + tile_size, width),
+             max(top - halo, 0), max(left - halo, 0), min(top + tile_size + halo, height), min(left + tile_size + halo, width))
+        for top in range(0, height, tile_size)
+        for left in range(0, width, tile_size)
+    ]
+
+def validate(filter_name: str, kernel_size: int) -> None:
+    """
+    Check that a filter and kernel size can be applied.
+
+    Args:
+    - filter_name (str): Name of the filter, one of the keys of `FILTERS`.
+    - kernel_size (int): Side of the filter's kernel.
+    """
+    if filter_name not in FILTERS:
+        raise ValueError(f"Invalid filter '{filter_name}'. Choose one of: {', '.join(FILTERS)}.")
+    if kernel_size <= 0 or (filter_name != 'Mean' and kernel_size % 2 == 0):
+        raise ValueError("Invalid kernel size. Please use an odd positive integer.")
+
+def filter_tile(source: np.ndarray, target: np.ndarray, tile: Tile, filter_name: str, kernel_size: int) -> None:
+    """
+    Filter one tile of an image, writing only the tile's own pixels.
+
+    Args:
+    - source (np.ndarray): The input image.
+    - target (np.ndarray): The output image.
+    - tile (Tile): The tile to filter.
+    - filter_name (str): Name of the filter, one of the keys of `FILTERS`.
+    - kernel_size (int): Side of the filter's kernel.
+    """
+    # Copy the region, as OpenCV would otherwise see a strided view of the whole image
+    region = np.ascontiguousarray(source[tile.halo_top:tile.halo_bottom, tile.halo_left:tile.halo_right])
+    filtered = FILTERS[filter_name](region, kernel_size)
+    top, left = tile.top - tile.halo_top, tile.left - tile.halo_left
+    target[tile.top:tile.bottom, tile.left:tile.right] = filtered[top:top + tile.bottom - tile.top, left:left + tile.right - tile.left]
+
+# Shared images of a process pool worker, attached once by the pool's initializer
+_shared: Dict[str, object] = {}
+
+def _attach(source_name: str, target_name: str, shape: Tuple[int, ...], dtype: str) -> None:
+    """
+    Attach a process pool worker to the shared input and output images.
+    """
+    # Each worker filters one tile at a time; OpenCV's own threads would only compete with the others
+    cv2.setNumThreads(1)
+    source = shared_memory.SharedMemory(name=source_name)
+    target = shared_memory.SharedMemory(name=target_name)
+    _shared.update(
+        memory=(source, target),
+        source=np.ndarray(shape, dtype=dtype, buffer=source.buf),
+        target=np.ndarray(shape, dtype=dtype, buffer=target.buf),
+    )
+
+def _filter_shared_tile(tile: Tile, filter_name: str, kernel_size: int) -> None:
+    """
+    Filter one tile of the shared images in a process pool worker.
+    """
+    filter_tile(_shared['source'], _shared['target'], tile, filter_name, kernel_size)
+
+def run_tasks(executor: Executor, submit: Callable[[object], Future], tasks: List[object], progress: Optional[ProgressCallback] = None, cancel: Optional[threading.Event] = None) -> None:
+    """
+    Submit every task to an executor and wait for them, reporting progress.
+
+    Args:
+    - executor (Executor): The pool running the tasks.
+    - submit (Callable[[object], Future]): Submits one task to the executor.
+    - tasks (List[object]): The tasks, such as tiles or bands of rows.
+    - progress (Optional[ProgressCallback]): Called after every task with the tasks done and the total.
+    - cancel (Optional[threading.Event]): When set, the tasks not started yet are dropped and
+      `FilterCancelled` is raised.
+    """
+    futures = [submit(task) for task in tasks]
+    for done, future in enumerate(as_completed(futures), start=1):
+        if cancel is not None and cancel.is_set():
+            for pending in futures:
+                pending.cancel()
+            raise FilterCancelled()
+        future.result()
+        if progress is not None:
+            progress(done, len(tasks))
+
+def filter_tiled(image: np.ndarray, filter_name: str, kernel_size: int, tile_size: int = TILE_SIZE, workers: Optional[int] = None, use_processes: bool = False, progress: Optional[ProgressCallback] = None, cancel: Optional[threading.Event] = None) -> np.ndarray:
+    """
+    Filter an image tile by tile across a pool of workers.
+
+    Args:
+    - image (np.ndarray): The image, grayscale or color.
+    - filter_name (str): Name of the filter, one of the keys of `FILTERS`.
+    - kernel_size (int): Side of the filter's kernel.
+    - tile_size (int): Side of the tiles.
+    - workers (Optional[int]): Number of workers, defaults to the number of CPUs.
+    - use_processes (bool): If True, use a process pool with shared memory instead of threads.
+    - progress (Optional[ProgressCallback]): Called after every tile with the tiles done and the total.
+    - cancel (Optional[threading.Event]): When set, the remaining tiles are dropped and `FilterCancelled` is raised.
+
+    Returns:
+    - np.ndarray: The filtered image.
+    """
+    validate(filter_name, kernel_size)
+    workers = workers or os.cpu_count()
+    tiles = plan_tiles(image.shape[0], image.shape[1], kernel_size // 2, tile_size)
+
+    if not use_processes:
+        result = np.empty_like(image)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            run_tasks(executor, lambda tile: executor.submit(filter_tile, image, result, tile, filter_name, kernel_size), tiles, progress, cancel)
+        return result
+
+    source = shared_memory.SharedMemory(create=True, size=image.nbytes)
+    target = shared_memory.SharedMemory(create=True, size=image.nbytes)
+    try:
+        np.ndarray(image.shape, dtype=image.dtype, buffer=source.buf)[...] = image
+        initargs = (source.name, target.name, image.shape, image.dtype.str)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=initargs) as executor:
+            run_tasks(executor, lambda tile: executor.submit(_filter_shared_tile, tile, filter_name, kernel_size), tiles, progress, cancel)
+        return np.ndarray(image.shape, dtype=image.dtype, buffer=target.buf).copy()
+    finally:
+        for memory in (source, target):
+            memory.close()
+            memory.unlink()
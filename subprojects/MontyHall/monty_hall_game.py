@@ -18,48 +18,114 @@ Features:
 - Allows the user to choose a door, select the difficulty level, and decide whether to switch their choice.
 - Displays game statistics, including wins and losses.
 - Offers the option to play the game again.
+- Loads and decodes the sound effects once, then reuses them every round.
+- Non-interactive auto-play mode that plays any number of rounds with a fixed strategy.
 
 """
 
+import argparse
 import random
+from typing import Dict, Optional
 import pygame
 
-def play_monty(prize_door: int, selected_door: int, difficulty: str) -> int:
+# Sound effects of the game, loaded once by load_sounds()
+SOUND_FILES = {
+    "goat": "../../assets/audio/goat_sound_montyhall.wav",
+}
+sounds: Dict[str, pygame.mixer.Sound] = {}
+
+def load_sounds() -> Dict[str, pygame.mixer.Sound]:
     """
-    Simulates the Monty Hall game and returns the door opened by Monty.
+    Initialize the mixer and load every sound effect, the first time only.
+    
+    Returns:
+    - Dict[str, pygame.mixer.Sound]: The loaded sound effects, keyed by name.
+    """
+    if not sounds:
+        # Intialize pygame mixer
+        pygame.mixer.init()
+
+        for name, path in SOUND_FILES.items():
+            sounds[name] = pygame.mixer.Sound(path)
+    return sounds
+
+def choose_monty_door(prize_door: int, selected_door: int, difficulty: str) -> int:
+    """
+    Choose the door opened by Monty.
     
     Args:
     - prize_door (int): The door behind which the prize is placed (0, 1, or 2).
     - selected_door (int): The initial door chosen by the player.
+    - difficulty (str): 'easy' to always open a goat door, 'hard' to sometimes open the prize door.
     
     Returns:
-    - int: The door opened by Monty, revealing a goat.
+    - int: The door opened by Monty.
     """
-
-    # Intialize pygame mixer
-    pygame.mixer.init()
-
-    # Load the sound effect for revealing a goat
-    goat_sound = pygame.mixer.Sound("../../assets/audio/goat_sound_montyhall.wav")
-
     # Monty Hall reveals a door with a goat that isn't the selected door or the prize door
     doors_to_open = [door for door in range(3) if door != selected_door and door != prize_door]
 
     # Adjust difficulty level
     if difficulty == "easy":
-        monty_opens = random.choice(doors_to_open)
+        return random.choice(doors_to_open)
     elif difficulty == "hard":
-        monty_opens = random.choice(doors_to_open) if random.random() < 0.7 else prize_door
+        return random.choice(doors_to_open) if random.random() < 0.7 else prize_door
     else:
         raise ValueError("Invalid difficulty level! Please choose 'easy' or 'hard'.")
+
+def play_monty(prize_door: int, selected_door: int, difficulty: str) -> int:
+    """
+    Simulates the Monty Hall game and returns the door opened by Monty.
+    
+    Args:
+    - prize_door (int): The door behind which the prize is placed (0, 1, or 2).
+    - selected_door (int): The initial door chosen by the player.
+    
+    Returns:
+    - int: The door opened by Monty, revealing a goat.
+    """
+    monty_opens = choose_monty_door(prize_door, selected_door, difficulty)
     
     print(f"\nMonty Hall opens door {monty_opens}, revealing a goat!")
 
     # Play the sound effect for revealing a goat
-    goat_sound.play()
+    load_sounds()["goat"].play()
     
     return monty_opens
 
+def auto_play(rounds: int, difficulty: str = "easy", switch: bool = True, seed: Optional[int] = None, sound: bool = False) -> Dict[str, int]:
+    """
+    Play a number of rounds without user input, always following the same strategy.
+    
+    Args:
+    - rounds (int): Number of rounds to play.
+    - difficulty (str): 'easy' or 'hard'.
+    - switch (bool): If True, the player always switches after Monty opens a door.
+    - seed (Optional[int]): Seed for reproducible rounds, or None.
+    - sound (bool): If True, play the cached goat sound every round.
+    
+    Returns:
+    - Dict[str, int]: Number of wins and losses.
+    """
+    if seed is not None:
+        random.seed(seed)
+    goat_sound = load_sounds()["goat"] if sound else None
+
+    wins = 0
+    for _ in range(rounds):
+        prize_door = random.randint(0, 2)
+        selected_door = random.randint(0, 2)
+        monty_opens = choose_monty_door(prize_door, selected_door, difficulty)
+        if goat_sound:
+            goat_sound.play()
+
+        if switch:
+            remaining_doors = [door for door in range(3) if door != selected_door and door != monty_opens]
+            # Monty may have opened the player's own door on 'hard'; switching then picks either other door
+            selected_door = random.choice(remaining_doors)
+        wins += selected_door == prize_door
+
+    return {"wins": wins, "losses": rounds - wins}
+
 def main():
     """
     Main function to run the Monty Hall game.
@@ -68,6 +134,9 @@ def main():
     wins = 0
     losses = 0
 
+    # Load the sound effects once for the whole session
+    load_sounds()
+
     print("\nWelcome to the Monty Hall Game!\n")
     
     while True:
@@ -129,4 +198,17 @@ def main():
             break
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Play the Monty Hall game.")
+    parser.add_argument("--auto", type=int, metavar="ROUNDS", help="play ROUNDS rounds without user input")
+    parser.add_argument("--difficulty", choices=["easy", "hard"], default="easy", help="difficulty of auto-play")
+    parser.add_argument("--stay", action="store_true", help="never switch doors in auto-play")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible auto-play")
+    parser.add_argument("--sound", action="store_true", help="play the goat sound every auto-played round")
+    args = parser.parse_args()
+
+    if args.auto:
+        stats = auto_play(args.auto, args.difficulty, not args.stay, args.seed, args.sound)
+        print(f"Statistics: Wins - {stats['wins']}, Losses - {stats['losses']}")
+        print(f"Winning percentage: {stats['wins'] / args.auto * 100:.2f}%")
+    else:
+        main()
\ No newline at end of file
@@ -15,10 +15,28 @@ Output:
 Features:
 - Simulates the Monty Hall game with a specified number of trials.
 - Calculates and displays the winning percentage both with and without changing the initial choice.
+- Vectorized NumPy engine that plays both strategies for every trial in batched passes with a seeded generator.
+- Reports 95% Wilson confidence intervals for the winning percentages.
 
 """
 
+import math
 import random
+from typing import Dict, NamedTuple, Optional
+import numpy as np
+
+# Number of trials simulated per NumPy batch, bounding memory use for huge runs
+BATCH_SIZE = 10_000_000
+
+class StrategyResult(NamedTuple):
+    """
+    Outcome of one strategy over a number of trials.
+    """
+    wins: int
+    trials: int
+    rate: float
+    low: float
+    high: float
 
 def game(winning_door: int, selected_door: int, change: bool = False) -> bool:
     """
@@ -45,14 +63,64 @@ def game(winning_door: int, selected_door: int, change: bool = False) -> bool:
 
     return selected_door == winning_door
 
+def wilson_interval(wins: int, trials: int, z: float = 1.96) -> StrategyResult:
+    """
+    Compute the winning rate and its Wilson score confidence interval.
+
+    Args:
+    - wins (int): Number of trials won.
+    - trials (int): Number of trials played.
+    - z (float): Standard normal quantile of the confidence level (1.96 for 95%).
+
+    Returns:
+    - StrategyResult: The wins, rate and interval bounds.
+    """
+    if trials <= 0:
+        raise ValueError("The confidence interval needs at least one trial!")
+    rate = wins / trials
+    denominator = 1 + z ** 2 / trials
+    centre = (rate + z ** 2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return StrategyResult(wins, trials, rate, centre - margin, centre + margin)
+
+def simulate_vectorized(trials: int, seed: Optional[int] = None, batch_size: int = BATCH_SIZE) -> Dict[str, StrategyResult]:
+    """
+    Simulate the Monty Hall game for both strategies with NumPy.
+
+    Every trial places the prize, picks the player's door and lets the host open
+    a goat door, then scores staying and switching on that same trial.
+
+    Args:
+    - trials (int): Number of trials to run.
+    - seed (Optional[int]): Seed of the random generator, for reproducible runs.
+    - batch_size (int): Number of trials simulated per batch.
+
+    Returns:
+    - Dict[str, StrategyResult]: Results of the 'stay' and 'switch' strategies.
+    """
+    rng = np.random.default_rng(seed)
+    stay_wins = switch_wins = 0
+
+    for start in range(0, trials, batch_size):
+        size = min(batch_size, trials - start)
+        winning_door = rng.integers(0, 3, size, dtype=np.uint8)
+        selected_door = rng.integers(0, 3, size, dtype=np.uint8)
+        coin = rng.integers(0, 2, size, dtype=np.uint8)
+
+        # The host opens a random other door when the player holds the prize, else the only goat door left
+        removed_door = np.where(selected_door == winning_door, (selected_door + 1 + coin) % 3, 3 - selected_door - winning_door)
+        switched_door = 3 - selected_door - removed_door
+
+        stay_wins += int(np.count_nonzero(selected_door == winning_door))
+        switch_wins += int(np.count_nonzero(switched_door == winning_door))
+
+    return {"stay": wilson_interval(stay_wins, trials), "switch": wilson_interval(switch_wins, trials)}
+
 if __name__ == '__main__':
     total_trials = 1000000  # Number of trials to run the simulation
-    player_doors = [random.randint(0, 2) for _ in range(total_trials)]  # Randomly select doors for each trial
-
-    # Calculate the winning percentage without changing the initial choice
-    winning_no_change = sum(game(1, door) for door in player_doors)
-    print(f"Winning percentage without changing choice: {winning_no_change / total_trials * 100:.2f}%")
+    results = simulate_vectorized(total_trials)
 
-    # Calculate the winning percentage when changing the initial choice after a door is revealed
-    winning_change = sum(game(1, door, change=True) for door in player_doors)
-    print(f"Winning percentage while changing choice: {winning_change / total_trials * 100:.2f}%")
+    # Display the winning percentage without and with changing the initial choice
+    stay, switch = results["stay"], results["switch"]
+    print(f"Winning percentage without changing choice: {stay.rate * 100:.2f}% (95% CI {stay.low * 100:.2f}-{stay.high * 100:.2f}%)")
+    print(f"Winning percentage while changing choice: {switch.rate * 100:.2f}% (95% CI {switch.low * 100:.2f}-{switch.high * 100:.2f}%)")
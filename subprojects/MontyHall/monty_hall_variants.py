@@ -0,0 +1,224 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Monty Hall Variants Simulation Program.
+
+Input:
+- Command-line options for the numbers of doors, doors opened by the host, host policies,
+  trials, seed and worker processes.
+
+Output:
+- A results table with the winning percentage and confidence interval of staying and
+  switching for every (doors, reveals, policy) combination.
+
+Features:
+- Simulates the game with N doors where the host opens k of the doors the player did not pick.
+- Supports the 'easy' host, who always opens goat doors, and the 'hard' host from
+  `monty_hall_game.play_monty`, who opens the prize door with probability 0.3.
+- Shards trials across a process pool with independent seeded random streams and merges the results,
+  so a run is reproducible whatever the number of workers.
+- Sweeps a grid of (doors, reveals, policy) and prints the results as a table or CSV.
+
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from monty_hall_simulation import BATCH_SIZE, wilson_interval
+
+# Host policies and the probability that the host opens the prize door under each
+HOST_POLICIES = {"easy": 0.0, "hard": 0.3}
+
+# Number of trials per shard; the shard count, and so the random streams, depend only on the trial count
+SHARD_SIZE = 1_000_000
+
+# Arguments of one call to simulate_shard()
+ShardTask = Tuple[int, int, str, int, np.random.SeedSequence]
+
+# Column order of a results row
+FIELDS = ["doors", "reveals", "policy", "trials", "stay", "stay_low", "stay_high", "switch", "switch_low", "switch_high", "prize_revealed"]
+
+def simulate_shard(doors: int, reveals: int, policy: str, trials: int, seed: np.random.SeedSequence) -> Tuple[int, int, int]:
+    """
+    Simulate one shard of trials of the N-door game.
+
+    Args:
+    - doors (int): Number of doors.
+    - reveals (int): Number of doors the host opens.
+    - policy (str): Host policy, one of the keys of `HOST_POLICIES`.
+    - trials (int): Number of trials in the shard.
+    - seed (np.random.SeedSequence): Seed of the shard's random stream.
+
+    Returns:
+    - Tuple[int, int, int]: Wins when staying, wins when switching, and trials where the prize was revealed.
+    """
+    rng = np.random.default_rng(seed)
+    reveal_probability = HOST_POLICIES[policy]
+    # Doors the switching player can move to: not their own and not opened
+    remaining = doors - 1 - reveals
+    stay_wins = switch_wins = prize_revealed = 0
+
+    for start in range(0, trials, BATCH_SIZE):
+        size = min(BATCH_SIZE, trials - start)
+        winning_door = rng.integers(0, doors, size)
+        selected_door = rng.integers(0, doors, size)
+        stay = selected_door == winning_door
+
+        # The hard host may open the prize door when the player does not hold it
+        revealed = ~stay & (rng.random(size) < reveal_probability)
+        # Otherwise the prize is one of the remaining doors, and the player switches to one of them at random
+        switch = ~stay & ~revealed & (rng.integers(0, remaining, size) == 0)
+
+        stay_wins += int(np.count_nonzero(stay))
+        switch_wins += int(np.count_nonzero(switch))
+        prize_revealed += int(np.count_nonzero(revealed))
+
+    return stay_wins, switch_wins, prize_revealed
+
+def plan_shards(doors: int, reveals: int, policy: str, trials: int, seed: Optional[int] = None) -> List[ShardTask]:
+    """
+    Validate a variant of the game and split its trials into shards.
+
+    Args:
+    - doors (int): Number of doors.
+    - reveals (int): Number of doors the host opens.
+    - policy (str): Host policy, one of the keys of `HOST_POLICIES`.
+    - trials (int): Number of trials to run.
+    - seed (Optional[int]): Seed of the variant, for reproducible results.
+
+    Returns:
+    - List[ShardTask]: Arguments of `simulate_shard()` for every shard.
+    """
+    if doors < 3:
+        raise ValueError("The game needs at least 3 doors!")
+    if not 1 <= reveals <= doors - 2:
+        raise ValueError(f"The host can open between 1 and {doors - 2} doors with {doors} doors!")
+    if policy not in HOST_POLICIES:
+        raise ValueError(f"Invalid host policy '{policy}'! Choose one of: {', '.join(HOST_POLICIES)}.")
+
+    shard_count = max(1, -(-trials // SHARD_SIZE))
+    seeds = np.random.SeedSequence(seed).spawn(shard_count)
+    return [(doors, reveals, policy, trials // shard_count + (index < trials % shard_count), seeds[index]) for index in range(shard_count)]
+
+def merge_shards(doors: int, reveals: int, policy: str, trials: int, shards: Sequence[Tuple[int, int, int]]) -> Dict[str, Union[int, str, float]]:
+    """
+    Combine the counts of a variant's shards into its results row.
+
+    Args:
+    - doors (int): Number of doors.
+    - reveals (int): Number of doors the host opens.
+    - policy (str): Host policy.
+    - trials (int): Number of trials run.
+    - shards (Sequence[Tuple[int, int, int]]): Counts returned by `simulate_shard()`.
+
+    Returns:
+    - Dict[str, Union[int, str, float]]: The results row of the variant.
+    """
+    stay_wins, switch_wins, prize_revealed = (sum(column) for column in zip(*shards))
+    stay, switch = wilson_interval(stay_wins, trials), wilson_interval(switch_wins, trials)
+    return {
+        "doors": doors,
+        "reveals": reveals,
+        "policy": policy,
+        "trials": trials,
+        "stay": stay.rate,
+        "stay_low": stay.low,
+        "stay_high": stay.high,
+        "switch": switch.rate,
+        "switch_low": switch.low,
+        "switch_high": switch.high,
+        "prize_revealed": prize_revealed / trials,
+    }
+
+def sweep(doors: Sequence[int], reveals: Sequence[int], policies: Sequence[str], trials: int, seed: Optional[int] = None, workers: Optional[int] = None) -> List[Dict[str, Union[int, str, float]]]:
+    """
+    Simulate every valid (doors, reveals, policy) combination of a grid.
+
+    The shards of all the combinations are submitted to the pool together, so
+    small runs of many combinations keep every worker busy too.
+
+    Args:
+    - doors (Sequence[int]): Numbers of doors.
+    - reveals (Sequence[int]): Numbers of doors opened by the host; combinations opening too many doors are skipped.
+    - policies (Sequence[str]): Host policies.
+    - trials (int): Number of trials per combination.
+    - seed (Optional[int]): Seed of the sweep, for reproducible results.
+    - workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+
+    Returns:
+    - List[Dict[str, Union[int, str, float]]]: One results row per combination.
+    """
+    grid = [(n, k, policy) for n, k, policy in itertools.product(doors, reveals, policies) if 1 <= k <= n - 2]
+    # Every combination gets its own independent stream, derived from the sweep's seed
+    seeds = np.random.SeedSequence(seed).generate_state(len(grid))
+    plans = [plan_shards(n, k, policy, trials, int(variant_seed)) for (n, k, policy), variant_seed in zip(grid, seeds)]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = iter(executor.map(simulate_shard, *zip(*itertools.chain.from_iterable(plans))))
+        return [merge_shards(n, k, policy, trials, [next(results) for _ in plan]) for (n, k, policy), plan in zip(grid, plans)]
+
+def simulate_variant(doors: int, reveals: int, policy: str, trials: int, seed: Optional[int] = None, workers: Optional[int] = None) -> Dict[str, Union[int, str, float]]:
+    """
+    Simulate one variant of the game, sharding the trials across a process pool.
+
+    Args:
+    - doors (int): Number of doors.
+    - reveals (int): Number of doors the host opens.
+    - policy (str): Host policy, one of the keys of `HOST_POLICIES`.
+    - trials (int): Number of trials to run.
+    - seed (Optional[int]): Seed of the variant, for reproducible results.
+    - workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+
+    Returns:
+    - Dict[str, Union[int, str, float]]: The results row of the variant.
+    """
+    plan = plan_shards(doors, reveals, policy, trials, seed)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        shards = list(executor.map(simulate_shard, *zip(*plan)))
+    return merge_shards(doors, reveals, policy, trials, shards)
+
+def print_table(rows: List[Dict[str, Union[int, str, float]]]) -> None:
+    """
+    Print results rows as an aligned table.
+
+    Args:
+    - rows (List[Dict[str, Union[int, str, float]]]): The results rows.
+    """
+    print(f"{'Doors':>6} {'Opened':>6} {'Host':>6} {'Trials':>12} {'Stay':>22} {'Switch':>22} {'Prize shown':>12}")
+    for row in rows:
+        stay = f"{row['stay'] * 100:.2f}% ({row['stay_low'] * 100:.2f}-{row['stay_high'] * 100:.2f})"
+        switch = f"{row['switch'] * 100:.2f}% ({row['switch_low'] * 100:.2f}-{row['switch_high'] * 100:.2f})"
+        print(f"{row['doors']:>6} {row['reveals']:>6} {row['policy']:>6} {row['trials']:>12,} {stay:>22} {switch:>22} {row['prize_revealed'] * 100:>11.2f}%")
+
+def main():
+    """
+    Main function to run the sweep from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Simulate N-door Monty Hall variants where the host opens k doors.")
+    parser.add_argument("--doors", type=int, nargs="+", default=[3, 4, 5, 10], help="numbers of doors")
+    parser.add_argument("--reveals", type=int, nargs="+", default=[1, 2], help="numbers of doors opened by the host")
+    parser.add_argument("--policies", nargs="+", choices=list(HOST_POLICIES), default=list(HOST_POLICIES), help="host policies")
+    parser.add_argument("--trials", type=int, default=1_000_000, help="trials per combination")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible results")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--csv", action="store_true", help="print CSV instead of a table")
+    args = parser.parse_args()
+
+    rows = sweep(args.doors, args.reveals, args.policies, args.trials, args.seed, args.workers)
+    if args.csv:
+        writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print_table(rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Shared Analysis Context for the Rainy Days Program.
+
+Input:
+- A DataFrame of daily weather data with DATE and PRCP columns.
+
+Output:
+- Derived features shared by the analyses: rainfall in inches, seasons, rain categories,
+  monthly and seasonal averages, category counts, Z-scores, extreme events and correlations.
+
+Features:
+- Indexes the data by date once, without modifying the caller's DataFrame.
+- Computes every derived feature on first use and memoizes it, so repeated analyses are instant.
+- Hands out copies of pandas features and non-writeable NumPy arrays, so no analysis can change what
+  another one sees, whatever the order they run in. The copies are shallow when copy-on-write is on
+  (always from pandas 3), and deep otherwise.
+
+"""
+
+import functools
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from scipy.stats import zscore
+from rainfall_pipeline import EXTREME_Z, RAIN_CATEGORIES, RAIN_THRESHOLDS, SEASONS
+
+Feature = Union[pd.DataFrame, pd.Series, np.ndarray]
+
+# GHCN rainfall is in tenths of a millimetre, 254 to an inch
+TENTHS_MM_PER_INCH = 254.0
+
+# Meteorological columns compared with rainfall in the correlation analysis
+CORRELATION_COLUMNS = ['PRCP', 'TMAX', 'TMIN', 'AWND', 'WSF2', 'WSF5', 'WT01', 'WT02', 'WT03']
+
+def copy_on_write() -> bool:
+    """
+    Check whether pandas copies data on write, making shallow copies independent of their source.
+
+    Returns:
+    - bool: True from pandas 3, or when `pd.options.mode.copy_on_write` is set to True before.
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+def feature(compute: Callable[['AnalysisContext'], Feature]) -> property:
+    """
+    Turn a method into a memoized, read-only feature of the context.
+
+    Pandas objects are handed out as copies: shallow ones under copy-on-write, which keeps them
+    from changing the memoized value, and deep ones otherwise, as in-place edits of a shallow copy
+    would write through to it. NumPy arrays are memoized as non-writeable.
+
+    Args:
+    - compute (Callable[[AnalysisContext], Feature]): Method computing the feature.
+
+    Returns:
+    - property: Property returning the memoized feature.
+    """
+    name = compute.__name__
+
+    @functools.wraps(compute)
+    def getter(self: 'AnalysisContext') -> Feature:
+        if name not in self._features:
+            value = compute(self)
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._features[name] = value
+        value = self._features[name]
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy(deep=not copy_on_write())
+        return value
+
+    return property(getter)
+
+class AnalysisContext:
+    """
+    Daily weather data and its derived features, computed once and shared by the analyses.
+    """
+
+    def __init__(self, data: pd.DataFrame, file_path: Optional[str] = None):
+        """
+        Initialize the context.
+
+        Args:
+        - data (pd.DataFrame): Daily weather data, with DATE as a column or as the index.
+        - file_path (Optional[str]): Path of the CSV file the data was loaded from, locating its caches.
+        """
+        self.file_path = file_path
+        if 'DATE' in data.columns:
+            data = data.set_index('DATE')
+        self._data = data.sort_index()
+        self._features: Dict[str, Feature] = {}
+
+    @feature
+    def data(self) -> pd.DataFrame:
+        """
+        Daily weather data indexed by date.
+        """
+        return self._data
+
+    @feature
+    def rainfall_inches(self) -> np.ndarray:
+        """
+        Daily rainfall converted to inches.
+        """
+        return self._data['PRCP'].to_numpy(dtype=float) / TENTHS_MM_PER_INCH
+
+    @feature
+    def season(self) -> pd.Series:
+        """
+        Season of every day, three months each starting from January.
+        """
+        return pd.Series(pd.cut(self._data.index.month, bins=[0, 3, 6, 9, 12], labels=SEASONS), index=self._data.index, name='Season')
+
+    @feature
+    def rain_category(self) -> pd.Series:
+        """
+        Rain category of every day.
+        """
+        bins = [-np.inf] + RAIN_THRESHOLDS + [np.inf]
+        return pd.cut(self._data['PRCP'], bins=bins, labels=RAIN_CATEGORIES).rename('Rain Category')
+
+    @feature
+    def monthly_average(self) -> pd.Series:
+        """
+        Average rainfall of every month.
+        """
+        return self._data['PRCP'].resample('ME').mean()
+
+    @feature
+    def seasonal_average(self) -> pd.Series:
+        """
+        Average rainfall of every season.
+        """
+        return self._data['PRCP'].groupby(self.season, observed=False).mean()
+
+    @feature
+    def category_counts(self) -> pd.Series:
+        """
+        Number of days in every rain category.
+        """
+        return self.rain_category.value_counts()
+
+    @feature
+    def z_scores(self) -> pd.Series:
+        """
+        Z-score of the rainfall of every day.
+        """
+        return pd.Series(zscore(self._data['PRCP'].astype(float)), index=self._data.index, name='Z')
+
+    @feature
+    def extreme_events(self) -> pd.DataFrame:
+        """
+        Days whose rainfall Z-score is beyond the extreme event threshold.
+        """
+        return self._data.loc[self.z_scores.abs() > EXTREME_Z]
+
+    @feature
+    def correlation_matrix(self) -> pd.DataFrame:
+        """
+        Correlations between rainfall and the other meteorological factors.
+        """
+        return self._data[self.correlation_columns()].corr()
+
+    def correlation_columns(self) -> List[str]:
+        """
+        Return the correlation columns present in the data.
+
+        Returns:
+        - List[str]: Names of the columns.
+        """
+        return [column for column in CORRELATION_COLUMNS if column in self._data.columns]
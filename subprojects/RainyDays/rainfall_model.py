@@ -0,0 +1,182 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Rainfall Model Training for the Rainy Days Program.
+
+Input:
+- Daily weather data indexed by date, with PRCP and the meteorological feature columns.
+
+Output:
+- Fitted Random Forest models, and walk-forward predictions and errors.
+
+Features:
+- Adds lagged rainfall features, shifted by calendar days so gaps in the data are respected.
+- Trains on all cores with `n_jobs`.
+- Caches fitted models on disk next to the CSV file's data cache, keyed by a fingerprint of the
+  features, target and model parameters, so training is skipped entirely when the data has not changed.
+- Lags rainfall station by station, so files holding several stations get the right lags.
+- Evaluates models walking forward in time: every fold trains on the past and predicts the
+  following period, so no future data leaks into training.
+
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple, Union
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import TimeSeriesSplit
+from weather_data import CACHE_DIR, cache_paths
+
+# Meteorological columns used as features
+FEATURE_COLUMNS = ['TMAX', 'TMIN', 'AWND', 'WDF2', 'WDF5', 'WSF2', 'WSF5']
+
+# Days by which past rainfall is lagged to form extra features
+LAGS = [1, 2, 3, 7]
+
+# Parameters of the Random Forest; n_jobs is not included as it does not change the model
+MODEL_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+# Number of walk-forward folds
+WALK_FORWARD_FOLDS = 5
+
+# Directory of the fitted models, inside the data cache directory
+MODEL_SUBDIR = 'models'
+
+def model_cache_dir(file_path: str, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Return the directory where the models trained on a CSV file are cached.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - cache_dir (str): Directory of the data cache, relative to the CSV file's directory.
+
+    Returns:
+    - str: The model directory, next to the file's Parquet cache.
+    """
+    return os.path.join(os.path.dirname(cache_paths(file_path, cache_dir)['data']), MODEL_SUBDIR)
+
+def make_features(data: pd.DataFrame, lags: List[int] = LAGS) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Build the features and target of the rainfall model.
+
+    Args:
+    - data (pd.DataFrame): Daily weather data indexed by date, with a STATION column if it holds several stations.
+    - lags (List[int]): Days by which past rainfall is lagged.
+
+    Returns:
+    - Tuple[pd.DataFrame, pd.Series]: The features and the rainfall of the days that have every lag.
+    """
+    rainfall = data['PRCP'].astype(float)
+    features = data[FEATURE_COLUMNS].astype(float)
+
+    # Every day is identified by its station and date; without a STATION column, all days are one station's
+    stations = data['STATION'].astype(str).to_numpy() if 'STATION' in data.columns else np.zeros(len(data), dtype=int)
+    days = pd.MultiIndex.from_arrays([stations, data.index])
+    if days.has_duplicates:
+        raise ValueError("The data has several rows for the same station and date; rainfall lags need one row per day!")
+    for lag in lags:
+        # Shift by calendar days, so the lag of a day after a gap is missing rather than wrong
+        lagged = pd.Series(rainfall.to_numpy(), index=pd.MultiIndex.from_arrays([stations, data.index + pd.Timedelta(days=lag)]))
+        features[f'PRCP_LAG_{lag}'] = lagged.reindex(days).to_numpy()
+    complete = features.notna().all(axis=1)
+    return features[complete], rainfall[complete]
+
+def fingerprint(features: pd.DataFrame, target: pd.Series, params: Dict[str, Union[int, str]] = MODEL_PARAMS) -> str:
+    """
+    Compute the cache key of a model from its training data and parameters.
+
+    Args:
+    - features (pd.DataFrame): Training features.
+    - target (pd.Series): Training target.
+    - params (Dict[str, Union[int, str]]): Parameters of the model.
+
+    Returns:
+    - str: Hexadecimal digest identifying the model.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'columns': list(features.columns), 'params': params, 'sklearn': sklearn.__version__}, sort_keys=True).encode())
+    digest.update(pd.util.hash_pandas_object(features, index=True).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(target, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def train_model(features: pd.DataFrame, target: pd.Series, params: Dict[str, Union[int, str]] = MODEL_PARAMS, n_jobs: int = -1, model_dir: Optional[str] = None) -> RandomForestRegressor:
+    """
+    Fit a Random Forest, or load it from the cache if it was fitted on the same data before.
+
+    Args:
+    - features (pd.DataFrame): Training features.
+    - target (pd.Series): Training target.
+    - params (Dict[str, Union[int, str]]): Parameters of the model.
+    - n_jobs (int): Number of cores used for training and prediction, -1 for all of them.
+    - model_dir (Optional[str]): Directory of the model cache, such as model_cache_dir(file_path), or None to always train.
+
+    Returns:
+    - RandomForestRegressor: The fitted model.
+    """
+    path = os.path.join(model_dir, fingerprint(features, target, params) + '.joblib') if model_dir else None
+    if path and os.path.exists(path):
+        model = joblib.load(path)
+        model.set_params(n_jobs=n_jobs)
+        return model
+
+    model = RandomForestRegressor(**params, n_jobs=n_jobs)
+    model.fit(features, target)
+    if path:
+        os.makedirs(model_dir, exist_ok=True)
+        # Write to a temporary file so concurrent runs never load a partial model
+        temporary = f'{path}.{os.getpid()}.tmp'
+        joblib.dump(model, temporary)
+        os.replace(temporary, path)
+    return model
+
+def walk_forward(features: pd.DataFrame, target: pd.Series, folds: int = WALK_FORWARD_FOLDS, params: Dict[str, Union[int, str]] = MODEL_PARAMS, n_jobs: int = -1, model_dir: Optional[str] = None) -> Dict[str, Union[pd.Series, List[float], float]]:
+    """
+    Evaluate the model walking forward in time.
+
+    Every fold trains on all the days before it and predicts its own days, with the
+    fold models cached like any other.
+
+    Args:
+    - features (pd.DataFrame): Features, in date order.
+    - target (pd.Series): Target, in date order.
+    - folds (int): Number of walk-forward folds.
+    - params (Dict[str, Union[int, str]]): Parameters of the model.
+    - n_jobs (int): Number of cores used for training and prediction, -1 for all of them.
+    - model_dir (Optional[str]): Directory of the model cache, such as model_cache_dir(file_path), or None to always train.
+
+    Returns:
+    - Dict[str, Union[pd.Series, List[float], float]]: The out-of-sample 'predictions', the
+      'actual' rainfall of the same rows, the 'fold_mse' of every fold and the overall 'mse'.
+    """
+    if len(features) <= folds:
+        raise ValueError(f"Walk-forward evaluation with {folds} folds needs more than {folds} days of data!")
+
+    predictions = []
+    actual = []
+    fold_mse = []
+    for train, test in TimeSeriesSplit(n_splits=folds).split(features):
+        model = train_model(features.iloc[train], target.iloc[train], params, n_jobs, model_dir)
+        predicted = pd.Series(model.predict(features.iloc[test]), index=features.index[test])
+        # Select the true values by position, as dates repeat once per station in multi-station data
+        observed = target.iloc[test]
+        fold_mse.append(float(mean_squared_error(observed, predicted)))
+        predictions.append(predicted)
+        actual.append(observed)
+
+    predictions = pd.concat(predictions)
+    actual = pd.concat(actual)
+    return {
+        'predictions': predictions,
+        'actual': actual,
+        'fold_mse': fold_mse,
+        'mse': float(mean_squared_error(actual, predictions)),
+    }
@@ -0,0 +1,261 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Chunked Rainfall Aggregation Pipeline for the Rainy Days Program.
+
+Input:
+- One or more GHCN-style daily CSV exports, for any number of stations and years.
+
+Output:
+- Per-station monthly and seasonal average rainfall, rain category counts, rainfall
+  statistics and extreme rainfall events.
+
+Features:
+- Streams every file in fixed-size chunks, so peak memory does not depend on the file size.
+- Folds each chunk into running per-station partial aggregates (sums, counts and moments)
+  and combines them only when the results are read.
+- Merges the aggregates of several files, e.g. one export per station or per decade.
+- Finds extreme events with a second streaming pass, using the per-station mean and standard deviation.
+- Skips missing measurements, recorded as -9999 in GHCN exports.
+
+"""
+
+import argparse
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from weather_data import CHUNK_SIZE, iter_chunks
+
+# Upper bounds of the rain categories, in the units of the PRCP column
+RAIN_THRESHOLDS = [0.1, 0.5, 1.0]
+RAIN_CATEGORIES = ['No Rain', 'Light Rain', 'Moderate Rain', 'Heavy Rain']
+
+# Seasons, three months each starting from January
+SEASONS = ['Winter', 'Spring', 'Summer', 'Fall']
+
+# Absolute Z-score above which a day is an extreme rainfall event
+EXTREME_Z = 2.5
+
+# Value marking a missing measurement in GHCN exports
+MISSING_VALUE = -9999
+
+# Columns read by the pipeline
+COLUMNS = ['STATION', 'DATE', 'PRCP']
+
+def _rainfall(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop rows of a chunk without a rainfall measurement.
+    """
+    return chunk[chunk['PRCP'].notna() & (chunk['PRCP'] != MISSING_VALUE)]
+
+def _add(total: Optional[pd.DataFrame], partial: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add a partial aggregate of sums and counts to a running one.
+    """
+    return partial if total is None else total.add(partial, fill_value=0)
+
+class RainfallAggregates:
+    """
+    Per-station rainfall aggregates, updated chunk by chunk.
+    """
+
+    def __init__(self):
+        # Sum and count of rainfall per (station, year, month) and per (station, season)
+        self.monthly: Optional[pd.DataFrame] = None
+        self.seasonal: Optional[pd.DataFrame] = None
+        # Number of days per (station, category)
+        self.categories: Optional[pd.DataFrame] = None
+        # Count, mean, sum of squared deviations, minimum and maximum per station
+        self.moments: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a chunk of daily rows into the aggregates.
+
+        Args:
+        - chunk (pd.DataFrame): Rows with STATION, DATE and PRCP columns.
+        """
+        chunk = _rainfall(chunk)
+        if chunk.empty:
+            return
+        station = chunk['STATION'].astype(str)
+        rainfall = chunk['PRCP'].astype(np.float64)
+        month = chunk['DATE'].dt.month
+
+        year = chunk['DATE'].dt.year.rename('YEAR')
+        self.monthly = _add(self.monthly, rainfall.groupby([station, year, month.rename('MONTH')]).agg(['sum', 'count']))
+
+        season = pd.Series(np.array(SEASONS)[(month.to_numpy() - 1) // 3], index=chunk.index, name='SEASON')
+        self.seasonal = _add(self.seasonal, rainfall.groupby([station, season]).agg(['sum', 'count']))
+
+        category = pd.cut(rainfall, bins=[-np.inf] + RAIN_THRESHOLDS + [np.inf], labels=RAIN_CATEGORIES).rename('CATEGORY')
+        counts = rainfall.groupby([station, category], observed=False).size().unstack(fill_value=0)
+        self.categories = _add(self.categories, counts)
+
+        moments = rainfall.groupby(station).agg(['count', 'mean', 'min', 'max'])
+        moments['m2'] = rainfall.groupby(station).var(ddof=0) * moments['count']
+        self._merge_moments(moments)
+
+    def merge(self, other: 'RainfallAggregates') -> None:
+        """
+        Combine the aggregates of another file or worker into these ones.
+
+        Args:
+        - other (RainfallAggregates): The aggregates to add.
+        """
+        for name in ['monthly', 'seasonal', 'categories']:
+            if getattr(other, name) is not None:
+                setattr(self, name, _add(getattr(self, name), getattr(other, name)))
+        if other.moments is not None:
+            self._merge_moments(other.moments)
+
+    def _merge_moments(self, moments: pd.DataFrame) -> None:
+        """
+        Combine per-station moments with the parallel variance formula (Chan et al.).
+        """
+        if self.moments is None:
+            self.moments = moments
+            return
+        left, right = self.moments.align(moments)
+        left_count, right_count = left['count'].fillna(0), right['count'].fillna(0)
+        count = left_count + right_count
+        delta = right['mean'].fillna(0) - left['mean'].fillna(0)
+        merged = pd.DataFrame({
+            'count': count,
+            'mean': left['mean'].fillna(0) + delta * right_count / count,
+            'min': np.fmin(left['min'], right['min']),
+            'max': np.fmax(left['max'], right['max']),
+            'm2': left['m2'].fillna(0) + right['m2'].fillna(0) + delta ** 2 * left_count * right_count / count,
+        })
+        # A station seen only on the right has no left mean to correct
+        only_right = left['count'].isna()
+        merged.loc[only_right, 'mean'] = right.loc[only_right, 'mean']
+        self.moments = merged
+
+    def monthly_average(self) -> pd.Series:
+        """
+        Return the average rainfall of every month of every station.
+
+        Returns:
+        - pd.Series: Average rainfall indexed by (STATION, YEAR, MONTH).
+        """
+        return self.monthly['sum'] / self.monthly['count']
+
+    def seasonal_average(self) -> pd.DataFrame:
+        """
+        Return the average rainfall of every season of every station.
+
+        Returns:
+        - pd.DataFrame: Average rainfall with one row per station and one column per season.
+        """
+        average = (self.seasonal['sum'] / self.seasonal['count']).unstack()
+        return average.reindex(columns=[season for season in SEASONS if season in average.columns])
+
+    def category_counts(self) -> pd.DataFrame:
+        """
+        Return the number of days in every rain category for every station.
+
+        Returns:
+        - pd.DataFrame: Day counts with one row per station and one column per category.
+        """
+        return self.categories.astype(np.int64)
+
+    def station_summary(self) -> pd.DataFrame:
+        """
+        Return the rainfall statistics of every station.
+
+        Returns:
+        - pd.DataFrame: Number of days, mean, standard deviation, minimum and maximum per station.
+        """
+        summary = self.moments[['count', 'mean', 'min', 'max']].copy()
+        summary['count'] = summary['count'].astype(np.int64)
+        summary.insert(2, 'std', np.sqrt(self.moments['m2'] / self.moments['count']))
+        return summary
+
+def aggregate_file(file_path: str, chunk_size: int = CHUNK_SIZE) -> RainfallAggregates:
+    """
+    Aggregate a daily rainfall file chunk by chunk.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - chunk_size (int): Largest number of rows held in memory at once.
+
+    Returns:
+    - RainfallAggregates: The aggregates of the file.
+    """
+    aggregates = RainfallAggregates()
+    for chunk in iter_chunks(file_path, COLUMNS, chunk_size):
+        aggregates.update(chunk)
+    return aggregates
+
+def aggregate_files(file_paths: List[str], chunk_size: int = CHUNK_SIZE) -> RainfallAggregates:
+    """
+    Aggregate several daily rainfall files and combine their aggregates.
+
+    Args:
+    - file_paths (List[str]): Paths of the CSV files.
+    - chunk_size (int): Largest number of rows held in memory at once.
+
+    Returns:
+    - RainfallAggregates: The combined aggregates of all the files.
+    """
+    aggregates = RainfallAggregates()
+    for file_path in file_paths:
+        aggregates.merge(aggregate_file(file_path, chunk_size))
+    return aggregates
+
+def find_extremes(file_paths: List[str], aggregates: RainfallAggregates, threshold: float = EXTREME_Z, chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Find extreme rainfall events with a second streaming pass over the files.
+
+    Args:
+    - file_paths (List[str]): Paths of the CSV files that were aggregated.
+    - aggregates (RainfallAggregates): The aggregates of those files.
+    - threshold (float): Absolute Z-score above which a day is an extreme event.
+    - chunk_size (int): Largest number of rows held in memory at once.
+
+    Returns:
+    - pd.DataFrame: The STATION, DATE, PRCP and Z-score of every extreme event.
+    """
+    summary = aggregates.station_summary()
+    events = []
+    for file_path in file_paths:
+        for chunk in iter_chunks(file_path, COLUMNS, chunk_size):
+            chunk = _rainfall(chunk)
+            station = chunk['STATION'].astype(str)
+            z_scores = (chunk['PRCP'] - station.map(summary['mean'])) / station.map(summary['std'])
+            extreme = z_scores.abs() > threshold
+            if extreme.any():
+                events.append(chunk[extreme].assign(STATION=station[extreme], Z=z_scores[extreme]))
+    if not events:
+        return pd.DataFrame(columns=COLUMNS + ['Z'])
+    return pd.concat(events, ignore_index=True)
+
+def main():
+    """
+    Main function to run the pipeline from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Aggregate daily rainfall files of any size, chunk by chunk.")
+    parser.add_argument("files", nargs="+", help="daily CSV exports")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows held in memory at once")
+    parser.add_argument("--threshold", type=float, default=EXTREME_Z, help="Z-score of extreme events")
+    args = parser.parse_args()
+
+    aggregates = aggregate_files(args.files, args.chunk_size)
+    extremes = find_extremes(args.files, aggregates, args.threshold, args.chunk_size)
+
+    print("Station Summary:")
+    print(aggregates.station_summary().to_string())
+    print("\nSeasonal Average Rainfall:")
+    print(aggregates.seasonal_average().to_string())
+    print("\nRain Category Distribution:")
+    print(aggregates.category_counts().to_string())
+    print(f"\nExtreme Rainfall Events: {len(extremes)}")
+    if len(extremes):
+        print(extremes.groupby('STATION').size().to_string())
+
+if __name__ == "__main__":
+    main()
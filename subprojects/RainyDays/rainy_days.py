@@ -13,7 +13,8 @@ Output:
 - Displays a histogram of rainfall and provides statistics on rainy days.
 
 Features:
-- Load and preprocess CSV data.
+- Load and preprocess CSV data, through a typed Parquet cache of only the needed columns.
+- Share derived features between the analyses through a memoized, read-only analysis context.
 - Plot a histogram of rainfall distribution.
 - Analyze and print statistics on rainy days.
 - Plot monthly average rainfall.
@@ -24,32 +25,33 @@ Features:
 - Explore correlations between rainfall and other meteorological factors.
 - Create an interactive rainfall visualization using Plotly Express.
 - Explore machine learning models for predicting future rainfall based on historical data.
+- Train models with lagged rainfall on all cores, evaluate them walking forward in time and cache them on disk.
 
 """
 
 import numpy as np
-import pandas as pd
 import warnings
 import matplotlib.pyplot as plt
 import plotly.express as px
 import seaborn as sns
-from scipy.stats import linregress, zscore
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error
+from scipy.stats import linregress
+from weather_data import load_table
+from analysis_context import AnalysisContext
+from rainfall_model import make_features, model_cache_dir, walk_forward
 
-def load_data(file_path):
-   """Load and preprocess the CSV data."""
+# Columns used by the analyses; the others are never loaded
+COLUMNS = ['STATION', 'DATE', 'PRCP', 'TMAX', 'TMIN', 'AWND', 'WDF2', 'WDF5', 'WSF2', 'WSF5', 'WT01', 'WT02', 'WT03']
 
-   data = pd.read_csv(file_path)
-   data['DATE'] = pd.to_datetime(data['DATE'], format='%Y%m%d')
-   return data
+def load_data(file_path, columns=COLUMNS):
+   """Load and preprocess the CSV data, reusing the cache when the file is unchanged."""
 
-def plot_rainfall_histogram(inches):
+   return load_table(file_path, columns)
+
+def plot_rainfall_histogram(inches, show=True):
    """Plot a histogram of rainfall."""
 
    sns.set()
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
 
    # Plot histogram
    sns.histplot(inches, bins=30, kde=True, color='skyblue', edgecolor='w', linewidth=1.2)
@@ -67,7 +69,9 @@ def plot_rainfall_histogram(inches):
 
    # Add legend
    plt.legend()
-   plt.show()
+   if show:
+      plt.show()
+   return figure, {'mean': mean_rainfall, 'median': median_rainfall}
 
 def analyze_rainy_days(inches):
    """Analyze rainy days and print statistics."""
@@ -78,72 +82,64 @@ def analyze_rainy_days(inches):
    print(f"Number of days with rain more than 0.5 inches: {np.sum(inches > 0.5)}")
    print(f"Number of days with rain < 0.2 inches: {np.sum((inches > 0) & (inches < 0.2))}")
 
-def plot_monthly_average(data):
+def plot_monthly_average(context, show=True):
    """Calculate and plot the monthly average rainfall."""
 
-   data.set_index('DATE', inplace=True)
-   monthly_average = data['PRCP'].resample('ME').mean()
+   monthly_average = context.monthly_average
    
    sns.set()
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
    sns.barplot(x=monthly_average.index.month_name(), y=monthly_average, hue=monthly_average.index.month_name(), palette='Blues', legend=False)
    plt.title("Monthly Average Rainfall in Seattle (2014)")
    plt.xlabel("Month")
    plt.ylabel("Average Rainfall (inches)")
-   plt.show()
+   if show:
+      plt.show()
+   return figure, {'monthly_average': monthly_average}
 
-def plot_seasonal_analysis(data):
+def plot_seasonal_analysis(context, show=True):
    """Analyze and visualize rainfall patterns across different seasons."""
 
-   data['Season'] = pd.cut(data.index.month,
-                           bins=[0, 3, 6, 9, 12],
-                           labels=['Winter', 'Spring', 'Summer', 'Fall'])
-   
-   seasonal_average = data.groupby('Season', observed=False)['PRCP'].mean()
+   seasonal_average = context.seasonal_average
 
    sns.set()
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
    sns.barplot(x=seasonal_average.index, y=seasonal_average, hue=seasonal_average.index, palette='pastel', legend=False)
    plt.title("Average Rainfall Across Seasons in Seattle (2014)") 
    plt.xlabel("Season")
    plt.ylabel("Average Rainfall (inches)")
-   plt.show()
 
    highest_rainfall_month = seasonal_average.idxmax()
    lowest_rainfall_month = seasonal_average.idxmin()
 
-   print(f"\nHighest average rainfall: {highest_rainfall_month} ({seasonal_average.max():.2f} inches)")
-   print(f"\nLowest average rainfall: {lowest_rainfall_month} ({seasonal_average.min():.2f} inches)")
+   if show:
+      plt.show()
+      print(f"\nHighest average rainfall: {highest_rainfall_month} ({seasonal_average.max():.2f} inches)")
+      print(f"\nLowest average rainfall: {lowest_rainfall_month} ({seasonal_average.min():.2f} inches)")
+   return figure, {'seasonal_average': seasonal_average, 'highest': highest_rainfall_month, 'lowest': lowest_rainfall_month}
 
-def threshold_analysis(data):
+def threshold_analysis(context, show=True):
    """Categorize rainfall into light, moderate, and heavy rain."""
 
-   light_threshold = 0.1
-   moderate_threshold = 0.5
-   heavy_threshold = 1.0
-
-   data['Rain Category'] = pd.cut(data['PRCP'],
-                                  bins=[-np.inf, light_threshold, moderate_threshold, heavy_threshold, np.inf],
-                                  labels=['No Rain', 'Light Rain', 'Moderate Rain', 'Heavy Rain'])
-   
-   category_counts = data['Rain Category'].value_counts()
+   category_counts = context.category_counts
 
    sns.set()
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
    sns.barplot(x=category_counts.index, y=category_counts, hue=category_counts.index, palette='coolwarm', legend=True)
    plt.title("Distribution of Rain Categories in Seattle (2014)")
    plt.xlabel("Rain Category")
    plt.ylabel("Number of Days")
-   plt.show()
+   if show:
+      plt.show()
+      print("\nRain Category Distribution:")
+      print(category_counts)
+   return figure, {'category_counts': category_counts}
 
-   print("\nRain Category Distribution:")
-   print(category_counts)
-
-def trend_analysis(data):
+def trend_analysis(context, show=True):
    """Explore trends or patterns in rainfall over the course of the year."""
    
    # Calculate monthly average rainfall
-   monthly_average = data['PRCP'].resample('ME').mean().dropna()
+   monthly_average = context.monthly_average.dropna()
 
    # Perform linear regression to identify the trend
    slope, intercept, r_value, p_value, std_err = linregress(range(len(monthly_average)), monthly_average)
@@ -153,58 +149,54 @@ def trend_analysis(data):
 
    # Plot the trend analysis
    sns.set(style='whitegrid', palette='pastel')
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
    sns.scatterplot(x=monthly_average.index, y=monthly_average, color='skyblue', label='Monthly Average')
    plt.plot(monthly_average.index, trend_line, color='orange', linestyle='dashed', linewidth=2, label='Trend Line')
    plt.title("Monthly Average Rainfall and Trend in Seattle (2014)", fontsize=16)
    plt.xlabel("Month", fontsize=14)
    plt.ylabel("Average Rainfall (inches)", fontsize=14)
    plt.legend()
-   plt.show()
+   if show:
+      plt.show()
+   return figure, {'slope': slope, 'intercept': intercept, 'r_value': r_value, 'p_value': p_value, 'std_err': std_err}
 
-def extreme_events_analysis(data):
+def extreme_events_analysis(context, show=True):
    """Identify and analyze extreme rainfall events or outliers."""
 
-   # Calculate the Z-score for rainfall
-   z_scores = zscore(data['PRCP'])
-
-   # Define a threshold for extreme events
-   threshold = 2.5
-
-   # Identify extreme events based on the threshold
-   extreme_events = data.loc[np.abs(z_scores) > threshold]
+   # Days whose rainfall Z-score is beyond the threshold
+   extreme_events = context.extreme_events
 
    # Plot extreme events on a calendar or timeline
    sns.set(style='whitegrid', palette='pastel')
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
    sns.scatterplot(x=extreme_events.index, y=extreme_events['PRCP'], color='red', label='Extreme Events')
    plt.title("Extreme Rainfall Events in Seattle (2014)", fontsize=16)
    plt.xlabel("Date", fontsize=14)
    plt.ylabel("Rainfall (inches)", fontsize=14)
    plt.legend()
-   plt.show()
+   if show:
+      plt.show()
+   return figure, {'extreme_events': extreme_events['PRCP']}
 
-def correlation_analysis(data):
+def correlation_analysis(context, show=True):
    """Explore correlations between rainfall and other meteorological factors."""
 
-   # Select relevant columns for correlation analysis
-   columns_of_interest = ['PRCP', 'TMAX', 'TMIN', 'AWND', 'WSF2', 'WSF5', 'WT01', 'WT02', 'WT03']
-   selected_data = data[columns_of_interest]
-
-   # Calculate the correlation matrix
-   correlation_matrix = selected_data.corr()
+   # Correlation matrix of rainfall and the other meteorological factors
+   correlation_matrix = context.correlation_matrix
 
    # Plot the correlation matrix heatmap
    sns.set(style='whitegrid', font_scale=1.2)
-   plt.figure(figsize=(12, 8))
+   figure = plt.figure(figsize=(12, 8))
    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', linewidths=.5)
    plt.title("Correlation Matrix: Rainfall and Meteorological Factors", fontsize=16)
-   plt.show()
+   if show:
+      plt.show()
+   return figure, {'correlation_matrix': correlation_matrix}
 
-def interactive_rainfall_plot(data):
+def interactive_rainfall_plot(context, show=True):
    """Create an interactive rainfall visualization using Plotly."""
    
-   data.reset_index(inplace=True)
+   data = context.data.reset_index()
    # Suppress FutureWarnings
    warnings.simplefilter(action='ignore', category=FutureWarning)
    
@@ -217,42 +209,55 @@ def interactive_rainfall_plot(data):
    fig.update_xaxes(rangeslider_visible=True)
 
    # Show the plot 
-   fig.show()
+   if show:
+      fig.show()
+   return fig, {}
 
-def machine_learning_prediction(data):
+def machine_learning_prediction(context, show=True, n_jobs=-1):
    """Explore machine learning models for predicting future rainfall based on historical data."""
 
-   # Feature selection (adjust columns based on dataset)
-   features = data[['TMAX', 'TMIN', 'AWND', 'WDF2', 'WDF5', 'WSF2', 'WSF5']]
-
-   # Target variable
-   target = data['PRCP']
-   
-   # Split the data into training and testing sets
-   X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.2, random_state=42)
-
-   # Choose a model (Random Forest Regressor)
-   model = RandomForestRegressor(n_estimators=100, random_state=42)
-   model.fit(X_train, y_train)
+   # Weather features and lagged rainfall (adjust columns based on dataset)
+   features, target = make_features(context.data)
 
-   # Make predictions
-   y_pred = model.predict(X_test)
+   # Walk forward in time, training each fold on the past with all cores and caching the models next to the data
+   model_dir = model_cache_dir(context.file_path) if context.file_path else None
+   evaluation = walk_forward(features, target, n_jobs=n_jobs, model_dir=model_dir)
+   y_pred = evaluation['predictions']
+   y_test = evaluation['actual']
 
    # Evaluate the model
-   mse = mean_squared_error(y_test, y_pred)
-   print(f"Mean Squared Error: {mse:.2f}")
+   mse = evaluation['mse']
+   if show:
+      print(f"Mean Squared Error: {mse:.2f}")
+      print("Walk-Forward Fold Errors: " + ", ".join(f"{fold_mse:.2f}" for fold_mse in evaluation['fold_mse']))
 
    # Visualize the predictions
-   plt.scatter(X_test.index, y_test, label='Actual Rainfall', color='blue')
-   plt.scatter(X_test.index, y_pred, label='Predicted Rainfall', color='red')
+   figure = plt.figure()
+   plt.scatter(y_test.index, y_test, label='Actual Rainfall', color='blue')
+   plt.scatter(y_pred.index, y_pred, label='Predicted Rainfall', color='red')
    plt.title("Actual vs. Predicted Rainfall")
    plt.xlabel("Date")
    plt.ylabel("Rainfall (inches)")
    plt.legend()
-   plt.show()
-
-def choose_plot():
-   """Allow the user to choose which plot to display."""
+   if show:
+      plt.show()
+   return figure, {'mse': mse, 'fold_mse': evaluation['fold_mse']}
+
+# Analyses of the menu, in order; each returns its figure and the statistics it prints
+ANALYSES = {
+   'rainfall_histogram': lambda context, show=True: plot_rainfall_histogram(context.rainfall_inches, show),
+   'monthly_average': plot_monthly_average,
+   'seasonal_analysis': plot_seasonal_analysis,
+   'threshold_analysis': threshold_analysis,
+   'trend_analysis': trend_analysis,
+   'extreme_events': extreme_events_analysis,
+   'correlation_analysis': correlation_analysis,
+   'interactive_rainfall': interactive_rainfall_plot,
+   'machine_learning': machine_learning_prediction,
+}
+
+def choose_plot(context):
+   """Allow the user to choose which plot to display, sharing one analysis context between them."""
 
    while True:
       print("Choose a plot to display:")
@@ -273,30 +278,28 @@ def choose_plot():
          print("Exiting the program.")
          break
       elif choice == 1:
-         plot_rainfall_histogram(rainfall)
+         plot_rainfall_histogram(context.rainfall_inches)
       elif choice == 2:
-         plot_monthly_average(data)
+         plot_monthly_average(context)
       elif choice == 3:
-         plot_seasonal_analysis(data)
+         plot_seasonal_analysis(context)
       elif choice == 4:
-         threshold_analysis(data)
+         threshold_analysis(context)
       elif choice == 5:
-         trend_analysis(data)
+         trend_analysis(context)
       elif choice == 6:
-         extreme_events_analysis(data)
+         extreme_events_analysis(context)
       elif choice == 7:
-         correlation_analysis(data)
+         correlation_analysis(context)
       elif choice == 8:
-         interactive_rainfall_plot(data)
+         interactive_rainfall_plot(context)
       elif choice == 9:
-         machine_learning_prediction(data)
+         machine_learning_prediction(context)
       else:
          print("Invalid choice. Please enter a number between 1 and 9.")
 
 if __name__ == '__main__':
    file_path = "Seattle2014.csv"
-   data = load_data(file_path)
-
-   rainfall = data["PRCP"].values.astype(float) / 254.0
+   context = AnalysisContext(load_data(file_path), file_path)
 
-   choose_plot()
\ No newline at end of file
+   choose_plot(context)
\ No newline at end of file
@@ -0,0 +1,203 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Headless Report Generation for the Rainy Days Program.
+
+Input:
+- Command-line options for the daily CSV exports, the output directory, the analyses to run
+  and the number of worker processes.
+
+Output:
+- For every file, a directory with one PNG per Matplotlib analysis, an HTML page for the
+  interactive rainfall plot and a summary.json of the statistics each analysis prints.
+- A summary.json in the output directory combining the summaries of all the files.
+
+Features:
+- Runs all the analyses of the menu without a display, rendering with the Agg backend.
+- Converts the files' Parquet caches in parallel first, then renders the figures of all the
+  files and analyses in parallel worker processes.
+- Reuses one analysis context per file in each worker, so derived features are computed once per worker.
+- Trains the machine learning models on one core per worker, so the pool does not oversubscribe the CPUs.
+- Keeps going when an analysis fails, recording the error in the summary.
+
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Select the non-interactive backend before pyplot is imported by the analyses
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from analysis_context import AnalysisContext
+from rainy_days import ANALYSES, load_data
+from weather_data import ensure_cache
+
+# Resolution of the PNG figures
+DPI = 100
+
+# Analysis contexts of the files this worker process has seen, most recent last
+_contexts: Dict[str, AnalysisContext] = {}
+
+# Largest number of analysis contexts kept by a worker process
+CONTEXT_LIMIT = 2
+
+# Extra arguments of the analyses run in the workers; the pool already uses every core,
+# so models are trained on one core per worker instead of all cores in every worker
+ANALYSIS_OPTIONS: Dict[str, Dict[str, Any]] = {
+    'machine_learning': {'n_jobs': 1},
+}
+
+def to_json(value: Any) -> Any:
+    """
+    Convert statistics holding NumPy or pandas values into plain JSON values.
+
+    Args:
+    - value (Any): The statistics.
+
+    Returns:
+    - Any: The statistics as dicts, lists, strings, numbers and None.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {str(column): to_json(value[column]) for column in value.columns}
+    if isinstance(value, pd.Series):
+        return {str(to_json(key)): to_json(item) for key, item in value.items()}
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_json(item) for item in value]
+    if isinstance(value, pd.Timestamp):
+        return value.date().isoformat() if value == value.normalize() else value.isoformat()
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, (float, np.floating)):
+        # NaN and infinities are not valid JSON
+        return float(value) if np.isfinite(value) else None
+    return value if value is None or isinstance(value, (str, int, bool)) else str(value)
+
+def station_name(file_path: str) -> str:
+    """
+    Return the name of a file's report directory.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+
+    Returns:
+    - str: The file name without its extension.
+    """
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def get_context(file_path: str) -> AnalysisContext:
+    """
+    Return the analysis context of a file, loading it unless this worker has it.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+
+    Returns:
+    - AnalysisContext: The analysis context of the file.
+    """
+    if file_path in _contexts:
+        _contexts[file_path] = _contexts.pop(file_path)
+    else:
+        _contexts[file_path] = AnalysisContext(load_data(file_path), file_path)
+        while len(_contexts) > CONTEXT_LIMIT:
+            del _contexts[next(iter(_contexts))]
+    return _contexts[file_path]
+
+def render(file_path: str, analysis: str, output_dir: str) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Run one analysis of one file and save its figure.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - analysis (str): Name of the analysis, one of the keys of `ANALYSES`.
+    - output_dir (str): Directory of the file's report.
+
+    Returns:
+    - Tuple[str, str, Dict[str, Any]]: The file path, the analysis name and its summary, with
+      the path of the figure or the error that stopped it.
+    """
+    start = time.perf_counter()
+    try:
+        figure, statistics = ANALYSES[analysis](get_context(file_path), show=False, **ANALYSIS_OPTIONS.get(analysis, {}))
+        if isinstance(figure, plt.Figure):
+            path = os.path.join(output_dir, f"{analysis}.png")
+            figure.savefig(path, dpi=DPI, bbox_inches="tight")
+            plt.close(figure)
+        else:
+            path = os.path.join(output_dir, f"{analysis}.html")
+            figure.write_html(path, include_plotlyjs="cdn")
+        summary = {"figure": os.path.basename(path), "statistics": to_json(statistics)}
+    except Exception as error:
+        plt.close("all")
+        summary = {"error": f"{type(error).__name__}: {error}"}
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return file_path, analysis, summary
+
+def generate_reports(file_paths: List[str], output_dir: str, analyses: Optional[List[str]] = None, workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate the reports of several files in parallel.
+
+    Args:
+    - file_paths (List[str]): Paths of the CSV files.
+    - output_dir (str): Directory where the reports are written.
+    - analyses (Optional[List[str]]): Names of the analyses to run, defaults to all of them.
+    - workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+
+    Returns:
+    - Dict[str, Dict[str, Any]]: The summary of every file, keyed by its report directory name.
+    """
+    analyses = analyses or list(ANALYSES)
+    names = [station_name(file_path) for file_path in file_paths]
+    if len(set(names)) != len(names):
+        raise ValueError("Every file needs a different name, as the reports are named after them!")
+    directories = {file_path: os.path.join(output_dir, name) for file_path, name in zip(file_paths, names)}
+    for directory in directories.values():
+        os.makedirs(directory, exist_ok=True)
+
+    summaries = {name: {} for name in names}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        # Build the caches first, so no two workers convert the same file at once
+        list(executor.map(ensure_cache, file_paths))
+
+        # Tasks are ordered file by file, so each worker mostly reuses the context it has
+        tasks = [(file_path, analysis, directories[file_path]) for file_path in file_paths for analysis in analyses]
+        for file_path, analysis, summary in executor.map(render, *zip(*tasks)):
+            summaries[station_name(file_path)][analysis] = summary
+
+    for file_path, name in zip(file_paths, names):
+        with open(os.path.join(directories[file_path], "summary.json"), "w") as file:
+            json.dump({"file": file_path, "analyses": summaries[name]}, file, indent=2)
+    with open(os.path.join(output_dir, "summary.json"), "w") as file:
+        json.dump(summaries, file, indent=2)
+    return summaries
+
+def main():
+    """
+    Main function to generate reports from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Generate rainfall reports for daily CSV exports without a display.")
+    parser.add_argument("files", nargs="+", help="daily CSV exports")
+    parser.add_argument("--output", default="reports", help="directory where the reports are written")
+    parser.add_argument("--analyses", nargs="+", choices=list(ANALYSES), default=None, help="analyses to run (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summaries = generate_reports(args.files, args.output, args.analyses, args.workers)
+    failures = sum("error" in summary for analyses in summaries.values() for summary in analyses.values())
+    print(f"Wrote reports for {len(summaries)} files to '{args.output}' in {time.perf_counter() - start:.1f}s ({failures} failed analyses).")
+
+if __name__ == "__main__":
+    main()
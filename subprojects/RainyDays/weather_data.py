@@ -0,0 +1,222 @@
+# This file is part of the Python Projects repository, which is licensed under the
+# Apache License, Version 2.0. You may obtain a copy of the license at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""
+Cached Weather Data Loader for the Rainy Days Program.
+
+Input:
+- GHCN-style daily CSV exports, with STATION, STATION_NAME and DATE columns followed by
+  one numeric column per measured element (PRCP, TMAX, TMIN, ...).
+
+Output:
+- DataFrames with only the requested columns, with explicit dtypes and a parsed DATE column.
+
+Features:
+- Converts the CSV once, in fixed-size chunks, into a typed Parquet cache next to the source file.
+- Loads later runs straight from the cache, reading only the requested columns.
+- Streams the cache in fixed-size chunks, for analyses of files larger than memory.
+- Keys the cache on the source file's modification time, size and SHA-256 hash, so edited files
+  are reconverted and merely touched files are not.
+- Uses explicit dtypes instead of inference: categories for station columns, datetimes for DATE
+  and float32 for the measurements.
+
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Directory, next to the source file, where the Parquet caches are kept
+CACHE_DIR = ".rainy_cache"
+
+# Version of the cache layout; bump it when the dtypes or conversion change
+CACHE_VERSION = 1
+
+# Number of CSV rows converted at once when building a cache, bounding memory use
+CHUNK_SIZE = 500_000
+
+# Columns holding text, stored as categories; every other column except DATE is a measurement
+TEXT_COLUMNS = ["STATION", "STATION_NAME"]
+DATE_COLUMN = "DATE"
+DATE_FORMAT = "%Y%m%d"
+
+def file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hash of a file, reading it in blocks.
+
+    Args:
+    - file_path (str): Path of the file.
+    - block_size (int): Number of bytes read at once.
+
+    Returns:
+    - str: Hexadecimal digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def csv_dtypes(file_path: str) -> Dict[str, type]:
+    """
+    Build the explicit dtypes of a CSV export from its header.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+
+    Returns:
+    - Dict[str, type]: The dtype of every column, with DATE read as text to be parsed.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    return {column: str if column in TEXT_COLUMNS or column == DATE_COLUMN else np.float32 for column in header}
+
+def cache_paths(file_path: str, cache_dir: str = CACHE_DIR) -> Dict[str, str]:
+    """
+    Return the paths of the Parquet cache of a CSV file and of its metadata.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - cache_dir (str): Directory of the cache, relative to the CSV file's directory.
+
+    Returns:
+    - Dict[str, str]: Paths of the 'data' and 'meta' files.
+    """
+    directory = os.path.join(os.path.dirname(os.path.abspath(file_path)), cache_dir)
+    name = os.path.basename(file_path)
+    return {"data": os.path.join(directory, name + ".parquet"), "meta": os.path.join(directory, name + ".json")}
+
+def build_cache(file_path: str, cache_dir: str = CACHE_DIR, chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    Convert a CSV export into a typed Parquet cache, one row group per chunk.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - cache_dir (str): Directory of the cache, relative to the CSV file's directory.
+    - chunk_size (int): Number of CSV rows converted at once.
+
+    Returns:
+    - str: Path of the Parquet cache.
+    """
+    paths = cache_paths(file_path, cache_dir)
+    os.makedirs(os.path.dirname(paths["data"]), exist_ok=True)
+    stat = os.stat(file_path)
+
+    # Write to a temporary file so an interrupted conversion never leaves a truncated cache
+    temporary = paths["data"] + ".tmp"
+    writer = None
+    try:
+        for chunk in pd.read_csv(file_path, dtype=csv_dtypes(file_path), chunksize=chunk_size):
+            chunk[DATE_COLUMN] = pd.to_datetime(chunk[DATE_COLUMN], format=DATE_FORMAT)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(temporary, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"'{file_path}' has no rows!")
+    os.replace(temporary, paths["data"])
+
+    meta = {"version": CACHE_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": file_hash(file_path)}
+    with open(paths["meta"], "w") as file:
+        json.dump(meta, file)
+    return paths["data"]
+
+def cache_is_fresh(file_path: str, cache_dir: str = CACHE_DIR) -> bool:
+    """
+    Check whether the Parquet cache of a CSV file matches the file.
+
+    The hash is only recomputed when the modification time or size changed, and a
+    matching hash refreshes the recorded modification time.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - cache_dir (str): Directory of the cache, relative to the CSV file's directory.
+
+    Returns:
+    - bool: True if the cache can be used.
+    """
+    paths = cache_paths(file_path, cache_dir)
+    if not os.path.exists(paths["data"]) or not os.path.exists(paths["meta"]):
+        return False
+    with open(paths["meta"], "r") as file:
+        meta = json.load(file)
+    if meta.get("version") != CACHE_VERSION:
+        return False
+
+    stat = os.stat(file_path)
+    if meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+        return True
+    if meta["size"] != stat.st_size or meta["sha256"] != file_hash(file_path):
+        return False
+
+    # Same contents with a new modification time, e.g. after a copy or checkout
+    meta["mtime_ns"] = stat.st_mtime_ns
+    with open(paths["meta"], "w") as file:
+        json.dump(meta, file)
+    return True
+
+def ensure_cache(file_path: str, cache_dir: str = CACHE_DIR, refresh: bool = False) -> str:
+    """
+    Build the Parquet cache of a CSV file unless it is fresh.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - cache_dir (str): Directory of the cache, relative to the CSV file's directory.
+    - refresh (bool): If True, rebuild the cache even when it is fresh.
+
+    Returns:
+    - str: Path of the Parquet cache.
+    """
+    if refresh or not cache_is_fresh(file_path, cache_dir):
+        return build_cache(file_path, cache_dir)
+    return cache_paths(file_path, cache_dir)["data"]
+
+def load_table(file_path: str, columns: Optional[List[str]] = None, cache_dir: str = CACHE_DIR, refresh: bool = False) -> pd.DataFrame:
+    """
+    Load a CSV export through its Parquet cache, building the cache if needed.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - columns (Optional[List[str]]): Columns to load, defaults to all of them.
+    - cache_dir (str): Directory of the cache, relative to the CSV file's directory.
+    - refresh (bool): If True, rebuild the cache even when it is fresh.
+
+    Returns:
+    - pd.DataFrame: The requested columns, with explicit dtypes.
+    """
+    path = ensure_cache(file_path, cache_dir, refresh)
+    schema = pq.read_schema(path)
+    missing = [column for column in columns or [] if column not in schema.names]
+    if missing:
+        raise ValueError(f"Columns not found in '{file_path}': {', '.join(missing)}")
+    # Text columns are read as dictionaries, which pandas turns into categories
+    text = [column for column in TEXT_COLUMNS if column in schema.names and (columns is None or column in columns)]
+    return pd.read_parquet(path, columns=columns, read_dictionary=text or None)
+
+def iter_chunks(file_path: str, columns: Optional[List[str]] = None, chunk_size: int = CHUNK_SIZE, cache_dir: str = CACHE_DIR) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV export through its Parquet cache in chunks of at most chunk_size rows.
+
+    Only one chunk is held in memory at a time, whatever the size of the file.
+
+    Args:
+    - file_path (str): Path of the CSV file.
+    - columns (Optional[List[str]]): Columns to load, defaults to all of them.
+    - chunk_size (int): Largest number of rows per chunk.
+    - cache_dir (str): Directory of the cache, relative to the CSV file's directory.
+
+    Yields:
+    - pd.DataFrame: The next chunk of rows, with explicit dtypes.
+    """
+    parquet = pq.ParquetFile(ensure_cache(file_path, cache_dir))
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()